@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark the JSON backends of OTEAPI OPTIMADE on a large `structures` page.
+
+Usage:
+
+    python .github/utils/benchmark_json_codec.py [--entries 500] [--sites 200]
+
+The decode time is what is spent on every downloaded OPTIMADE response.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+def _structures_page(entries: int, sites: int) -> dict[str, Any]:
+    """Create a synthetic OPTIMADE `structures` response page."""
+    rng = random.Random(42)
+    elements = ["Al", "Fe", "Ni", "O", "Si"]
+
+    data = []
+    for index in range(entries):
+        species = [rng.choice(elements) for _ in range(sites)]
+        data.append(
+            {
+                "id": f"structure-{index}",
+                "type": "structures",
+                "attributes": {
+                    "last_modified": "2024-01-01T00:00:00Z",
+                    "elements": sorted(set(species)),
+                    "nelements": len(set(species)),
+                    "chemical_formula_descriptive": "".join(sorted(set(species))),
+                    "dimension_types": [1, 1, 1],
+                    "nperiodic_dimensions": 3,
+                    "lattice_vectors": [
+                        [rng.uniform(0, 20) for _ in range(3)] for _ in range(3)
+                    ],
+                    "cartesian_site_positions": [
+                        [rng.uniform(0, 20) for _ in range(3)] for _ in range(sites)
+                    ],
+                    "nsites": sites,
+                    "species_at_sites": species,
+                    "species": [
+                        {"name": element, "chemical_symbols": [element]}
+                        for element in sorted(set(species))
+                    ],
+                    "structure_features": [],
+                },
+            }
+        )
+
+    return {
+        "data": data,
+        "meta": {
+            "api_version": "1.1.0",
+            "data_returned": entries,
+            "more_data_available": False,
+        },
+        "links": {"next": None},
+    }
+
+
+def _report(line: str = "") -> None:
+    """Write a line of the benchmark report to stdout."""
+    sys.stdout.write(f"{line}\n")
+
+
+def _best_of(function: Any, repeat: int) -> float:
+    """Return the best time in seconds of calling `function`."""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(entries: int, sites: int, repeat: int) -> None:
+    """Time decoding and encoding of a large `structures` page per JSON backend."""
+    from oteapi_optimade.json_codec import JSON_CODEC, ORJSON_CODEC
+
+    page = _structures_page(entries, sites)
+    content = JSON_CODEC.dumps(page)
+    _report(
+        f"Page: {entries} structures with {sites} sites each "
+        f"({len(content) / 1e6:.2f} MB of JSON)\n"
+    )
+
+    codecs = [JSON_CODEC]
+    if ORJSON_CODEC is None:
+        _report(
+            "orjson not found on the system! Install it with:\n\n"
+            "    pip install oteapi-optimade[orjson]\n"
+        )
+    else:
+        codecs.append(ORJSON_CODEC)
+
+    timings: dict[str, tuple[float, float]] = {}
+    for codec in codecs:
+        timings[codec.name] = (
+            _best_of(lambda codec=codec: codec.loads(content), repeat),
+            _best_of(lambda codec=codec: codec.dumps(page), repeat),
+        )
+
+    _report(f"{'backend':<10}{'decode [s]':>12}{'encode [s]':>12}")
+    for name, (decode, encode) in timings.items():
+        _report(f"{name:<10}{decode:>12.4f}{encode:>12.4f}")
+
+    if "orjson" in timings:
+        decode_speedup = timings["json"][0] / timings["orjson"][0]
+        encode_speedup = timings["json"][1] / timings["orjson"][1]
+        _report(
+            f"\norjson speed-up: {decode_speedup:.1f}x decode, "
+            f"{encode_speedup:.1f}x encode"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--entries", type=int, default=500, help="Number of structures in the page."
+    )
+    parser.add_argument(
+        "--sites", type=int, default=200, help="Number of sites per structure."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timings to take the best of."
+    )
+    args = parser.parse_args()
+
+    main(entries=args.entries, sites=args.sites, repeat=args.repeat)
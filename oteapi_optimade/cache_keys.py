@@ -0,0 +1,129 @@
+"""Canonical data cache keys for OPTIMADE URLs.
+
+Semantically identical OPTIMADE queries may be written as different URLs, e.g., with
+the query parameters in a different order, different URL encoding, different
+white-space in the `filter` or redundant default values.
+The OPTIMADE responses are stored in the data cache under the canonical form of the
+requested URL (see [`canonical_url()`][oteapi_optimade.cache_keys.canonical_url]), so
+that such queries share the cached responses.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from functools import lru_cache
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+from optimade.exceptions import BadRequest
+from optimade.filterparser import LarkParser
+
+NOOP_QUERY_PARAMETERS = {
+    "filter": "",
+    "response_format": "json",
+    "email_address": "",
+    "response_fields": "",
+    "sort": "",
+    "page_offset": "0",
+    "include": "references",
+    "api_hint": "",
+}
+"""OPTIMADE query parameter values equal to leaving out the query parameter."""
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_VERSION_REGEX = re.compile(r"/v([0-9]+(?:\.[0-9]+){0,2})(?=/|$)", re.IGNORECASE)
+_NO_SPACE_BEFORE = frozenset({",", ":", ".", ")"})
+_NO_SPACE_AFTER = frozenset({",", ":", ".", "("})
+
+LOGGER = logging.getLogger(__name__)
+
+_PARSER_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _filter_parser() -> LarkParser:
+    """Return the (slow to create) OPTIMADE filter parser for the latest grammar."""
+    return LarkParser()
+
+
+def canonical_filter(filter_: str) -> str:
+    """Return the canonical form of an OPTIMADE filter expression.
+
+    The filter is parsed with the OPTIMADE filter grammar, and its tokens are joined
+    with single spaces, except around `,`, `:`, `.` and parentheses.
+
+    Parameters:
+        filter_: The OPTIMADE filter expression.
+
+    Returns:
+        The canonical filter expression, or the stripped filter expression if it
+        cannot be parsed.
+
+    """
+    parser = _filter_parser()
+    try:
+        with _PARSER_LOCK:
+            parser.parse(filter_)
+            tokens = [str(token) for token in parser.lark.lex(filter_)]
+    except BadRequest as exc:
+        LOGGER.debug("Could not canonicalize the filter %r: %r", filter_, exc)
+        return filter_.strip()
+
+    canonical = ""
+    for token in tokens:
+        if canonical and not (
+            token in _NO_SPACE_BEFORE or canonical[-1] in _NO_SPACE_AFTER
+        ):
+            canonical += " "
+        canonical += token
+    return canonical
+
+
+@lru_cache(maxsize=1024)
+def canonical_url(url: str) -> str:
+    """Return the canonical form of an OPTIMADE URL for use as a data cache key.
+
+    - The scheme and host are lower-cased, and a default port is left out.
+    - Repeated and trailing slashes are removed from the path, and the version
+      (e.g., `V1`) is lower-cased.
+    - The query parameters are sorted by name (keeping the order of repeated
+      parameters), and uniformly URL encoded.
+    - The `filter` is canonicalized (see
+      [`canonical_filter()`][oteapi_optimade.cache_keys.canonical_filter]).
+    - Query parameters with a no-op value (see `NOOP_QUERY_PARAMETERS`) and the
+      fragment are left out.
+
+    Parameters:
+        url: The OPTIMADE URL.
+
+    Returns:
+        The canonical OPTIMADE URL.
+
+    """
+    parts = urlsplit(str(url))
+    scheme = parts.scheme.lower()
+
+    netloc = (parts.hostname or "").lower()
+    if ":" in netloc:
+        # IPv6 address
+        netloc = f"[{netloc}]"
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc += f":{parts.port}"
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo += f":{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    path = _VERSION_REGEX.sub(lambda match: f"/v{match.group(1)}", path)
+
+    query = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        canonical_value = canonical_filter(value) if name == "filter" else value
+        if NOOP_QUERY_PARAMETERS.get(name) != canonical_value:
+            query.append((name, canonical_value))
+    query.sort(key=lambda parameter: parameter[0])
+
+    return urlunsplit((scheme, netloc, path, urlencode(query, quote_via=quote), ""))
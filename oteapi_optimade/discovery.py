@@ -0,0 +1,287 @@
+"""Discovery of OPTIMADE databases and their capabilities.
+
+OPTIMADE providers are crawled through their `/links` endpoint (including child
+databases), and each database's `/info` and `/info/<entry>` endpoints.
+The resulting capabilities are stored in the data cache with a long expiration
+time (see `discovery_expire_time`), as well as in a compact in-memory index, so that
+strategies can look up capabilities without an HTTP request on every run.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from oteapi.datacache import DataCache
+from pydantic import ValidationError
+from requests import RequestException
+
+from oteapi_optimade.http_client import fetch_response, response_json
+from oteapi_optimade.models.config import OPTIMADEConfig
+from oteapi_optimade.models.discovery import OPTIMADEDatabaseCapabilities
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
+    from oteapi.models import DataCacheConfig
+
+
+DISCOVERY_CACHE_KEY_PREFIX = "optimade-discovery:"
+"""Prefix for the data cache keys of OPTIMADE database capabilities."""
+
+DISCOVERY_ENTRY_ENDPOINTS = ("structures", "references")
+"""Entry endpoints for which the available properties are discovered."""
+
+LOGGER = logging.getLogger(__name__)
+
+_INDEX: dict[str, tuple[float, OPTIMADEDatabaseCapabilities]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _normalize_base_url(base_url: str) -> str:
+    """Normalize an OPTIMADE base URL for use as an index key."""
+    return str(base_url).rstrip("/")
+
+
+def _discovery_datacache_config(config: OPTIMADEConfig) -> DataCacheConfig:
+    """Return the data cache configuration for discovered information."""
+    return config.datacache_config.model_copy(
+        update={"accessKey": None, "expireTime": config.discovery_expire_time}
+    )
+
+
+def _fetch_json(url: str, config: OPTIMADEConfig) -> dict[str, Any] | None:
+    """Return the JSON of a successful OPTIMADE response, or `None` on failure."""
+    try:
+        response = fetch_response(url, config, _discovery_datacache_config(config))
+    except (RequestException, ValueError) as exc:
+        LOGGER.warning("Could not retrieve %s: %r", url, exc)
+        return None
+
+    try:
+        content = response_json(response, config.json_backend)
+    except ValueError as exc:
+        LOGGER.warning("Could not decode the response from %s: %r", url, exc)
+        return None
+
+    if not response.get("ok", True) or "errors" in content:
+        LOGGER.warning("Got an error response from %s: %r", url, content)
+        return None
+
+    return content
+
+
+def get_child_base_urls(
+    links_url: str, config: OPTIMADEConfig | None = None, follow_external: bool = True
+) -> list[str]:
+    """Return the base URLs of the OPTIMADE databases listed by a `links` endpoint.
+
+    Both `child` databases and, if `follow_external` is set, the `child` databases of
+    the `external` and `providers` links are returned.
+    This makes it possible to use, e.g., the list of OPTIMADE providers at
+    `https://providers.optimade.org/v1/links`.
+
+    Parameters:
+        links_url: The OPTIMADE `links` endpoint URL.
+        config: The OPTIMADE configuration.
+        follow_external: Whether to include the child databases of `external` and
+            `providers` links.
+
+    Returns:
+        A list of OPTIMADE base URLs.
+
+    """
+    config = config or OPTIMADEConfig()
+    links = _fetch_json(links_url, config)
+    if links is None:
+        return []
+
+    base_urls: list[str] = []
+    for entry in links.get("data", []):
+        attributes = entry.get("attributes", {})
+
+        base_url = attributes.get("base_url")
+        if isinstance(base_url, dict):
+            base_url = base_url.get("href")
+        if not base_url:
+            continue
+
+        if attributes.get("link_type") == "child":
+            base_urls.append(base_url)
+        elif follow_external and attributes.get("link_type") in (
+            "external",
+            "providers",
+        ):
+            base_urls.extend(
+                get_child_base_urls(
+                    f"{base_url.rstrip('/')}/v1/links", config, follow_external=False
+                )
+            )
+
+    return base_urls
+
+
+def _max_page_limit(*sources: dict[str, Any]) -> int | None:
+    """Return the first (provider-specific) `page_limit_max` value found."""
+    for source in sources:
+        for key, value in source.items():
+            if key.endswith("page_limit_max") and isinstance(value, int):
+                return value
+    return None
+
+
+def _discover_database(
+    base_url: str, config: OPTIMADEConfig
+) -> OPTIMADEDatabaseCapabilities | None:
+    """Crawl the `/info` endpoints of an OPTIMADE database."""
+    info = _fetch_json(f"{base_url}/v1/info", config)
+    if info is None:
+        return None
+
+    info_data = info.get("data", {})
+    attributes = info_data.get("attributes", {}) if isinstance(info_data, dict) else {}
+
+    capabilities = OPTIMADEDatabaseCapabilities(
+        base_url=base_url,
+        api_version=(
+            attributes.get("api_version") or info.get("meta", {}).get("api_version")
+        ),
+        available_api_versions={
+            str(version["version"]): str(version["url"])
+            for version in attributes.get("available_api_versions", [])
+            if isinstance(version, dict) and "version" in version and "url" in version
+        },
+        is_index=bool(attributes.get("is_index", False)),
+        available_endpoints=attributes.get("available_endpoints", []),
+        max_page_limit=_max_page_limit(attributes, info.get("meta", {})),
+    )
+
+    for entry_endpoint in DISCOVERY_ENTRY_ENDPOINTS:
+        if entry_endpoint not in capabilities.available_endpoints:
+            continue
+
+        entry_info = _fetch_json(f"{base_url}/v1/info/{entry_endpoint}", config)
+        if entry_info is None:
+            continue
+
+        entry_data = entry_info.get("data", {})
+        if isinstance(entry_data, dict):
+            capabilities.properties[entry_endpoint] = list(
+                entry_data.get("properties", {})
+            )
+
+    return capabilities
+
+
+def _index_capabilities(
+    capabilities: OPTIMADEDatabaseCapabilities, config: OPTIMADEConfig, store: bool
+) -> None:
+    """Add capabilities to the in-memory index, and possibly the data cache."""
+    with _INDEX_LOCK:
+        _INDEX[capabilities.base_url] = (
+            time.monotonic() + config.discovery_expire_time,
+            capabilities,
+        )
+
+    if store:
+        DataCache(_discovery_datacache_config(config)).add(
+            capabilities.model_dump(),
+            key=f"{DISCOVERY_CACHE_KEY_PREFIX}{capabilities.base_url}",
+        )
+
+
+def get_capabilities(
+    base_url: str, config: OPTIMADEConfig | None = None, discover: bool = True
+) -> OPTIMADEDatabaseCapabilities | None:
+    """Look up the capabilities of an OPTIMADE database.
+
+    The in-memory index is checked first, then the data cache.
+    Only if neither has (non-expired) capabilities for the database, and `discover`
+    is set, is the database crawled.
+
+    Parameters:
+        base_url: The (unversioned) base URL of the OPTIMADE database.
+        config: The OPTIMADE configuration.
+        discover: Whether to crawl the database if its capabilities are unknown.
+
+    Returns:
+        The capabilities of the OPTIMADE database, or `None` if they are unknown.
+
+    """
+    config = config or OPTIMADEConfig()
+    base_url = _normalize_base_url(base_url)
+
+    with _INDEX_LOCK:
+        expires, capabilities = _INDEX.get(base_url, (0.0, None))
+    if capabilities is not None and expires > time.monotonic():
+        return capabilities
+
+    cache = DataCache(_discovery_datacache_config(config))
+    cache_key = f"{DISCOVERY_CACHE_KEY_PREFIX}{base_url}"
+    if cache_key in cache:
+        try:
+            capabilities = OPTIMADEDatabaseCapabilities(**cache.get(cache_key))
+        except (TypeError, ValidationError) as exc:
+            LOGGER.debug(
+                "Ignoring invalid cached capabilities for %s: %r", base_url, exc
+            )
+        else:
+            _index_capabilities(capabilities, config, store=False)
+            return capabilities
+
+    if not discover:
+        return None
+
+    capabilities = _discover_database(base_url, config)
+    if capabilities is not None:
+        _index_capabilities(capabilities, config, store=True)
+    return capabilities
+
+
+def discover_provider(
+    base_url: str, config: OPTIMADEConfig | None = None
+) -> dict[str, OPTIMADEDatabaseCapabilities]:
+    """Discover an OPTIMADE provider and all of its databases.
+
+    The provider's `/links` endpoint is crawled for child databases, and the
+    capabilities of the provider's own database (or index meta-database) as well as
+    each child database are looked up (see
+    [`get_capabilities()`][oteapi_optimade.discovery.get_capabilities]).
+
+    Parameters:
+        base_url: The (unversioned) base URL of the OPTIMADE provider, e.g., of its
+            index meta-database.
+        config: The OPTIMADE configuration.
+
+    Returns:
+        The capabilities by base URL for each discovered OPTIMADE database.
+
+    """
+    config = config or OPTIMADEConfig()
+    base_url = _normalize_base_url(base_url)
+
+    database_urls = [base_url] + [
+        _normalize_base_url(child_url)
+        for child_url in get_child_base_urls(
+            f"{base_url}/v1/links", config, follow_external=False
+        )
+    ]
+
+    discovered: dict[str, OPTIMADEDatabaseCapabilities] = {}
+    for database_url in dict.fromkeys(database_urls):
+        capabilities = get_capabilities(database_url, config)
+        if capabilities is not None:
+            discovered[database_url] = capabilities
+
+    return discovered
+
+
+def clear_index() -> None:
+    """Clear the in-memory index of OPTIMADE database capabilities.
+
+    The capabilities stored in the data cache are not removed.
+    """
+    with _INDEX_LOCK:
+        _INDEX.clear()
@@ -0,0 +1,171 @@
+"""Entry-level cache of OPTIMADE entries.
+
+Overlapping OPTIMADE queries, e.g., different filters matching the same popular
+structures, return many of the same entries.
+With `entry_cache`, the resource strategy requests the pages of a query with only the
+`id` and `last_modified` response fields (see `INDEX_RESPONSE_FIELDS`), fills in the
+entries stored in the data cache, and requests only the missing entries in batched
+`id` queries (see [`batch_id_filters()`][oteapi_optimade.entry_cache.batch_id_filters]).
+
+Entries are stored keyed by provider, entry endpoint, `id` and `last_modified` (see
+[`entry_key()`][oteapi_optimade.entry_cache.entry_key]), so that a modified entry is
+never served from the data cache.
+Entries are copied into and out of the data cache, since they are handed on to users
+in the resource strategy result, while the data cache shares its values in the
+process (see [`memory_cache`][oteapi_optimade.memory_cache]).
+"""
+
+from __future__ import annotations
+
+import logging
+from copy import deepcopy
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from oteapi_optimade import json_codec
+from oteapi_optimade.cache_keys import canonical_url
+from oteapi_optimade.memory_cache import OPTIMADEDataCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from typing import Any
+
+    from oteapi.models import DataCacheConfig
+
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+
+ENTRY_CACHE_KEY_PREFIX = "optimade-entry:"
+"""Prefix for the data cache keys of OPTIMADE entries."""
+
+INDEX_RESPONSE_FIELDS = "id,last_modified"
+"""The `response_fields` used to request the pages of a query with `entry_cache`."""
+
+MAX_BATCH_FILTER_LENGTH = 1000
+"""The maximum length of a batched `id` filter, keeping the OPTIMADE URL short enough
+for providers and `OPTIMADEUrl`."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _normalize_last_modified(last_modified: datetime | str) -> str:
+    """Return a uniform string representation of a `last_modified` value."""
+    if isinstance(last_modified, datetime):
+        return last_modified.isoformat()
+    try:
+        # Python 3.10 does not support the "Z" suffix for UTC
+        return datetime.fromisoformat(last_modified.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return last_modified
+
+
+def entry_key(
+    base_url: str,
+    endpoint: str,
+    entry_id: str,
+    last_modified: datetime | str | None,
+) -> str | None:
+    """Return the data cache key for an OPTIMADE entry.
+
+    Parameters:
+        base_url: The OPTIMADE base URL of the provider.
+        endpoint: The OPTIMADE entry endpoint, e.g., `structures`.
+        entry_id: The `id` of the entry.
+        last_modified: The `last_modified` value of the entry.
+
+    Returns:
+        The data cache key, or `None` if the entry has no `last_modified` value and
+        therefore cannot be cached.
+
+    """
+    if last_modified is None:
+        return None
+    return (
+        ENTRY_CACHE_KEY_PREFIX
+        + json_codec.dumps(
+            [
+                canonical_url(base_url),
+                endpoint,
+                entry_id,
+                _normalize_last_modified(last_modified),
+            ]
+        ).decode()
+    )
+
+
+def _entry_datacache_config(config: OPTIMADEConfig) -> DataCacheConfig:
+    """Return the data cache configuration for cached entries."""
+    return config.datacache_config.model_copy(
+        update={"accessKey": None, "expireTime": config.entry_cache_expire_time}
+    )
+
+
+def get_cached_entries(
+    keys: Iterable[str], config: OPTIMADEConfig
+) -> dict[str, dict[str, Any]]:
+    """Return the cached OPTIMADE entries for `keys`.
+
+    Parameters:
+        keys: The data cache keys of the entries (see
+            [`entry_key()`][oteapi_optimade.entry_cache.entry_key]).
+        config: The OPTIMADE configuration.
+
+    Returns:
+        Copies of the cached entries per key. Keys not in the data cache are left
+        out.
+
+    """
+    cache = OPTIMADEDataCache(_entry_datacache_config(config))
+    entries = {}
+    for key in keys:
+        try:
+            entries[key] = deepcopy(cache.get(key))
+        except KeyError:
+            continue
+    return entries
+
+
+def store_entries(entries: dict[str, dict[str, Any]], config: OPTIMADEConfig) -> None:
+    """Store OPTIMADE entries in the data cache.
+
+    Parameters:
+        entries: The entries per data cache key (see
+            [`entry_key()`][oteapi_optimade.entry_cache.entry_key]).
+        config: The OPTIMADE configuration.
+
+    """
+    cache = OPTIMADEDataCache(_entry_datacache_config(config))
+    for key, entry in entries.items():
+        cache.add(deepcopy(entry), key=key)
+
+
+def batch_id_filters(
+    entry_ids: Iterable[str], max_length: int = MAX_BATCH_FILTER_LENGTH
+) -> list[tuple[str, int]]:
+    """Return OPTIMADE filters matching entries by `id`, e.g., `id="a" OR id="b"`.
+
+    Parameters:
+        entry_ids: The `id` values of the entries.
+        max_length: The maximum length of each filter. A single `id` condition
+            exceeding it is still used as a filter on its own.
+
+    Returns:
+        The OPTIMADE filters, together matching all `entry_ids`, each with the number
+        of `id` values it matches, i.e., the `page_limit` to request it with.
+
+    """
+    filters: list[tuple[str, int]] = []
+    current = ""
+    size = 0
+    for entry_id in entry_ids:
+        escaped_id = entry_id.replace("\\", "\\\\").replace('"', '\\"')
+        condition = f'id="{escaped_id}"'
+        if current and len(current) + len(" OR ") + len(condition) > max_length:
+            filters.append((current, size))
+            current = ""
+            size = 0
+        current = f"{current} OR {condition}" if current else condition
+        size += 1
+    if current:
+        filters.append((current, size))
+    return filters
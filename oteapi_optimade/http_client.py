@@ -0,0 +1,1453 @@
+"""Process-level HTTP client utilities for requesting OPTIMADE providers.
+
+The [`requests`](https://requests.readthedocs.io) sessions are pooled per host, so
+that keep-alive connections are re-used between strategy invocations in the same
+process, instead of performing a new TCP (and TLS) handshake for every query.
+
+Transient errors are retried with exponential backoff and jitter (honouring
+`Retry-After`), and the requests to each host can be rate limited by a token bucket
+shared in the process.
+The number of concurrent requests to each host is limited by `max_concurrent_requests`.
+
+Responses with validators (`ETag`/`Last-Modified`) are kept in the data cache after
+they expire, and are then revalidated with a conditional request instead of being
+downloaded anew.
+With `stale_while_revalidate`, an expired response is returned at once within a grace
+window, while it is refreshed in a background thread.
+
+Compressed transfer is negotiated with the providers, and response bodies are
+decompressed as they are streamed. Besides gzip and deflate, brotli and zstd are
+negotiated if the `compression` extra is installed, i.e.,
+`pip install oteapi-optimade[compression]`.
+The response bodies are decoded with the configured JSON backend (see
+[`json_codec`][oteapi_optimade.json_codec]).
+
+Asynchronous requests are performed with [`httpx`](https://www.python-httpx.org),
+which can be installed with the `async` extra, i.e.,
+`pip install oteapi-optimade[async]`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import pickle
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+from oteapi_optimade import json_codec
+from oteapi_optimade.cache_keys import canonical_url
+from oteapi_optimade.exceptions import MissingDependency
+from oteapi_optimade.memory_cache import OPTIMADEDataCache
+from oteapi_optimade.models.config import DEFAULT_IDLE_TIMEOUT, DEFAULT_POOL_SIZE
+from oteapi_optimade.streaming import (
+    JSONLINES_RESPONSE_FORMATS,
+    adecode_entries,
+    adecode_jsonlines,
+    decode_entries,
+    decode_jsonlines,
+    loads_jsonlines,
+)
+
+try:
+    import httpx
+except ImportError:
+    HTTPX_AVAILABLE = False
+else:
+    HTTPX_AVAILABLE = True
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+    from typing import Any
+
+    from optimade.models import Response
+    from oteapi.models import DataCacheConfig
+
+    from oteapi_optimade.json_codec import JSONBackend
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+DEFAULT_TIMEOUT = (3, 27)
+"""Default timeout in seconds (connect, read) for requests."""
+
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+"""HTTP status codes of transient errors, for which a request is retried."""
+
+ACCEPT_ENCODING = ", ".join(
+    encoding.strip() for encoding in URLLIB3_ACCEPT_ENCODING.split(",")
+)
+"""The content encodings negotiated for (synchronous) requests.
+This depends on the available decompression packages."""
+
+CHUNK_SIZE = 64 * 1024
+"""Number of bytes to read at a time when streaming a response body."""
+
+VALIDATORS_KEY_PREFIX = "optimade-validators:"
+"""Prefix for the data cache keys of the validators of cached responses."""
+
+STREAM_KEY_PREFIX = "optimade-stream:"
+"""Prefix for the data cache keys of streamed responses."""
+
+VALIDATED_KEY_PREFIX = "optimade-validated:"
+"""Prefix for the data cache keys of validated (parsed) responses."""
+
+VALIDATED_MODEL_KEY_PREFIX = "optimade-validated-model:"
+"""Prefix for the memory tier keys of validated response models."""
+
+LAZY_VALIDATED_MODEL_KEY_PREFIX = "optimade-lazy-validated-model:"
+"""Prefix for the memory tier keys of lazily validated response models (see
+`lazy_validation`)."""
+
+LOGGER = logging.getLogger(__name__)
+
+_REFRESHES: dict[tuple[str, str], threading.Thread] = {}
+_REFRESHES_LOCK = threading.Lock()
+
+
+@dataclass
+class _PooledSession:
+    """A pooled session and its pool settings."""
+
+    session: requests.Session
+    pool_size: int
+    idle_timeout: float
+    last_used: float
+
+
+@dataclass
+class _PooledAsyncClient:
+    """A pooled asynchronous client and its pool settings."""
+
+    client: httpx.AsyncClient
+    pool_size: int
+    idle_timeout: float
+    loop: asyncio.AbstractEventLoop
+
+
+@dataclass
+class _TokenBucket:
+    """A token bucket rate limiter."""
+
+    rate: float
+    capacity: int
+    tokens: float
+    updated: float
+
+    def reserve(self) -> float:
+        """Reserve a token and return the number of seconds to wait before using it.
+
+        Must be called with `_SESSIONS_LOCK` held.
+        """
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.capacity), self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+
+_SESSIONS: dict[str, _PooledSession] = {}
+_ASYNC_CLIENTS: dict[str, _PooledAsyncClient] = {}
+_RATE_LIMITERS: dict[str, _TokenBucket] = {}
+_HOST_SLOTS: dict[str, tuple[int, threading.BoundedSemaphore]] = {}
+_ASYNC_HOST_SLOTS: dict[
+    str, tuple[asyncio.AbstractEventLoop, int, asyncio.BoundedSemaphore]
+] = {}
+_SESSIONS_LOCK = threading.Lock()
+_CLOSING_TASKS: set[asyncio.Task] = set()
+_IDLE_SWEEP: tuple[threading.Timer, float] | None = None
+
+
+def _host_key(url: str) -> str:
+    """Return the key identifying the host of a URL, i.e., `scheme://netloc`."""
+    split_url = urlsplit(str(url))
+    return f"{split_url.scheme.lower()}://{split_url.netloc.lower()}"
+
+
+def _new_session(pool_size: int) -> requests.Session:
+    """Create a new session with a connection pool of size `pool_size`."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _close_idle_sessions(now: float) -> float | None:
+    """Close and remove the pooled sessions that have been idle for longer than their
+    `idle_timeout`.
+
+    Must be called with `_SESSIONS_LOCK` held.
+
+    Returns:
+        The time (see `time.monotonic()`) the next remaining session becomes idle, or
+        `None` if there are no pooled sessions.
+
+    """
+    for host, pooled in list(_SESSIONS.items()):
+        if now - pooled.last_used > pooled.idle_timeout:
+            LOGGER.debug("Closing idle pooled session for %s", host)
+            pooled.session.close()
+            del _SESSIONS[host]
+
+    return min(
+        (pooled.last_used + pooled.idle_timeout for pooled in _SESSIONS.values()),
+        default=None,
+    )
+
+
+def _schedule_idle_sweep(next_idle: float | None, reschedule: bool = True) -> None:
+    """Schedule closing the pooled sessions when the next one becomes idle.
+
+    If `reschedule` is `False`, a scheduled sweep is only replaced by an earlier one.
+    Must be called with `_SESSIONS_LOCK` held.
+    """
+    global _IDLE_SWEEP  # noqa: PLW0603
+
+    if _IDLE_SWEEP is not None:
+        timer, sweep_at = _IDLE_SWEEP
+        if (
+            not reschedule
+            and timer.is_alive()
+            and next_idle is not None
+            and sweep_at <= next_idle
+        ):
+            return
+        timer.cancel()
+        _IDLE_SWEEP = None
+
+    if next_idle is None:
+        return
+
+    # Sweep just after the session becomes idle, as the idle time must be exceeded
+    delay = max(0.0, next_idle - time.monotonic()) + 0.01
+    timer = threading.Timer(delay, close_idle_sessions)
+    timer.daemon = True
+    timer.start()
+    _IDLE_SWEEP = timer, next_idle
+
+
+def close_idle_sessions() -> None:
+    """Close the pooled sessions that have been idle for longer than their
+    `idle_timeout`.
+
+    This is done automatically in a background timer when a pooled session expires,
+    so that the keep-alive connections of hosts that are no longer requested are
+    not left open.
+    """
+    with _SESSIONS_LOCK:
+        _schedule_idle_sweep(_close_idle_sessions(time.monotonic()))
+
+
+def get_session(
+    url: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> requests.Session:
+    """Return the pooled keep-alive session for the host of `url`.
+
+    A new session is created if none exists for the host, if the existing session
+    has been idle for more than `idle_timeout` seconds, or if it was created with a
+    different `pool_size`.
+    Sessions of any host that have been idle for more than their `idle_timeout` are
+    closed in the background (see
+    [`close_idle_sessions()`][oteapi_optimade.http_client.close_idle_sessions]).
+
+    Parameters:
+        url: The URL to be requested.
+        pool_size: The maximum number of connections to keep alive for the host.
+        idle_timeout: The number of seconds a session may be idle before its
+            connections are closed and a new session is created.
+
+    Returns:
+        A `requests.Session` shared by all callers requesting the same host.
+
+    """
+    host = _host_key(url)
+    now = time.monotonic()
+
+    with _SESSIONS_LOCK:
+        _close_idle_sessions(now)
+        pooled = _SESSIONS.get(host)
+
+        if pooled is not None and (
+            now - pooled.last_used > idle_timeout or pooled.pool_size != pool_size
+        ):
+            LOGGER.debug("Closing idle or outdated pooled session for %s", host)
+            pooled.session.close()
+            pooled = None
+
+        if pooled is None:
+            LOGGER.debug("Creating pooled session for %s (size=%d)", host, pool_size)
+            pooled = _PooledSession(
+                session=_new_session(pool_size),
+                pool_size=pool_size,
+                idle_timeout=idle_timeout,
+                last_used=now,
+            )
+            _SESSIONS[host] = pooled
+
+        pooled.idle_timeout = idle_timeout
+        pooled.last_used = now
+        _schedule_idle_sweep(
+            min(p.last_used + p.idle_timeout for p in _SESSIONS.values()),
+            reschedule=False,
+        )
+
+    return pooled.session
+
+
+def close_sessions() -> None:
+    """Close all pooled sessions and their keep-alive connections."""
+    with _SESSIONS_LOCK:
+        for pooled in _SESSIONS.values():
+            pooled.session.close()
+        _SESSIONS.clear()
+        _schedule_idle_sweep(None)
+
+
+def _new_async_client(pool_size: int, idle_timeout: float) -> httpx.AsyncClient:
+    """Create a new asynchronous client with a connection pool of size `pool_size`."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=idle_timeout,
+        ),
+    )
+
+
+def get_async_client(
+    url: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Return the pooled keep-alive asynchronous client for the host of `url`.
+
+    This is the asynchronous equivalent of
+    [`get_session()`][oteapi_optimade.http_client.get_session].
+    Since the connections of an asynchronous client belong to an event loop, a
+    client is only shared within the currently running event loop.
+
+    Parameters:
+        url: The URL to be requested.
+        pool_size: The maximum number of connections to keep alive for the host.
+        idle_timeout: The number of seconds a keep-alive connection may be idle
+            before it is closed.
+
+    Returns:
+        An `httpx.AsyncClient` shared by all callers requesting the same host in the
+        running event loop.
+
+    """
+    if not HTTPX_AVAILABLE:
+        error_message = (
+            "httpx is not found on the system. This is required to use the "
+            "asynchronous OTEAPI-OPTIMADE strategy methods. Install it with "
+            "`pip install oteapi-optimade[async]`."
+        )
+        raise MissingDependency(error_message)
+
+    host = _host_key(url)
+    loop = asyncio.get_running_loop()
+
+    with _SESSIONS_LOCK:
+        pooled = _ASYNC_CLIENTS.get(host)
+
+        if pooled is not None and (
+            pooled.loop is not loop
+            or pooled.pool_size != pool_size
+            or pooled.idle_timeout != idle_timeout
+        ):
+            LOGGER.debug("Replacing outdated pooled async client for %s", host)
+            if pooled.loop is loop:
+                task = loop.create_task(pooled.client.aclose())
+                _CLOSING_TASKS.add(task)
+                task.add_done_callback(_CLOSING_TASKS.discard)
+            pooled = None
+
+        if pooled is None:
+            LOGGER.debug(
+                "Creating pooled async client for %s (size=%d)", host, pool_size
+            )
+            pooled = _PooledAsyncClient(
+                client=_new_async_client(pool_size, idle_timeout),
+                pool_size=pool_size,
+                idle_timeout=idle_timeout,
+                loop=loop,
+            )
+            _ASYNC_CLIENTS[host] = pooled
+
+    return pooled.client
+
+
+async def aclose_async_clients() -> None:
+    """Close all pooled asynchronous clients belonging to the running event loop."""
+    loop = asyncio.get_running_loop()
+
+    with _SESSIONS_LOCK:
+        hosts = [host for host, pooled in _ASYNC_CLIENTS.items() if pooled.loop is loop]
+        clients = [_ASYNC_CLIENTS.pop(host).client for host in hosts]
+
+    for client in clients:
+        await client.aclose()
+
+
+def rate_limit_delay(url: str, rate_limit: float | None, burst: int = 1) -> float:
+    """Reserve a request to the host of `url` and return the seconds to wait first.
+
+    The token bucket of each host is shared by all callers in the process, and is
+    renewed if `rate_limit` or `burst` changes.
+
+    Parameters:
+        url: The URL to be requested.
+        rate_limit: The maximum number of requests per second to the host, or `None`
+            for no limit.
+        burst: The number of requests that may be sent in a burst.
+
+    Returns:
+        The number of seconds to wait before sending the request.
+
+    """
+    if rate_limit is None:
+        return 0.0
+
+    host = _host_key(url)
+
+    with _SESSIONS_LOCK:
+        bucket = _RATE_LIMITERS.get(host)
+
+        if bucket is None or bucket.rate != rate_limit or bucket.capacity != burst:
+            bucket = _TokenBucket(
+                rate=rate_limit,
+                capacity=burst,
+                tokens=float(burst),
+                updated=time.monotonic(),
+            )
+            _RATE_LIMITERS[host] = bucket
+
+        return bucket.reserve()
+
+
+@contextmanager
+def _host_slot(url: str, max_concurrent_requests: int) -> Iterator[None]:
+    """Hold one of the `max_concurrent_requests` request slots of the host of `url`.
+
+    The slots of each host are shared by all threads in the process, and are renewed
+    if `max_concurrent_requests` changes.
+    """
+    host = _host_key(url)
+
+    with _SESSIONS_LOCK:
+        limit, semaphore = _HOST_SLOTS.get(host, (0, None))
+        if semaphore is None or limit != max_concurrent_requests:
+            semaphore = threading.BoundedSemaphore(max_concurrent_requests)
+            _HOST_SLOTS[host] = max_concurrent_requests, semaphore
+
+    with semaphore:
+        yield
+
+
+@asynccontextmanager
+async def _ahost_slot(url: str, max_concurrent_requests: int) -> AsyncIterator[None]:
+    """Asynchronous equivalent of `_host_slot()`.
+
+    The slots of each host are shared by all tasks in the running event loop.
+    """
+    host = _host_key(url)
+    loop = asyncio.get_running_loop()
+
+    with _SESSIONS_LOCK:
+        slot_loop, limit, semaphore = _ASYNC_HOST_SLOTS.get(host, (None, 0, None))
+        if (
+            semaphore is None
+            or slot_loop is not loop
+            or limit != max_concurrent_requests
+        ):
+            semaphore = asyncio.BoundedSemaphore(max_concurrent_requests)
+            _ASYNC_HOST_SLOTS[host] = loop, max_concurrent_requests, semaphore
+
+    async with semaphore:
+        yield
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parse the seconds to wait from a `Retry-After` header value."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        LOGGER.debug("Ignoring invalid Retry-After header: %r", value)
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_delay(
+    attempt: int, retry_after: str | None, config: OPTIMADEConfig, deadline: float
+) -> float | None:
+    """Return the seconds to wait before retrying, or `None` to stop retrying."""
+    if attempt >= config.max_retries:
+        return None
+
+    delay = _retry_after(retry_after)
+    if delay is None:
+        delay = random.uniform(0, config.retry_backoff * 2**attempt)
+
+    if time.monotonic() + delay > deadline:
+        return None
+
+    return delay
+
+
+def _validators_key(url: str) -> str:
+    """Return the data cache key for the validators of the response for `url`."""
+    return f"{VALIDATORS_KEY_PREFIX}{url}"
+
+
+def _validated_model_key(url: str, lazy: bool) -> str:
+    """Return the memory tier key for the validated response model for `url`."""
+    prefix = LAZY_VALIDATED_MODEL_KEY_PREFIX if lazy else VALIDATED_MODEL_KEY_PREFIX
+    return f"{prefix}{url}"
+
+
+def _is_fresh(cache: OPTIMADEDataCache, url: str) -> bool:
+    """Whether a cached response for `url` exists and has not expired.
+
+    The (possibly large) response itself is not read.
+    """
+    if url not in cache:
+        return False
+
+    validators_key = _validators_key(url)
+    # Expired responses with validators are kept for revalidation only
+    return not (
+        validators_key in cache
+        and cache.get(validators_key)["fresh_until"] <= time.time()
+    )
+
+
+def _fresh_response(cache: OPTIMADEDataCache, url: str) -> dict[str, Any] | None:
+    """Return the cached response for `url`, if it has not expired."""
+    return cache.get(url) if _is_fresh(cache, url) else None
+
+
+def get_cached_response(
+    url: str, datacache_config: DataCacheConfig
+) -> dict[str, Any] | None:
+    """Return the cached OPTIMADE response for `url`, if it has not expired.
+
+    Expired responses kept in the data cache for revalidation are not returned.
+
+    Parameters:
+        url: The complete OPTIMADE URL.
+        datacache_config: The data cache configuration.
+
+    Returns:
+        The cached response as a dictionary with the keys `status_code`, `ok` and
+        `json` (or `content`, see
+        [`response_json()`][oteapi_optimade.http_client.response_json]), or `None`
+        if there is no (non-expired) cached response.
+
+    """
+    return _fresh_response(OPTIMADEDataCache(datacache_config), canonical_url(str(url)))
+
+
+def get_validated_response(
+    url: str, datacache_config: DataCacheConfig
+) -> dict[str, Any] | None:
+    """Return the cached validated OPTIMADE response for `url`.
+
+    A validated response is only returned while the response it was validated from
+    is cached and has not expired (see
+    [`get_cached_response()`][oteapi_optimade.http_client.get_cached_response]).
+
+    Parameters:
+        url: The complete OPTIMADE URL.
+        datacache_config: The data cache configuration.
+
+    Returns:
+        A new copy of the validated response as stored with
+        [`store_validated_response()`][oteapi_optimade.http_client.store_validated_response],
+        which may be modified, or `None` if there is no usable validated response.
+
+    """
+    cache = OPTIMADEDataCache(datacache_config)
+    key = canonical_url(str(url))
+    validated_key = f"{VALIDATED_KEY_PREFIX}{key}"
+
+    if validated_key not in cache or not _is_fresh(cache, key):
+        return None
+    validated = cache.get(validated_key)
+    if not isinstance(validated, bytes):
+        # Stored by a previous version
+        return None
+    return pickle.loads(validated)
+
+
+def store_validated_response(
+    url: str, datacache_config: DataCacheConfig, validated: dict[str, Any]
+) -> None:
+    """Store a validated OPTIMADE response for `url` in the data cache.
+
+    The validated response is stored pickled, in both tiers of the data cache (see
+    [`memory_cache`][oteapi_optimade.memory_cache]).
+    This way, it is serialized only once, and unpickling it gives each reader its
+    own copy, much faster than copying or validating it anew.
+    The validated response is removed when a new response for `url` is stored.
+
+    Parameters:
+        url: The complete OPTIMADE URL.
+        datacache_config: The data cache configuration.
+        validated: The validated response, e.g., the dumped response model and the
+            model identifier.
+
+    """
+    cache = OPTIMADEDataCache(datacache_config)
+    cache.add(
+        pickle.dumps(validated, protocol=pickle.HIGHEST_PROTOCOL),
+        key=f"{VALIDATED_KEY_PREFIX}{canonical_url(str(url))}",
+    )
+
+
+def get_validated_model(
+    url: str, datacache_config: DataCacheConfig, lazy: bool = False
+) -> Response | None:
+    """Return the validated OPTIMADE response model for `url` from the memory tier.
+
+    As for [`get_validated_response()`][oteapi_optimade.http_client.get_validated_response],
+    a validated response model is only returned while the response it was validated
+    from is cached and has not expired.
+
+    Parameters:
+        url: The complete OPTIMADE URL.
+        datacache_config: The data cache configuration.
+        lazy: Whether to return the lazily validated response model (see
+            `lazy_validation`), instead of the fully validated one.
+
+    Returns:
+        The validated OPT pydantic response model, or `None` if it is not in the
+        memory tier (see
+        [`memory_cache`][oteapi_optimade.memory_cache]).
+
+    """
+    cache = OPTIMADEDataCache(datacache_config)
+    key = canonical_url(str(url))
+    model_key = _validated_model_key(key, lazy)
+
+    if model_key not in cache or not _is_fresh(cache, key):
+        return None
+    try:
+        return cache.get(model_key)
+    except KeyError:
+        # Evicted from the memory tier in the meantime
+        return None
+
+
+def store_validated_model(
+    url: str,
+    datacache_config: DataCacheConfig,
+    response_object: Response,
+    lazy: bool = False,
+) -> None:
+    """Keep a validated OPTIMADE response model for `url` in the memory tier.
+
+    The response model is only kept in the memory tier of the process, and is
+    removed when a new response for `url` is stored.
+    Lazily and fully validated response models are kept apart, so that a lazily
+    validated response model is never returned for a fully validated one.
+
+    Parameters:
+        url: The complete OPTIMADE URL.
+        datacache_config: The data cache configuration.
+        response_object: The validated OPT pydantic response model.
+        lazy: Whether `response_object` is lazily validated (see
+            `lazy_validation`).
+
+    """
+    cache = OPTIMADEDataCache(datacache_config)
+    cache.add_to_memory(
+        response_object, key=_validated_model_key(canonical_url(str(url)), lazy)
+    )
+
+
+def _cached_response(
+    url: str,
+    config: OPTIMADEConfig,
+    datacache_config: DataCacheConfig | None,
+    allow_stale: bool = False,
+) -> tuple[OPTIMADEDataCache, dict[str, Any] | None, dict[str, Any] | None]:
+    """Return the data cache, the cached response for `url` if it should be used,
+    and the validators of an expired cached response to revalidate.
+
+    If `allow_stale` is set, an expired cached response within the
+    `stale_while_revalidate` window is returned together with its validators, and
+    should be refreshed in the background.
+    Such a stale response is marked with `stale` set to `True`.
+    """
+    cache = OPTIMADEDataCache(datacache_config or config.datacache_config)
+
+    if not config.force_refresh:
+        response = _fresh_response(cache, url)
+        if response is not None:
+            LOGGER.debug("Using cached OPTIMADE response for %s", url)
+            return cache, response, None
+
+    validators_key = _validators_key(url)
+    if validators_key in cache and url in cache:
+        validators = cache.get(validators_key)
+        if (
+            allow_stale
+            and not config.force_refresh
+            and config.stale_while_revalidate
+            and time.time() < validators["fresh_until"] + config.stale_while_revalidate
+        ):
+            LOGGER.debug("Using stale cached OPTIMADE response for %s", url)
+            return cache, {**cache.get(url), "stale": True}, validators
+        return cache, None, validators
+
+    return cache, None, None
+
+
+def _refresh_in_background(
+    cache: OPTIMADEDataCache, key: str, refresh: Callable[[], Any]
+) -> None:
+    """Call `refresh` in a background thread, unless `key` is already refreshed.
+
+    Any error is logged, leaving the stale response in the data cache, and `key` can
+    be refreshed again.
+    """
+    refresh_key = (str(cache.cache_dir), key)
+
+    def _refresh() -> None:
+        try:
+            refresh()
+        except (requests.RequestException, ValueError) as exc:
+            LOGGER.warning(
+                "Could not refresh the OPTIMADE response for %s: %r", key, exc
+            )
+        except Exception:
+            # Nothing handles an error raised in the thread, e.g., from the data cache
+            LOGGER.exception("Could not refresh the OPTIMADE response for %s", key)
+        finally:
+            with _REFRESHES_LOCK:
+                _REFRESHES.pop(refresh_key, None)
+
+    with _REFRESHES_LOCK:
+        if refresh_key in _REFRESHES:
+            return
+        thread = threading.Thread(
+            target=_refresh, name=f"optimade-refresh-{key}", daemon=True
+        )
+        _REFRESHES[refresh_key] = thread
+        thread.start()
+
+
+def _conditional_headers(validators: dict[str, Any] | None) -> dict[str, str]:
+    """Return the request headers to revalidate a cached response."""
+    headers: dict[str, str] = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _keep_expired_time(
+    has_validators: bool, expire_time: int, config: OPTIMADEConfig
+) -> int:
+    """Return the number of seconds an expired response is kept in the data cache,
+    for revalidation and to be returned while stale (see `stale_while_revalidate`).
+
+    Without a `revalidate_expire_time`, a response with validators is kept for as
+    long again as its expiration time, `expire_time`.
+    """
+    revalidate_expire_time = 0
+    if has_validators:
+        revalidate_expire_time = (
+            expire_time
+            if config.revalidate_expire_time is None
+            else config.revalidate_expire_time
+        )
+    return max(revalidate_expire_time, config.stale_while_revalidate or 0)
+
+
+def _store_validators(
+    cache: OPTIMADEDataCache,
+    key: str,
+    headers: Mapping[str, str],
+    config: OPTIMADEConfig,
+) -> int | None:
+    """Store the validators of a response in the data cache.
+
+    The validators are stored, with the time the response expires, also if the
+    response has no `ETag` or `Last-Modified` header, but should be kept while stale
+    (see `stale_while_revalidate`).
+
+    Returns:
+        The expiration time in seconds for the response in the data cache, or `None`
+        to use the expiration time of the data cache configuration.
+
+    """
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    expire_time = cache.config.expireTime
+    keep_expired_time = _keep_expired_time(
+        bool(etag or last_modified), expire_time or 0, config
+    )
+
+    if not expire_time or not keep_expired_time:
+        cache.delete(_validators_key(key))
+        return None
+
+    expire = expire_time + keep_expired_time
+    cache.add(
+        {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh_until": time.time() + expire_time,
+        },
+        key=_validators_key(key),
+        expire=expire,
+    )
+    return expire
+
+
+def _is_transient(status_code: int) -> bool:
+    """Whether `status_code` is of a transient error response (5xx or retried)."""
+    return status_code >= 500 or status_code in RETRY_STATUS_CODES
+
+
+def _stores_response(status_code: int, config: OPTIMADEConfig) -> bool:
+    """Whether a response with `status_code` is stored in the data cache."""
+    return config.cache_transient_errors or not _is_transient(status_code)
+
+
+def _response_expire(
+    cache: OPTIMADEDataCache,
+    key: str,
+    status_code: int,
+    headers: Mapping[str, str],
+    config: OPTIMADEConfig,
+) -> int | None:
+    """Return the expiration time of a response to store in the data cache.
+
+    The validators of a successful response are stored (see `_store_validators()`),
+    while error responses expire after `error_expire_time` (deterministic errors)
+    or `transient_error_expire_time` (transient errors) without revalidation.
+
+    Returns:
+        The expiration time in seconds for the response in the data cache, or `None`
+        to use the expiration time of the data cache configuration.
+
+    """
+    if status_code < 400:
+        return _store_validators(cache, key, headers, config)
+
+    cache.delete(_validators_key(key))
+    if _is_transient(status_code):
+        return config.transient_error_expire_time
+    return config.error_expire_time
+
+
+def _store_response(
+    cache: OPTIMADEDataCache,
+    url: str,
+    response: dict[str, Any],
+    headers: Mapping[str, str],
+    config: OPTIMADEConfig,
+) -> None:
+    """Store a response, and its validators, in the data cache.
+
+    A validated response stored for a previous response is removed.
+    """
+    status_code = response["status_code"]
+    if not _stores_response(status_code, config):
+        return
+
+    cache.add(
+        response,
+        key=url,
+        expire=_response_expire(cache, url, status_code, headers, config),
+    )
+    cache.delete(f"{VALIDATED_KEY_PREFIX}{url}")
+    cache.delete(_validated_model_key(url, lazy=False))
+    cache.delete(_validated_model_key(url, lazy=True))
+
+
+def _revalidated_response(
+    cache: OPTIMADEDataCache,
+    url: str,
+    validators: dict[str, Any],
+    headers: Mapping[str, str],
+    config: OPTIMADEConfig,
+) -> dict[str, Any]:
+    """Extend the expiration time of a cached response confirmed as not modified."""
+    LOGGER.debug("Cached OPTIMADE response for %s was not modified", url)
+    response: dict[str, Any] = cache.get(url)
+
+    expire_time = cache.config.expireTime or 0
+    expire = expire_time + _keep_expired_time(True, expire_time, config)
+    cache.touch(url, expire=expire)
+    for index in range(response.get("entries", 0)):
+        cache.touch(stream_entry_key(url, index), expire=expire)
+    cache.add(
+        {
+            "etag": headers.get("ETag") or validators.get("etag"),
+            "last_modified": (
+                headers.get("Last-Modified") or validators.get("last_modified")
+            ),
+            "fresh_until": time.time() + expire_time,
+        },
+        key=_validators_key(url),
+        expire=expire,
+    )
+    return response
+
+
+def _body_response(
+    url: str,
+    status_code: int,
+    ok: bool,
+    content: bytearray,
+    config: OPTIMADEConfig,
+) -> dict[str, Any]:
+    """Return a response to store in the data cache from a downloaded body.
+
+    The body is kept raw if `cache_raw_response` is set, otherwise it is decoded.
+    A successful JSON Lines response (see `JSONLINES_RESPONSE_FORMATS`) is always
+    decoded, to a JSON response with the entries as `data`, since its raw body is
+    not JSON.
+    """
+    response: dict[str, Any] = {"status_code": status_code, "ok": ok}
+    if ok and _is_jsonlines(url):
+        response["json"] = loads_jsonlines(content, config.json_backend)
+    elif config.cache_raw_response:
+        response["content"] = bytes(content)
+    else:
+        response["json"] = json_codec.loads(content, config.json_backend)
+    return response
+
+
+def response_json(response: dict[str, Any], backend: JSONBackend = "auto") -> Any:
+    """Return the JSON of a response, decoding its raw body if needed.
+
+    Parameters:
+        response: The response (see
+            [`fetch_response()`][oteapi_optimade.http_client.fetch_response]).
+        backend: The JSON backend to decode a raw body with.
+
+    Returns:
+        The decoded JSON of the response, or an empty dictionary if the response has
+        neither JSON nor a raw body.
+
+    """
+    if "json" in response:
+        return response["json"]
+    if "content" in response:
+        return json_codec.loads(response["content"], backend)
+    return {}
+
+
+def _with_transfer(
+    response: dict[str, Any], bytes_transferred: int, bytes_decoded: int
+) -> dict[str, Any]:
+    """Add the transferred (compressed) and decoded byte counts to a response."""
+    return {
+        **response,
+        "bytes_transferred": bytes_transferred,
+        "bytes_decoded": bytes_decoded,
+    }
+
+
+def _send(
+    url: str, config: OPTIMADEConfig, headers: dict[str, str]
+) -> requests.Response:
+    """Send a GET request with retries and rate limiting, streaming the response.
+
+    The body of the returned response has not been read.
+    """
+    deadline = time.monotonic() + config.retry_max_time
+    attempt = 0
+
+    while True:
+        time.sleep(rate_limit_delay(url, config.rate_limit, config.rate_limit_burst))
+
+        session = get_session(
+            url, pool_size=config.pool_size, idle_timeout=config.pool_idle_timeout
+        )
+        try:
+            http_response = session.get(
+                url,
+                headers={"Accept-Encoding": ACCEPT_ENCODING, **headers},
+                allow_redirects=True,
+                timeout=DEFAULT_TIMEOUT,
+                stream=True,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            delay = _retry_delay(attempt, None, config, deadline)
+            if delay is None:
+                raise
+            LOGGER.warning(
+                "Request to %s failed (%r), retrying in %.2fs", url, exc, delay
+            )
+        else:
+            if http_response.status_code not in RETRY_STATUS_CODES:
+                return http_response
+            delay = _retry_delay(
+                attempt, http_response.headers.get("Retry-After"), config, deadline
+            )
+            if delay is None:
+                return http_response
+            LOGGER.warning(
+                "Got HTTP status %d from %s, retrying in %.2fs",
+                http_response.status_code,
+                url,
+                delay,
+            )
+            http_response.close()
+
+        time.sleep(delay)
+        attempt += 1
+
+
+async def _asend(
+    url: str, config: OPTIMADEConfig, headers: dict[str, str]
+) -> httpx.Response:
+    """Asynchronous equivalent of `_send()`."""
+    deadline = time.monotonic() + config.retry_max_time
+    attempt = 0
+
+    while True:
+        await asyncio.sleep(
+            rate_limit_delay(url, config.rate_limit, config.rate_limit_burst)
+        )
+
+        client = get_async_client(
+            url, pool_size=config.pool_size, idle_timeout=config.pool_idle_timeout
+        )
+        try:
+            http_response = await client.send(
+                client.build_request(
+                    "GET",
+                    url,
+                    headers=headers,
+                    timeout=httpx.Timeout(
+                        DEFAULT_TIMEOUT[1], connect=DEFAULT_TIMEOUT[0]
+                    ),
+                ),
+                follow_redirects=True,
+                stream=True,
+            )
+        except httpx.TransportError as exc:
+            delay = _retry_delay(attempt, None, config, deadline)
+            if delay is None:
+                raise
+            LOGGER.warning(
+                "Request to %s failed (%r), retrying in %.2fs", url, exc, delay
+            )
+        else:
+            if http_response.status_code not in RETRY_STATUS_CODES:
+                return http_response
+            delay = _retry_delay(
+                attempt, http_response.headers.get("Retry-After"), config, deadline
+            )
+            if delay is None:
+                return http_response
+            LOGGER.warning(
+                "Got HTTP status %d from %s, retrying in %.2fs",
+                http_response.status_code,
+                url,
+                delay,
+            )
+            await http_response.aclose()
+
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def fetch_response(
+    url: str,
+    config: OPTIMADEConfig,
+    datacache_config: DataCacheConfig | None = None,
+) -> dict[str, Any]:
+    """Return the OPTIMADE response for `url`, requesting it if it is not cached.
+
+    The response is requested using the pooled session for the host and stored in
+    the data cache with the canonical form of `url` as the key (see
+    [`canonical_url()`][oteapi_optimade.cache_keys.canonical_url]).
+    Compressed transfer is negotiated (see `ACCEPT_ENCODING`), and the response body
+    is decompressed as it is streamed.
+    Connection errors, timeouts and transient error responses (see
+    `RETRY_STATUS_CODES`) are retried according to the retry settings in `config`,
+    and the request is delayed according to the host's rate limit.
+    Error responses are stored without validators, and expire according to their
+    status class (see `error_expire_time`, `transient_error_expire_time` and
+    `cache_transient_errors`).
+    An expired cached response with validators is revalidated with a conditional
+    request (see `revalidate_expire_time`).
+    A non-expired cached response is returned instead of requesting `url`, unless
+    `force_refresh` is set in `config`.
+    An expired cached response within the `stale_while_revalidate` window is also
+    returned, while it is requested anew in a background thread.
+
+    Parameters:
+        url: The complete OPTIMADE URL to request.
+        config: The OPTIMADE configuration.
+        datacache_config: The data cache configuration to use instead of the one in
+            `config`.
+
+    Returns:
+        The response as a dictionary with the keys `status_code`, `ok` and either
+        `json`, or `content` with the raw body if `cache_raw_response` is set (see
+        [`response_json()`][oteapi_optimade.http_client.response_json]).
+        If the response body was downloaded, the keys `bytes_transferred` and
+        `bytes_decoded` give the size of the body as transferred (i.e., possibly
+        compressed) and after decompression. These are not stored in the data cache.
+        A stale response, returned while it is refreshed, has the key `stale` set to
+        `True`. Nothing derived from it, e.g., a validated response, should be
+        stored, as it would outlive the refreshed response.
+
+    """
+    url = str(url)
+    key = canonical_url(url)
+    cache, response, validators = _cached_response(
+        key, config, datacache_config, allow_stale=True
+    )
+    if response is None:
+        return _download_response(url, key, cache, validators, config)
+
+    if validators is not None:
+        _refresh_in_background(
+            cache,
+            key,
+            lambda: _download_response(url, key, cache, validators, config),
+        )
+    return response
+
+
+def _download_response(
+    url: str,
+    key: str,
+    cache: OPTIMADEDataCache,
+    validators: dict[str, Any] | None,
+    config: OPTIMADEConfig,
+) -> dict[str, Any]:
+    """Request `url` (revalidating an expired cached response) and store the
+    response in the data cache."""
+    with (
+        _host_slot(url, config.max_concurrent_requests),
+        _send(url, config, _conditional_headers(validators)) as http_response,
+    ):
+        if http_response.status_code == 304 and validators is not None:
+            return _revalidated_response(
+                cache, key, validators, http_response.headers, config
+            )
+
+        # Decompress the body as it is streamed
+        content = bytearray()
+        for chunk in http_response.iter_content(CHUNK_SIZE):
+            content += chunk
+        bytes_transferred = http_response.raw.tell()
+
+    response = _body_response(
+        url, http_response.status_code, http_response.ok, content, config
+    )
+    _store_response(cache, key, response, http_response.headers, config)
+    return _with_transfer(response, bytes_transferred, len(content))
+
+
+async def afetch_response(
+    url: str,
+    config: OPTIMADEConfig,
+    datacache_config: DataCacheConfig | None = None,
+) -> dict[str, Any]:
+    """Asynchronous equivalent of
+    [`fetch_response()`][oteapi_optimade.http_client.fetch_response].
+
+    The response is requested using the pooled asynchronous client for the host,
+    except when refreshing a stale response, which is done in a background thread.
+    """
+    url = str(url)
+    key = canonical_url(url)
+    cache, response, validators = _cached_response(
+        key, config, datacache_config, allow_stale=True
+    )
+    if response is not None:
+        if validators is not None:
+            _refresh_in_background(
+                cache,
+                key,
+                lambda: _download_response(url, key, cache, validators, config),
+            )
+        return response
+
+    async with _ahost_slot(url, config.max_concurrent_requests):
+        http_response = await _asend(url, config, _conditional_headers(validators))
+        try:
+            if http_response.status_code == 304 and validators is not None:
+                return _revalidated_response(
+                    cache, key, validators, http_response.headers, config
+                )
+
+            # Decompress the body as it is streamed
+            content = bytearray()
+            async for chunk in http_response.aiter_bytes(CHUNK_SIZE):
+                content += chunk
+            bytes_transferred = http_response.num_bytes_downloaded
+        finally:
+            await http_response.aclose()
+
+    response = _body_response(
+        url, http_response.status_code, not http_response.is_error, content, config
+    )
+    _store_response(cache, key, response, http_response.headers, config)
+    return _with_transfer(response, bytes_transferred, len(content))
+
+
+def stream_key(url: str) -> str:
+    """Return the data cache key of a streamed OPTIMADE response for `url`.
+
+    The response is stored without its `data` entries, which are stored separately
+    under the keys given by
+    [`stream_entry_key()`][oteapi_optimade.http_client.stream_entry_key].
+    The number of entries is stored as `entries` in the response.
+    """
+    return f"{STREAM_KEY_PREFIX}{canonical_url(url)}"
+
+
+def stream_entry_key(key: str, index: int) -> str:
+    """Return the data cache key of the `index`-th entry of a streamed response."""
+    return f"{key}#{index}"
+
+
+class _ChunkReader:
+    """File-like reader of an iterator of (decompressed) response body chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the next non-empty chunk, or an empty bytes object at the end.
+
+        The chunk size is given by the iterator, except that `size=0` reads nothing.
+        """
+        if size == 0:
+            return b""
+        for chunk in self._chunks:
+            if chunk:
+                self.bytes_read += len(chunk)
+                return chunk
+        return b""
+
+
+class _AsyncChunkReader:
+    """Asynchronous equivalent of `_ChunkReader`."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self.bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        """Return the next non-empty chunk, or an empty bytes object at the end.
+
+        The chunk size is given by the iterator, except that `size=0` reads nothing.
+        """
+        if size == 0:
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                self.bytes_read += len(chunk)
+                return chunk
+        return b""
+
+
+class _EntryStore:
+    """Callback storing the streamed entries of a response in the data cache."""
+
+    def __init__(
+        self, cache: OPTIMADEDataCache, key: str, expire: int | None, store: bool = True
+    ) -> None:
+        self._cache = cache
+        self._key = key
+        self._expire = expire
+        self._store = store
+        self.count = 0
+
+    def __call__(self, entry: Any) -> None:
+        if self._store:
+            # Streamed entries are read once, when adapted, so they are not kept in
+            # memory.
+            self._cache.add(
+                entry,
+                key=stream_entry_key(self._key, self.count),
+                expire=self._expire,
+                memory=False,
+            )
+        self.count += 1
+
+
+def _is_jsonlines(url: str) -> bool:
+    """Whether a JSON Lines `response_format` is requested in `url`."""
+    response_format = parse_qs(urlsplit(url).query).get("response_format", [""])[-1]
+    return response_format in JSONLINES_RESPONSE_FORMATS
+
+
+def fetch_streamed_response(
+    url: str,
+    config: OPTIMADEConfig,
+    datacache_config: DataCacheConfig | None = None,
+) -> dict[str, Any]:
+    """Return the streamed OPTIMADE response for `url`, requesting it if it is not
+    cached.
+
+    This is the streaming equivalent of
+    [`fetch_response()`][oteapi_optimade.http_client.fetch_response].
+    Instead of decoding the whole response body at once, the `data` entries are
+    decoded one at a time as the body is downloaded, and stored in the data cache
+    as they arrive (see [`stream_key()`][oteapi_optimade.http_client.stream_key]).
+    This way the memory used does not grow with the size of the response.
+
+    If a JSON Lines `response_format` is requested in `url`, each line of the body is
+    an entry (see [`decode_jsonlines()`][oteapi_optimade.streaming.decode_jsonlines]),
+    except for error responses, which are decoded as a single JSON document.
+    Otherwise, the `streaming` extra is required, i.e.,
+    `pip install oteapi-optimade[streaming]`.
+
+    Parameters:
+        url: The complete OPTIMADE URL to request.
+        config: The OPTIMADE configuration.
+        datacache_config: The data cache configuration to use instead of the one in
+            `config`.
+
+    Returns:
+        The response without its `data` entries as a dictionary with the keys
+        `status_code`, `ok`, `json` and `entries` (the number of entries), as well
+        as `bytes_transferred` and `bytes_decoded` if the response body was
+        downloaded.
+
+    """
+    key = stream_key(str(url))
+    cache, response, validators = _cached_response(key, config, datacache_config)
+    if response is not None:
+        return response
+
+    with (
+        _host_slot(str(url), config.max_concurrent_requests),
+        _send(str(url), config, _conditional_headers(validators)) as http_response,
+    ):
+        if http_response.status_code == 304 and validators is not None:
+            return _revalidated_response(
+                cache, key, validators, http_response.headers, config
+            )
+
+        store = _stores_response(http_response.status_code, config)
+        expire = (
+            _response_expire(
+                cache, key, http_response.status_code, http_response.headers, config
+            )
+            if store
+            else None
+        )
+        reader = _ChunkReader(http_response.iter_content(CHUNK_SIZE))
+        entry_store = _EntryStore(cache, key, expire, store=store)
+        if not _is_jsonlines(str(url)):
+            envelope = decode_entries(reader, entry_store)
+        elif http_response.ok:
+            envelope = decode_jsonlines(reader, entry_store, config.json_backend)
+        else:
+            envelope = json_codec.loads(
+                b"".join(iter(reader.read, b"")), config.json_backend
+            )
+        bytes_transferred = http_response.raw.tell()
+
+    response = {
+        "status_code": http_response.status_code,
+        "ok": http_response.ok,
+        "json": envelope,
+        "entries": entry_store.count,
+    }
+    if store:
+        cache.add(response, key=key, expire=expire)
+    return _with_transfer(response, bytes_transferred, reader.bytes_read)
+
+
+async def afetch_streamed_response(
+    url: str,
+    config: OPTIMADEConfig,
+    datacache_config: DataCacheConfig | None = None,
+) -> dict[str, Any]:
+    """Asynchronous equivalent of
+    [`fetch_streamed_response()`][oteapi_optimade.http_client.fetch_streamed_response].
+
+    The response is requested using the pooled asynchronous client for the host.
+    """
+    key = stream_key(str(url))
+    cache, response, validators = _cached_response(key, config, datacache_config)
+    if response is not None:
+        return response
+
+    async with _ahost_slot(str(url), config.max_concurrent_requests):
+        http_response = await _asend(str(url), config, _conditional_headers(validators))
+        try:
+            if http_response.status_code == 304 and validators is not None:
+                return _revalidated_response(
+                    cache, key, validators, http_response.headers, config
+                )
+
+            store = _stores_response(http_response.status_code, config)
+            expire = (
+                _response_expire(
+                    cache, key, http_response.status_code, http_response.headers, config
+                )
+                if store
+                else None
+            )
+            reader = _AsyncChunkReader(http_response.aiter_bytes(CHUNK_SIZE))
+            entry_store = _EntryStore(cache, key, expire, store=store)
+            if not _is_jsonlines(str(url)):
+                envelope = await adecode_entries(reader, entry_store)
+            elif not http_response.is_error:
+                envelope = await adecode_jsonlines(
+                    reader, entry_store, config.json_backend
+                )
+            else:
+                content = bytearray()
+                while chunk := await reader.read():
+                    content += chunk
+                envelope = json_codec.loads(content, config.json_backend)
+            bytes_transferred = http_response.num_bytes_downloaded
+        finally:
+            await http_response.aclose()
+
+    response = {
+        "status_code": http_response.status_code,
+        "ok": not http_response.is_error,
+        "json": envelope,
+        "entries": entry_store.count,
+    }
+    if store:
+        cache.add(response, key=key, expire=expire)
+    return _with_transfer(response, bytes_transferred, reader.bytes_read)
@@ -0,0 +1,100 @@
+"""Pluggable JSON codec used for all JSON encoding and decoding in the package.
+
+By default, [`orjson`](https://github.com/ijl/orjson) is used if it is installed
+(which can be done with the `orjson` extra, i.e.,
+`pip install oteapi-optimade[orjson]`), falling back to the standard library `json`
+module.
+The backend can be chosen explicitly with the `json_backend` configuration option.
+
+Note, the data cache stores (pickles) the decoded Python objects, so cached OPTIMADE
+responses are not encoded as JSON again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from oteapi_optimade.exceptions import MissingDependency
+
+try:
+    import orjson
+except ImportError:
+    ORJSON_AVAILABLE = False
+else:
+    ORJSON_AVAILABLE = True
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from typing import Any
+
+JSONBackend = Literal["auto", "json", "orjson"]
+"""The available JSON backends. `auto` uses `orjson` if it is installed."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class JSONCodec(NamedTuple):
+    """A JSON backend's encode and decode functions."""
+
+    name: str
+    """The name of the JSON backend."""
+
+    loads: Callable[[bytes | bytearray | str], Any]
+    """Decode JSON to a Python object."""
+
+    dumps: Callable[[Any], bytes]
+    """Encode a Python object as UTF-8 encoded JSON."""
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a Python object as compact UTF-8 encoded JSON with `json`."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+JSON_CODEC = JSONCodec(name="json", loads=json.loads, dumps=_json_dumps)
+"""The standard library `json` codec."""
+
+ORJSON_CODEC = (
+    JSONCodec(name="orjson", loads=orjson.loads, dumps=orjson.dumps)
+    if ORJSON_AVAILABLE
+    else None
+)
+"""The `orjson` codec, if `orjson` is installed."""
+
+
+def get_codec(backend: JSONBackend = "auto") -> JSONCodec:
+    """Return the JSON codec for a JSON backend.
+
+    Parameters:
+        backend: The JSON backend. `auto` uses `orjson` if it is installed, otherwise
+            the standard library `json` module.
+
+    Returns:
+        The JSON codec.
+
+    """
+    if backend == "json" or (backend == "auto" and ORJSON_CODEC is None):
+        return JSON_CODEC
+
+    if ORJSON_CODEC is None:
+        error_message = (
+            "orjson is not found on the system. This is required to use the 'orjson' "
+            "JSON backend. Install it with `pip install oteapi-optimade[orjson]`."
+        )
+        raise MissingDependency(error_message)
+
+    return ORJSON_CODEC
+
+
+def loads(data: bytes | bytearray | str, backend: JSONBackend = "auto") -> Any:
+    """Decode JSON using the codec of `backend` (see
+    [`get_codec()`][oteapi_optimade.json_codec.get_codec])."""
+    return get_codec(backend).loads(data)
+
+
+def dumps(obj: Any, backend: JSONBackend = "auto") -> bytes:
+    """Encode a Python object as UTF-8 encoded JSON using the codec of `backend` (see
+    [`get_codec()`][oteapi_optimade.json_codec.get_codec])."""
+    return get_codec(backend).dumps(obj)
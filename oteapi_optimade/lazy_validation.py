@@ -0,0 +1,232 @@
+"""Lazy validation of OPTIMADE entry responses.
+
+With `lazy_validation`, the envelope of an OPTIMADE entry response (e.g., `meta` and
+`links`) and the identity (`id` and `type`) of each entry are validated up front,
+while each entry is only validated as a whole with its OPTIMADE Python tools (OPT)
+entry resource model, e.g., including large site arrays, when any of its other
+fields are accessed (see [`LazyEntry`][oteapi_optimade.lazy_validation.LazyEntry]).
+
+Entries are always validated before they are serialized (see
+[`validate_entries()`][oteapi_optimade.lazy_validation.validate_entries]).
+The resource strategy keeps lazily validated entries as
+[`LazyResource`][oteapi_optimade.lazy_validation.LazyResource] objects in its result
+until they are read.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from optimade.models import (
+    ReferenceResource,
+    ReferenceResponseMany,
+    ReferenceResponseOne,
+    StructureResource,
+    StructureResponseMany,
+    StructureResponseOne,
+)
+from pydantic import ValidationError, create_model
+from pydantic_core import core_schema
+
+from oteapi_optimade.exceptions import OPTIMADEParseError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+
+    from optimade.models import EntryResource, Success
+    from pydantic import BaseModel, GetCoreSchemaHandler
+
+LAZY_RESPONSE_MODELS: dict[type[Success], type[EntryResource]] = {
+    ReferenceResponseMany: ReferenceResource,
+    ReferenceResponseOne: ReferenceResource,
+    StructureResponseMany: StructureResource,
+    StructureResponseOne: StructureResource,
+}
+"""The entry resource model per response model supporting lazy validation."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _identity_model(resource_model: type[EntryResource]) -> type[BaseModel]:
+    """Return a model validating only the `id` and `type` of an entry resource."""
+    fields: dict[str, Any] = {
+        name: (
+            resource_model.model_fields[name].annotation,
+            resource_model.model_fields[name],
+        )
+        for name in ("id", "type")
+    }
+    return create_model(f"{resource_model.__name__}Identity", **fields)
+
+
+_IDENTITY_MODELS = {
+    resource_model: _identity_model(resource_model)
+    for resource_model in dict.fromkeys(LAZY_RESPONSE_MODELS.values())
+}
+
+
+class LazyEntry:
+    """An OPTIMADE entry, validated up front only for its `id` and `type`.
+
+    Accessing any other field, e.g., `attributes`, validates the whole entry with
+    the entry resource model (once), and returns the field of the validated entry.
+
+    Raises:
+        OPTIMADEParseError: If the entry cannot be validated when a field is
+            accessed.
+
+    """
+
+    __slots__ = ("_entry", "_resource", "id", "resource_model", "type")
+
+    def __init__(
+        self, resource_model: type[EntryResource], entry: dict[str, Any]
+    ) -> None:
+        identity = _IDENTITY_MODELS[resource_model](**entry)
+        self.id: str = identity.id  # type: ignore[attr-defined]
+        self.type: str = identity.type  # type: ignore[attr-defined]
+        self.resource_model = resource_model
+        self._entry = entry
+        self._resource: EntryResource | None = None
+
+    @property
+    def resource(self) -> EntryResource:
+        """The entry validated with the entry resource model."""
+        if self._resource is None:
+            try:
+                self._resource = self.resource_model(**self._entry)
+            except ValidationError as exc:
+                error_message = (
+                    f"Could not validate the {self.type} entry {self.id!r} as "
+                    f"{self.resource_model.__name__}."
+                )
+                LOGGER.error("%s\nValidationError: %s", error_message, exc)
+                raise OPTIMADEParseError(error_message) from exc
+        return self._resource
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resource, name)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.resource_model.__name__}, "
+            f"id={self.id!r}, validated={self._resource is not None})"
+        )
+
+
+class LazyResource(Mapping[str, Any]):
+    """An OPTIMADE resource of the resource strategy result for a lazily validated
+    entry.
+
+    This is a read-only mapping equal to the dumped entry resource model.
+    Reading the `id` or `type` does not validate the entry, while reading anything
+    else validates it (once, see
+    [`LazyEntry`][oteapi_optimade.lazy_validation.LazyEntry]).
+    It is serialized as a dictionary.
+
+    Raises:
+        OPTIMADEParseError: If the entry cannot be validated when it is read.
+
+    """
+
+    __slots__ = ("_entry", "_resource")
+
+    def __init__(self, entry: LazyEntry) -> None:
+        self._entry = entry
+        self._resource: dict[str, Any] | None = None
+
+    def _data(self) -> dict[str, Any]:
+        """The dumped entry resource model."""
+        if self._resource is None:
+            self._resource = self._entry.resource.model_dump()
+        return self._resource
+
+    def __getitem__(self, key: str) -> Any:
+        if self._resource is None and key in ("id", "type"):
+            return getattr(self._entry, key)
+        return self._data()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data())
+
+    def __len__(self) -> int:
+        return len(self._data())
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(id={self._entry.id!r}, "
+            f"validated={self._resource is not None})"
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(dict),
+        )
+
+
+def lazy_response(
+    response_model: type[Success], response_content: dict[str, Any]
+) -> Success:
+    """Validate an OPTIMADE entry response lazily.
+
+    Parameters:
+        response_model: The response model, one of `LAZY_RESPONSE_MODELS`.
+        response_content: The decoded OPTIMADE response.
+
+    Returns:
+        The validated OPTIMADE response, where the entries in `data` are
+        [`LazyEntry`][oteapi_optimade.lazy_validation.LazyEntry] objects.
+
+    Raises:
+        ValidationError: If the envelope or the identity of an entry is invalid.
+
+    """
+    resource_model = LAZY_RESPONSE_MODELS[response_model]
+    data = response_content.get("data")
+
+    if isinstance(data, list):
+        envelope = response_model(**{**response_content, "data": []})
+        lazy_data: Any = [LazyEntry(resource_model, entry) for entry in data]
+    elif isinstance(data, dict):
+        envelope = response_model(**{**response_content, "data": None})
+        lazy_data = LazyEntry(resource_model, data)
+    else:
+        return response_model(**response_content)
+
+    return envelope.model_copy(update={"data": lazy_data})
+
+
+def validate_entries(response: Success) -> Success:
+    """Validate the lazily validated entries of an OPTIMADE response.
+
+    Parameters:
+        response: The OPTIMADE response, see
+            [`lazy_response()`][oteapi_optimade.lazy_validation.lazy_response].
+
+    Returns:
+        The OPTIMADE response with all entries validated with the entry resource
+        model, e.g., to be serialized.
+
+    """
+    data = getattr(response, "data", None)
+
+    if isinstance(data, LazyEntry):
+        return response.model_copy(update={"data": data.resource})
+    if isinstance(data, list) and any(isinstance(entry, LazyEntry) for entry in data):
+        return response.model_copy(
+            update={
+                "data": [
+                    entry.resource if isinstance(entry, LazyEntry) else entry
+                    for entry in data
+                ]
+            }
+        )
+    return response
@@ -0,0 +1,413 @@
+"""In-process memory tier in front of the OTEAPI data cache.
+
+The OTEAPI data cache is an on-disk store, where every access reads and
+deserializes the whole value.
+[`OPTIMADEDataCache`][oteapi_optimade.memory_cache.OPTIMADEDataCache] keeps the most
+recently used values of the OTEAPI-OPTIMADE data cache in a least recently used (LRU)
+memory tier shared in the process.
+Reads check the memory tier first, and writes go to both tiers.
+
+The memory tier is bounded by both the total (estimated) size of the values in bytes
+and the number of values (see
+[`configure_memory_cache()`][oteapi_optimade.memory_cache.configure_memory_cache]),
+and counts its hits and misses (see
+[`memory_cache_stats()`][oteapi_optimade.memory_cache.memory_cache_stats]).
+
+Note, values in the memory tier are shared by all readers in the process, and must
+not be modified.
+Values handed on to users, e.g., cached entries (see `entry_cache`) and validated
+responses, are copied by their readers, or stored serialized.
+Changes made to the on-disk data cache by other processes are only seen once a value
+expires from, or is evicted from, the memory tier.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import TYPE_CHECKING, NamedTuple
+
+from oteapi.datacache import DataCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    import json
+    from typing import Any
+
+DEFAULT_MEMORY_CACHE_MAX_BYTES = 256 * 1024 * 1024
+"""Default maximum total size in bytes of the values in the memory tier (256 MiB)."""
+
+DEFAULT_MEMORY_CACHE_MAX_ENTRIES = 1024
+"""Default maximum number of values in the memory tier."""
+
+SIZE_ESTIMATE_SAMPLES = 8
+"""The number of items of a container sampled to estimate the size of a value."""
+
+SIZE_ESTIMATE_MAX_DEPTH = 16
+"""The maximum nesting depth followed to estimate the size of a value."""
+
+LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class MemoryCacheStats(NamedTuple):
+    """Statistics of the memory tier."""
+
+    hits: int
+    """The number of reads served from the memory tier."""
+
+    misses: int
+    """The number of reads not served from the memory tier."""
+
+    entries: int
+    """The number of values in the memory tier."""
+
+    size: int
+    """The total (estimated) size of the values in the memory tier in bytes (see
+    `estimate_size()`)."""
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """Estimate the size of a value in memory in bytes, cheaply.
+
+    Containers and the fields of objects are followed, but only the first
+    `SIZE_ESTIMATE_SAMPLES` items of a container are measured, and extrapolated to
+    all of its items.
+    This keeps the estimate fast, also for large OPTIMADE responses, whose entries
+    are mostly alike.
+
+    Parameters:
+        value: The value to estimate the size of.
+        depth: The nesting depth of `value`.
+
+    Returns:
+        The estimated size of `value` in bytes.
+
+    """
+    size = sys.getsizeof(value)
+    if depth >= SIZE_ESTIMATE_MAX_DEPTH or isinstance(
+        value, (str, bytes, bytearray, int, float, type)
+    ):
+        return size
+
+    if isinstance(value, dict):
+        samples = [
+            estimate_size(key, depth + 1) + estimate_size(item, depth + 1)
+            for key, item in islice(value.items(), SIZE_ESTIMATE_SAMPLES)
+        ]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        samples = [
+            estimate_size(item, depth + 1)
+            for item in islice(value, SIZE_ESTIMATE_SAMPLES)
+        ]
+    else:
+        fields = getattr(value, "__dict__", None)
+        slots = [
+            getattr(value, name, None)
+            for cls in type(value).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if not name.startswith("__")
+        ]
+        if fields is not None:
+            size += estimate_size(fields, depth + 1)
+        return size + sum(estimate_size(slot, depth + 1) for slot in slots)
+
+    return size + (sum(samples) * len(value) // len(samples) if samples else 0)
+
+
+class _MemoryTier:
+    """A thread-safe LRU memory tier, bounded by size in bytes and number of values.
+
+    Values are stored per data cache directory and key, together with the time they
+    expire (or `None`) and their size.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._values: OrderedDict[tuple[str, str], tuple[Any, float | None, int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _pop(self, key: tuple[str, str]) -> None:
+        """Remove a value. Must be called with `_lock` held."""
+        _, _, size = self._values.pop(key)
+        self._size -= size
+
+    def _shrink(self) -> None:
+        """Evict the least recently used values until within the bounds.
+
+        Must be called with `_lock` held.
+        """
+        while self._values and (
+            self._size > self.max_bytes or len(self._values) > self.max_entries
+        ):
+            self._pop(next(iter(self._values)))
+
+    def contains(self, key: tuple[str, str]) -> bool:
+        """Whether a non-expired value for `key` is in the memory tier."""
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return False
+            if item[1] is not None and item[1] <= time.time():
+                self._pop(key)
+                return False
+            return True
+
+    def get(self, key: tuple[str, str]) -> Any:
+        """Return the value for `key`, or `_MISSING` (counting hits and misses)."""
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[1] is not None and item[1] <= time.time():
+                self._pop(key)
+                item = None
+            if item is None:
+                self.misses += 1
+                return _MISSING
+            self.hits += 1
+            self._values.move_to_end(key)
+            return item[0]
+
+    def set(self, key: tuple[str, str], value: Any, expire_at: float | None) -> None:
+        """Store a value, unless it is larger than the memory tier."""
+        if self.max_bytes < 1 or self.max_entries < 1:
+            return
+
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._values:
+                self._pop(key)
+            if size > self.max_bytes:
+                return
+            self._values[key] = (value, expire_at, size)
+            self._size += size
+            self._shrink()
+
+    def touch(self, key: tuple[str, str], expire_at: float | None) -> None:
+        """Update the time a value expires."""
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None:
+                self._values[key] = (item[0], expire_at, item[2])
+
+    def delete(self, key: tuple[str, str]) -> None:
+        """Remove the value for `key`, if any."""
+        with self._lock:
+            if key in self._values:
+                self._pop(key)
+
+    def clear(self, directory: str | None = None) -> None:
+        """Remove all values, or only the values of a data cache directory."""
+        with self._lock:
+            for key in list(self._values):
+                if directory is None or key[0] == directory:
+                    self._pop(key)
+
+    def reset_counters(self) -> None:
+        """Reset the hit and miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, max_bytes: int, max_entries: int) -> None:
+        """Change the bounds, evicting values as needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.max_entries = max_entries
+            self._shrink()
+
+    def stats(self) -> MemoryCacheStats:
+        """Return the statistics of the memory tier."""
+        with self._lock:
+            return MemoryCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._values),
+                size=self._size,
+            )
+
+
+_MEMORY_TIER = _MemoryTier(
+    max_bytes=DEFAULT_MEMORY_CACHE_MAX_BYTES,
+    max_entries=DEFAULT_MEMORY_CACHE_MAX_ENTRIES,
+)
+
+
+def configure_memory_cache(
+    max_bytes: int = DEFAULT_MEMORY_CACHE_MAX_BYTES,
+    max_entries: int = DEFAULT_MEMORY_CACHE_MAX_ENTRIES,
+) -> None:
+    """Set the bounds of the memory tier shared in the process.
+
+    Parameters:
+        max_bytes: The maximum total (estimated) size of the values in bytes (see
+            [`estimate_size()`][oteapi_optimade.memory_cache.estimate_size]). Values
+            larger than this are only stored in the data cache.
+        max_entries: The maximum number of values. `0` disables the memory tier.
+
+    """
+    _MEMORY_TIER.resize(max_bytes=max_bytes, max_entries=max_entries)
+
+
+def memory_cache_stats() -> MemoryCacheStats:
+    """Return the hit and miss counters and the usage of the memory tier."""
+    return _MEMORY_TIER.stats()
+
+
+def clear_memory_cache() -> None:
+    """Remove all values from the memory tier and reset its counters."""
+    _MEMORY_TIER.clear()
+    _MEMORY_TIER.reset_counters()
+
+
+class OPTIMADEDataCache(DataCache):
+    """OTEAPI data cache with an in-process LRU memory tier.
+
+    Reads check the memory tier first, and writes go to both the memory tier and the
+    data cache.
+    Use `delete()` and `touch()` instead of the underlying `diskcache` to keep the
+    tiers consistent.
+    """
+
+    def _memory_key(self, key: str) -> tuple[str, str]:
+        """Return the key of the memory tier for a data cache key."""
+        return str(self.cache_dir), key
+
+    def __contains__(self, key: Any) -> bool:
+        return _MEMORY_TIER.contains(self._memory_key(key)) or super().__contains__(key)
+
+    def __delitem__(self, key: Any) -> None:
+        _MEMORY_TIER.delete(self._memory_key(key))
+        super().__delitem__(key)
+
+    def add(
+        self,
+        value: Any,
+        key: str | None = None,
+        expire: int | None = None,
+        tag: str | None = None,
+        bind: Any = None,
+        json_encoder: type[json.JSONEncoder] | None = None,
+        memory: bool = True,
+    ) -> str:
+        """Add a value to both the data cache and the memory tier.
+
+        See `oteapi.datacache.DataCache.add()` for the parameters.
+        If `memory` is `False`, the value is only added to the data cache, e.g., for
+        values that are rarely read.
+
+        Returns:
+            A key that can be used to retrieve `value` from cache later.
+
+        """
+        key = super().add(
+            value,
+            key=key,
+            expire=expire,
+            tag=tag,
+            bind=bind,
+            json_encoder=json_encoder,
+        )
+
+        if not memory:
+            _MEMORY_TIER.delete(self._memory_key(key))
+            return key
+
+        expire = expire if expire else self.config.expireTime
+        _MEMORY_TIER.set(
+            self._memory_key(key), value, time.time() + expire if expire else None
+        )
+        return key
+
+    def add_to_memory(self, value: Any, key: str, expire: int | None = None) -> None:
+        """Add a value to the memory tier only, e.g., a value that is cheap to
+        rebuild from the data cache, but expensive to rebuild often.
+
+        Parameters:
+            value: The value to add.
+            key: The key to add `value` with.
+            expire: The number of seconds until `value` expires. Defaults to the
+                `expireTime` of the data cache configuration.
+
+        """
+        expire = expire if expire else self.config.expireTime
+        _MEMORY_TIER.set(
+            self._memory_key(key), value, time.time() + expire if expire else None
+        )
+
+    def get(self, key: str) -> Any:
+        """Return the value corresponding to `key`, from the memory tier if possible.
+
+        Parameters:
+            key: The requested cached object to retrieve a value for.
+
+        Returns:
+            The value corresponding to the `key` value.
+
+        """
+        memory_key = self._memory_key(key)
+        value = _MEMORY_TIER.get(memory_key)
+        if value is not _MISSING:
+            return value
+
+        value, expire_at = self.diskcache.get(key, default=_MISSING, expire_time=True)
+        if value is _MISSING:
+            raise KeyError(key)
+        _MEMORY_TIER.set(memory_key, value, expire_at)
+        return value
+
+    def delete(self, key: str) -> bool:
+        """Remove `key` from both tiers.
+
+        Parameters:
+            key: The key to remove.
+
+        Returns:
+            Whether `key` was in the data cache.
+
+        """
+        _MEMORY_TIER.delete(self._memory_key(key))
+        return bool(self.diskcache.delete(key))
+
+    def touch(self, key: str, expire: int | None = None) -> bool:
+        """Update the expiration time of `key` in both tiers.
+
+        Parameters:
+            key: The key to update.
+            expire: The number of seconds until `key` expires, `None` for never.
+
+        Returns:
+            Whether `key` was in the data cache.
+
+        """
+        _MEMORY_TIER.touch(
+            self._memory_key(key), time.time() + expire if expire else None
+        )
+        return bool(self.diskcache.touch(key, expire=expire))
+
+    def evict(self, tag: str) -> None:
+        """Remove all cache items with the given tag from both tiers.
+
+        The memory tier does not know the tags, so all values of this data cache are
+        removed from it.
+
+        Parameters:
+            tag: Tag identifying objects.
+
+        """
+        _MEMORY_TIER.clear(str(self.cache_dir))
+        super().evict(tag)
+
+    def clear(self) -> None:
+        """Remove all items from both tiers."""
+        _MEMORY_TIER.clear(str(self.cache_dir))
+        super().clear()
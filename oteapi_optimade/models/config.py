@@ -7,6 +7,7 @@ from typing import Annotated, Literal
 from oteapi.models import AttrDict, DataCacheConfig
 from pydantic import BeforeValidator, Field, field_validator
 
+from oteapi_optimade.json_codec import JSONBackend
 from oteapi_optimade.models.custom_types import OPTIMADEUrl
 from oteapi_optimade.models.query import OPTIMADEQueryParameters
 
@@ -16,6 +17,12 @@ DEFAULT_CACHE_CONFIG_VALUES = {
 }
 """Set the `expireTime` and `tag` to default values for the data cache."""
 
+DEFAULT_POOL_SIZE = 10
+"""Default maximum number of keep-alive connections to keep per host."""
+
+DEFAULT_IDLE_TIMEOUT = 60.0
+"""Default number of seconds a pooled session may be idle before it is closed."""
+
 
 class OPTIMADEConfig(AttrDict):
     """OPTIMADE configuration."""
@@ -70,6 +77,87 @@ class OPTIMADEConfig(AttrDict):
         ),
     ] = DataCacheConfig(**DEFAULT_CACHE_CONFIG_VALUES)
 
+    force_refresh: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to always send the OPTIMADE query to the provider. By "
+                "default, a non-expired response for the same OPTIMADE URL in the data "
+                "cache is used instead of requesting it anew."
+            ),
+        ),
+    ] = False
+
+    revalidate_expire_time: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The number of seconds an expired OPTIMADE response with validators "
+                "(an `ETag` or `Last-Modified` header) is kept in the data cache. "
+                "During this time, the response is revalidated with a conditional "
+                "request (`If-None-Match`/`If-Modified-Since`) instead of being "
+                "downloaded anew, and a `304 Not Modified` response extends its "
+                "expiration time. `None` keeps it for as long again as the "
+                "`expireTime` of the data cache configuration, and `0` disables "
+                "revalidation."
+            ),
+            ge=0,
+        ),
+    ] = None
+
+    stale_while_revalidate: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The number of seconds after an OPTIMADE response in the data cache "
+                "expires (see the `expireTime` of the data cache), during which the "
+                "stale response is returned at once, while it is requested anew in a "
+                "background thread to update the data cache. Streamed responses (see "
+                "`stream_entries`) are not returned while stale. `None` disables "
+                "returning stale responses."
+            ),
+            gt=0,
+        ),
+    ] = None
+
+    error_expire_time: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The number of seconds OPTIMADE error responses with a deterministic "
+                "status (4xx, except 429 Too Many Requests) are kept in the data "
+                "cache, e.g., for malformed filters or unknown fields. They are not "
+                "revalidated. `None` uses the `expireTime` of the data cache."
+            ),
+            gt=0,
+        ),
+    ] = 3_600  # 1 hour
+
+    transient_error_expire_time: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of seconds transient OPTIMADE error responses (5xx and 429 "
+                "Too Many Requests) are kept in the data cache, once retrying has "
+                "failed. Within this time, queries to a failing provider are answered "
+                "from the data cache instead of being retried. See also "
+                "`cache_transient_errors`."
+            ),
+            gt=0,
+        ),
+    ] = 60
+
+    cache_transient_errors: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to store transient OPTIMADE error responses (5xx and 429 Too "
+                "Many Requests) in the data cache (see `transient_error_expire_time`). "
+                "If not set, such responses are never cached."
+            ),
+        ),
+    ] = True
+
     use_dlite: Annotated[
         bool,
         Field(
@@ -77,6 +165,275 @@ class OPTIMADEConfig(AttrDict):
         ),
     ] = False
 
+    paginate: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to follow the `links.next` URL of OPTIMADE entry listing "
+                "responses and combine the resources from all pages."
+            ),
+        ),
+    ] = False
+
+    max_pages: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The maximum number of pages to retrieve when `paginate` is set. "
+                "`None` means no limit."
+            ),
+            ge=1,
+        ),
+    ] = None
+
+    max_entries: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The maximum number of entries to retrieve when `paginate` is set. "
+                "`None` means no limit."
+            ),
+            ge=1,
+        ),
+    ] = None
+
+    max_concurrent_requests: Annotated[
+        int,
+        Field(
+            description=(
+                "The maximum number of concurrent requests to each OPTIMADE provider "
+                "host, shared by all queries in the process (or, for asynchronous "
+                "requests, in the event loop). If larger than 1 when `paginate` is "
+                "set, and the provider uses offset-based pagination and reports "
+                "`meta.data_returned`, all remaining pages are requested "
+                "concurrently after the first page."
+            ),
+            ge=1,
+        ),
+    ] = 1
+
+    provider_timeout: Annotated[
+        float | None,
+        Field(
+            description=(
+                "For federated queries: The number of seconds to wait for each "
+                "OPTIMADE provider. Providers not responding in time are left out of "
+                "the merged result. `None` means to wait for all providers."
+            ),
+            gt=0,
+        ),
+    ] = 60.0
+
+    pool_size: Annotated[
+        int,
+        Field(
+            description=(
+                "The maximum number of keep-alive connections to keep per OPTIMADE "
+                "provider host. Connections are shared by all strategy invocations in "
+                "the same process."
+            ),
+            ge=1,
+        ),
+    ] = DEFAULT_POOL_SIZE
+
+    pool_idle_timeout: Annotated[
+        float,
+        Field(
+            description=(
+                "The number of seconds the pooled connections to an OPTIMADE provider "
+                "host may be idle before they are closed."
+            ),
+            gt=0,
+        ),
+    ] = DEFAULT_IDLE_TIMEOUT
+
+    stream_entries: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to decode the `data` entries of OPTIMADE responses one at a "
+                "time as they are downloaded, storing, validating and adapting each "
+                "entry separately. This keeps the memory used per page flat as the "
+                "page size grows. Only supported for `structures` and `references` "
+                "JSON responses without DLite. Requires the `streaming` extra, i.e., "
+                "`pip install oteapi-optimade[streaming]`. JSON Lines responses "
+                "(`response_format=jsonlines`) are always streamed, one entry per "
+                "line, and do not require the `streaming` extra, except with DLite, "
+                "where they are downloaded whole and parsed as JSON responses."
+            ),
+        ),
+    ] = False
+
+    json_backend: Annotated[
+        JSONBackend,
+        Field(
+            description=(
+                "The JSON backend used to decode OPTIMADE responses. `auto` uses "
+                "`orjson` if it is installed, otherwise the standard library `json` "
+                "module. `orjson` can be installed with the `orjson` extra, i.e., "
+                "`pip install oteapi-optimade[orjson]`."
+            ),
+        ),
+    ] = "auto"
+
+    cache_raw_response: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to store the raw (decompressed) body of OPTIMADE responses in "
+                "the data cache, instead of the decoded JSON. The body is then only "
+                "decoded when the response is parsed, and not when it is downloaded. "
+                "This does not apply to streamed responses (see `stream_entries`)."
+            ),
+        ),
+    ] = False
+
+    cache_validated_response: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to store the validated (and dumped) OPTIMADE response in the "
+                "data cache, together with the response model and the `optimade` "
+                "package version, when it is parsed. While the cached response it was "
+                "validated from has not expired, the parse strategy then uses it "
+                "without validating the response again. The validated response model "
+                "is also kept in the in-process memory tier of the data cache, so "
+                "that the resource strategy does not validate the response again in "
+                "the same process. This is opt-in, as the validated response is a "
+                "second copy of the response on disk, which only the parse strategy "
+                "`get()` reads, e.g., when serving parsed responses in a long-running "
+                "process."
+            ),
+        ),
+    ] = False
+
+    lazy_validation: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to validate only the envelope (e.g., `meta` and `links`) and "
+                "the `id` and `type` of each entry of OPTIMADE structures and "
+                "references responses when parsing them, and to validate each entry "
+                "as a whole only when its other fields are accessed, e.g., "
+                "`attributes`. The resource strategy returns such entries as "
+                "mappings that are validated when read beyond their `id` and `type`. "
+                "Entries are always validated before the response is serialized or "
+                "stored in the entry cache (see `entry_cache`)."
+            ),
+        ),
+    ] = False
+
+    entry_cache: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to store OPTIMADE entries in the data cache, keyed by "
+                "provider, entry endpoint, `id` and `last_modified`, and assemble the "
+                "query result from them. The pages of the query are then requested "
+                "with `response_fields=id,last_modified`, and only entries not already "
+                "stored are requested, in batched `id` queries. Only supported for "
+                "`structures` and `references` JSON responses without "
+                "`response_fields`, `stream_entries` or DLite."
+            ),
+        ),
+    ] = False
+
+    entry_cache_expire_time: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of seconds OPTIMADE entries are kept in the data cache "
+                "(see `entry_cache`). As entries are keyed by their `last_modified` "
+                "value, a modified entry is never used from the data cache."
+            ),
+            gt=0,
+        ),
+    ] = 2_592_000  # 30 days
+
+    max_retries: Annotated[
+        int,
+        Field(
+            description=(
+                "The maximum number of times to retry a request to an OPTIMADE "
+                "provider after a connection error, a timeout or a transient error "
+                "response (HTTP status 429, 502, 503 or 504)."
+            ),
+            ge=0,
+        ),
+    ] = 3
+
+    retry_backoff: Annotated[
+        float,
+        Field(
+            description=(
+                "The base number of seconds for the exponential backoff between "
+                "retries. The n-th retry waits a random time (jitter) between 0 and "
+                "`retry_backoff * 2**n` seconds, unless the provider specifies a "
+                "`Retry-After` header, which is then honoured."
+            ),
+            ge=0,
+        ),
+    ] = 0.5
+
+    retry_max_time: Annotated[
+        float,
+        Field(
+            description=(
+                "The maximum total number of seconds to spend on retrying a request. "
+                "No retry is attempted if its waiting time would exceed this."
+            ),
+            gt=0,
+        ),
+    ] = 60.0
+
+    rate_limit: Annotated[
+        float | None,
+        Field(
+            description=(
+                "The maximum number of requests per second to send to each OPTIMADE "
+                "provider host. The limit is shared by all strategy invocations in the "
+                "same process. `None` means no limit."
+            ),
+            gt=0,
+        ),
+    ] = None
+
+    rate_limit_burst: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of requests that may be sent to an OPTIMADE provider host "
+                "in a burst, before `rate_limit` applies."
+            ),
+            ge=1,
+        ),
+    ] = 1
+
+    discovery_expire_time: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of seconds discovered OPTIMADE provider information (from "
+                "the `/links` and `/info` endpoints) is kept in the data cache and the "
+                "in-memory index."
+            ),
+            gt=0,
+        ),
+    ] = 604_800  # 7 days
+
+    tune_query: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to tune the OPTIMADE query to the capabilities of the "
+                "provider, as discovered from its (cached) `/info` endpoints. When "
+                "paginating, `page_limit` is raised to the provider's maximum page "
+                "limit (if not set explicitly). Unsupported properties are always "
+                "removed from `response_fields`."
+            ),
+        ),
+    ] = False
+
     @field_validator("datacache_config", mode="after")
     @classmethod
     def _default_datacache_config(
@@ -190,9 +190,23 @@ class OPTIMADEUrl(str):
         """The query part of the OPTIMADE URL."""
         return self._query
 
+    @property
+    def single_entry(self) -> bool:
+        """Whether the endpoint of the OPTIMADE URL is for a single entry.
+
+        E.g., `structures/<id>` or `info/structures`, as opposed to `structures` or
+        `info`.
+        """
+        return bool(self.endpoint and "/" in self.endpoint.strip("/"))
+
     def response_model(self) -> tuple[Success, Success] | Success | None:
-        """Return the endpoint's corresponding response model(s) (from OPT)."""
-        if not self.endpoint or self.endpoint == "versions":
+        """Return the endpoint's corresponding response model(s) (from OPT).
+
+        Single-entry endpoints, e.g., `structures/<id>`, return the response models
+        of their entry type, i.e., the same as `structures`.
+        """
+        endpoint = self.endpoint.split("/", maxsplit=1)[0] if self.endpoint else None
+        if not endpoint or endpoint == "versions":
             return None
 
         return {
@@ -201,7 +215,7 @@ class OPTIMADEUrl(str):
             "structures": (StructureResponseMany, StructureResponseOne),
             "references": (ReferenceResponseMany, ReferenceResponseOne),
             "calculations": (EntryResponseMany, EntryResponseOne),
-        }.get(self.endpoint, Success)
+        }.get(endpoint, Success)
 
     # Pydantic-related methods
     @classmethod
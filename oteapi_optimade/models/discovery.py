@@ -0,0 +1,60 @@
+"""Data models related to the discovery of OPTIMADE databases."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class OPTIMADEDatabaseCapabilities(BaseModel):
+    """The capabilities of an OPTIMADE database.
+
+    The capabilities are compiled from the database's `/info` and `/info/<entry>`
+    endpoints.
+    """
+
+    base_url: Annotated[
+        str,
+        Field(description="The (unversioned) base URL of the OPTIMADE database."),
+    ]
+    api_version: Annotated[
+        str | None,
+        Field(description="The OPTIMADE API version implemented by the database."),
+    ] = None
+    available_api_versions: Annotated[
+        dict[str, str],
+        Field(
+            description=(
+                "The versioned base URLs of the database by OPTIMADE API version."
+            ),
+        ),
+    ] = {}
+    is_index: Annotated[
+        bool,
+        Field(description="Whether the database is an index meta-database."),
+    ] = False
+    available_endpoints: Annotated[
+        list[str],
+        Field(description="The endpoints available for the database."),
+    ] = []
+    max_page_limit: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The maximum `page_limit` value accepted by the database, if known. "
+                "This is not part of the OPTIMADE specification, but some "
+                "implementations expose it as a `page_limit_max` attribute of the "
+                "`/info` endpoint."
+            ),
+        ),
+    ] = None
+    properties: Annotated[
+        dict[str, list[str]],
+        Field(
+            description=(
+                "The properties available for each entry type (e.g., `structures`) "
+                "of the database."
+            ),
+        ),
+    ] = {}
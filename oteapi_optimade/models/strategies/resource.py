@@ -7,6 +7,7 @@ from typing import Annotated, Any, Literal
 from oteapi.models import AttrDict, ResourceConfig
 from pydantic import BeforeValidator, ConfigDict, Field
 
+from oteapi_optimade.lazy_validation import LazyResource
 from oteapi_optimade.models.config import OPTIMADEConfig, OPTIMADEDLiteConfig
 from oteapi_optimade.models.custom_types import OPTIMADEUrl
 
@@ -21,8 +22,15 @@ class OPTIMADEResourceConfig(ResourceConfig):
         Field(description=ResourceConfig.model_fields["resourceType"].description),
     ]
     accessUrl: Annotated[
-        OPTIMADEUrl,
-        Field(description="Either a base OPTIMADE URL or a full OPTIMADE URL."),
+        OPTIMADEUrl | list[OPTIMADEUrl],
+        Field(
+            description=(
+                "Either a base OPTIMADE URL or a full OPTIMADE URL. For a federated "
+                "query across several OPTIMADE providers, either a list of base or "
+                "full OPTIMADE URLs, or a `links` endpoint URL listing the OPTIMADE "
+                "providers, e.g., `https://providers.optimade.org/v1/links`."
+            ),
+        ),
     ]
     accessService: Annotated[
         Literal["optimade", "optimade+dlite"],
@@ -57,11 +65,13 @@ class OPTIMADEResourceResult(AttrDict):
         ),
     ] = None
     optimade_resources: Annotated[
-        list[dict[str, Any]],
+        list[LazyResource | dict[str, Any]],
         Field(
             description=(
                 "List of OPTIMADE resources (structures, references, errors, ...) returned"
-                " from the OPTIMADE request."
+                " from the OPTIMADE request. With `lazy_validation`, entries are "
+                "validated only when read (see "
+                "[`LazyResource`][oteapi_optimade.lazy_validation.LazyResource])."
             ),
         ),
     ] = []  # noqa: RUF012
@@ -82,3 +92,43 @@ class OPTIMADEResourceResult(AttrDict):
             ),
         ),
     ] = ""
+    optimade_resource_providers: Annotated[
+        list[str],
+        Field(
+            description=(
+                "For federated queries: The OPTIMADE URL of the provider each of the "
+                "resources in `optimade_resources` was retrieved from, in the same "
+                "order."
+            ),
+        ),
+    ] = []  # noqa: RUF012
+    optimade_provider_errors: Annotated[
+        dict[str, str],
+        Field(
+            description=(
+                "For federated queries: The error per OPTIMADE provider URL for the "
+                "OPTIMADE providers that failed or did not respond in time."
+            ),
+        ),
+    ] = {}  # noqa: RUF012
+    optimade_bytes_transferred: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of response body bytes downloaded from the OPTIMADE "
+                "provider(s) for this query, as transferred, i.e., possibly "
+                "compressed. Responses taken from the data cache are not counted."
+            ),
+        ),
+    ] = 0
+    optimade_bytes_decoded: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of response body bytes downloaded from the OPTIMADE "
+                "provider(s) for this query, after decompression. Comparing this to "
+                "`optimade_bytes_transferred` shows the savings of compressed "
+                "transfer."
+            ),
+        ),
+    ] = 0
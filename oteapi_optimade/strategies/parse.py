@@ -2,23 +2,62 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
-from optimade.models import ErrorResponse, Success
-from oteapi.datacache import DataCache
+import optimade
+from optimade.models import (
+    EntryInfoResponse,
+    EntryResponseMany,
+    EntryResponseOne,
+    ErrorResponse,
+    LinksResponse,
+    ReferenceResponseMany,
+    ReferenceResponseOne,
+    StructureResponseMany,
+    StructureResponseOne,
+    Success,
+)
 from oteapi.models import AttrDict
-from oteapi.plugins import create_strategy
 from pydantic import ValidationError
 from pydantic.dataclasses import dataclass
 
+from oteapi_optimade.cache_keys import canonical_url
 from oteapi_optimade.exceptions import OPTIMADEParseError
+from oteapi_optimade.http_client import (
+    afetch_response,
+    fetch_response,
+    get_cached_response,
+    get_validated_model,
+    get_validated_response,
+    response_json,
+    store_validated_model,
+    store_validated_response,
+)
+from oteapi_optimade.lazy_validation import (
+    LAZY_RESPONSE_MODELS,
+    lazy_response,
+    validate_entries,
+)
+from oteapi_optimade.memory_cache import OPTIMADEDataCache
 from oteapi_optimade.models import OPTIMADEParseConfig, OPTIMADEParseResult
 
 if TYPE_CHECKING:  # pragma: no cover
     from typing import Any
 
+    from oteapi_optimade.models.custom_types import OPTIMADEUrl
+
+
+_SINGLE_ENTRY_RESPONSE_MODELS: frozenset[type[Success]] = frozenset(
+    {EntryInfoResponse, EntryResponseOne, ReferenceResponseOne, StructureResponseOne}
+)
+"""Response models of single-entry endpoints, e.g., `structures/<id>`."""
+
+_LIST_DATA_RESPONSE_MODELS: frozenset[type[Success]] = frozenset(
+    {EntryResponseMany, LinksResponse, ReferenceResponseMany, StructureResponseMany}
+)
+"""Response models with a list of resources as `data`."""
 
 LOGGER = logging.getLogger(__name__)
 
@@ -48,6 +87,38 @@ class OPTIMADEParseStrategy:
         """
         return AttrDict()
 
+    async def aget(self) -> OPTIMADEParseResult:
+        """Request and parse an OPTIMADE response using OPT asynchronously.
+
+        This is the asynchronous equivalent of `get()`, where the OPTIMADE response
+        is requested using a pooled asynchronous HTTP client, if it is not already in
+        the data cache.
+        Parsing is shared with `get()`.
+
+        Requires the `async` extra to be installed, i.e.,
+        `pip install oteapi-optimade[async]`.
+
+        Returns:
+            An update model of key/value-pairs to be stored in the session-specific
+            context from services.
+
+        """
+        if self.parse_config.configuration.downloadUrl is not None:
+            download_url = str(self.parse_config.configuration.downloadUrl)
+            datacache_config = self.parse_config.configuration.datacache_config
+            cache = OPTIMADEDataCache(datacache_config)
+
+            if get_cached_response(download_url, datacache_config) is None and not (
+                datacache_config.accessKey
+                and datacache_config.accessKey != canonical_url(download_url)
+                and datacache_config.accessKey in cache
+            ):
+                await afetch_response(
+                    download_url, self.parse_config.configuration, datacache_config
+                )
+
+        return await asyncio.to_thread(self.get)
+
     def get(self) -> OPTIMADEParseResult:
         """Request and parse an OPTIMADE response using OPT.
 
@@ -62,6 +133,9 @@ class OPTIMADEParseStrategy:
         1. Request OPTIMADE response.
         2. Parse as an OPTIMADE Python tools (OPT) pydantic response model.
 
+        Both steps are skipped if a validated response for the (non-expired) cached
+        response is in the data cache (see `cache_validated_response`).
+
         Returns:
             An update model of key/value-pairs to be stored in the session-specific
             context from services.
@@ -75,22 +149,203 @@ class OPTIMADEParseStrategy:
                 "Missing downloadUrl or mediaType in configuration."
             )
 
-        cache = DataCache(self.parse_config.configuration.datacache_config)
-        if self.parse_config.configuration.downloadUrl in cache:
-            response: dict[str, Any] = cache.get(
-                self.parse_config.configuration.downloadUrl
-            )
-        elif (
-            self.parse_config.configuration.datacache_config.accessKey
-            and self.parse_config.configuration.datacache_config.accessKey in cache
+        # Use a plain string as key, as the cache treats `str` subclasses differently.
+        download_url = str(self.parse_config.configuration.downloadUrl)
+
+        cache = OPTIMADEDataCache(self.parse_config.configuration.datacache_config)
+        validated = (
+            get_validated_response(download_url, cache.config)
+            if self.parse_config.configuration.cache_validated_response
+            else None
+        )
+        if validated is not None and validated.get("optimade_version") != (
+            optimade.__version__
         ):
-            response = cache.get(
-                self.parse_config.configuration.datacache_config.accessKey
+            LOGGER.debug(
+                "Ignoring cached response validated with optimade %s",
+                validated.get("optimade_version"),
+            )
+            validated = None
+
+        if validated is None:
+            validated = self._validate_response(
+                self.parse_config.configuration.downloadUrl, cache
             )
         else:
-            download_config = self.parse_config.configuration.model_copy()
-            download_output = create_strategy("download", download_config).get()
-            response = {"json": json.loads(cache.get(download_output.pop("key")))}
+            LOGGER.debug(
+                "Using cached validated OPTIMADE response for %s", download_url
+            )
+
+        result = OPTIMADEParseResult(
+            model_config=self.parse_config.configuration.model_dump(),
+            optimade_response_model=validated["optimade_response_model"],
+            optimade_response=validated["optimade_response"],
+        )
+
+        if (
+            self.parse_config.configuration.optimade_config
+            and self.parse_config.configuration.optimade_config.query_parameters
+        ):
+            result = result.model_copy(
+                update={
+                    "optimade_config": self.parse_config.configuration.optimade_config.model_copy(
+                        update={
+                            "query_parameters": self.parse_config.configuration.optimade_config.query_parameters.model_dump(
+                                exclude_defaults=True,
+                                exclude_unset=True,
+                            )
+                        }
+                    )
+                }
+            )
+
+        return result
+
+    def parse_response(
+        self, response: dict[str, Any] | None = None
+    ) -> ErrorResponse | Success:
+        """Request and parse an OPTIMADE response using OPT, in-process.
+
+        This is the in-process equivalent of `get()`, returning the validated OPT
+        pydantic response model, instead of its serialized form.
+        It is used by the OPTIMADE resource strategy to avoid validating the
+        response again, when the parse strategy is run in the same process.
+
+        With `lazy_validation`, the entries of the response are only validated when
+        accessed (see [`lazy_validation`][oteapi_optimade.lazy_validation]).
+
+        With `cache_validated_response`, the validated response model is kept in the
+        memory tier of the data cache (see
+        [`memory_cache`][oteapi_optimade.memory_cache]), and used without validating
+        the response again while the cached response has not expired.
+
+        Parameters:
+            response: The response for `downloadUrl`, already requested (see
+                [`fetch_response()`][oteapi_optimade.http_client.fetch_response]).
+                If given, it is parsed instead of retrieving the response, e.g., an
+                error response that is not stored in the data cache.
+
+        Returns:
+            The validated OPT pydantic response model.
+
+        """
+        if (
+            self.parse_config.configuration.downloadUrl is None
+            or self.parse_config.configuration.mediaType is None
+        ):
+            raise OPTIMADEParseError(
+                "Missing downloadUrl or mediaType in configuration."
+            )
+
+        # Use a plain string as key, as the cache treats `str` subclasses differently.
+        download_url = str(self.parse_config.configuration.downloadUrl)
+        cache = OPTIMADEDataCache(self.parse_config.configuration.datacache_config)
+        cache_validated_response = (
+            self.parse_config.configuration.cache_validated_response
+        )
+        lazy_validation = self.parse_config.configuration.lazy_validation
+
+        if cache_validated_response:
+            validated_object = get_validated_model(
+                download_url, cache.config, lazy=lazy_validation
+            )
+            if validated_object is not None:
+                LOGGER.debug(
+                    "Using validated OPTIMADE response model for %s", download_url
+                )
+                return validated_object
+
+        response_object, from_download_url = self._parse_response(
+            self.parse_config.configuration.downloadUrl, cache, response
+        )
+        if from_download_url and cache_validated_response:
+            store_validated_model(
+                download_url, cache.config, response_object, lazy=lazy_validation
+            )
+        return response_object
+
+    def _validate_response(
+        self, optimade_url: OPTIMADEUrl, cache: OPTIMADEDataCache
+    ) -> dict[str, Any]:
+        """Retrieve and validate the OPTIMADE response for `optimade_url`.
+
+        The validated response is stored in the data cache (see
+        `cache_validated_response`), unless the response was retrieved with a
+        different `accessKey`.
+
+        Parameters:
+            optimade_url: The complete OPTIMADE URL.
+            cache: The data cache.
+
+        Returns:
+            The validated response with the keys `optimade_response_model`,
+            `optimade_response` and `optimade_version`.
+
+        """
+        response_object, from_download_url = self._parse_response(optimade_url, cache)
+        response_object = validate_entries(response_object)
+
+        validated = {
+            "optimade_response_model": (
+                response_object.__class__.__module__,
+                response_object.__class__.__name__,
+            ),
+            "optimade_response": response_object.model_dump(exclude_unset=True),
+            "optimade_version": optimade.__version__,
+        }
+        if (
+            from_download_url
+            and self.parse_config.configuration.cache_validated_response
+        ):
+            store_validated_response(str(optimade_url), cache.config, validated)
+
+        return validated
+
+    def _parse_response(
+        self,
+        optimade_url: OPTIMADEUrl,
+        cache: OPTIMADEDataCache,
+        response: dict[str, Any] | None = None,
+    ) -> tuple[ErrorResponse | Success, bool]:
+        """Retrieve the OPTIMADE response for `optimade_url` and parse it using OPT.
+
+        Parameters:
+            optimade_url: The complete OPTIMADE URL.
+            cache: The data cache.
+            response: The response for `optimade_url`, if already requested.
+
+        Returns:
+            The validated OPT pydantic response model, and whether the validated
+            response may be stored for `optimade_url`, i.e., the response was
+            retrieved for `optimade_url` (and not with a different `accessKey`), and
+            was not stale (see `stale_while_revalidate`).
+
+        """
+        # Use a plain string as key, as the cache treats `str` subclasses differently.
+        download_url = str(optimade_url)
+        access_key = cache.config.accessKey
+        if response is None:
+            response = get_cached_response(download_url, cache.config)
+        from_download_url = True
+        if (
+            response is None
+            and access_key
+            and access_key != canonical_url(download_url)
+        ):
+            response = cache.get(access_key) if access_key in cache else None
+            from_download_url = response is None
+        if response is None:
+            response = fetch_response(
+                download_url, self.parse_config.configuration, cache.config
+            )
+        if response.get("stale", False):
+            # Refreshed in the background, so not to be stored as validated
+            from_download_url = False
+
+        # Decode a raw response body only now (see `cache_raw_response`)
+        response_content = response_json(
+            response, self.parse_config.configuration.json_backend
+        )
 
         if (
             not response.get("ok", True)
@@ -98,11 +353,11 @@ class OPTIMADEParseStrategy:
                 response.get("status_code", 200) < 200
                 or response.get("status_code", 200) >= 300
             )
-            or "errors" in response.get("json", {})
+            or "errors" in response_content
         ):
             # Error response
             try:
-                response_object = ErrorResponse(**response.get("json", {}))
+                response_object = ErrorResponse(**response_content)
             except ValidationError as exc:
                 error_message = "Could not validate an error response."
                 LOGGER.error(
@@ -114,17 +369,24 @@ class OPTIMADEParseStrategy:
                 raise OPTIMADEParseError(error_message) from exc
         else:
             # Successful response
-            response_model = (
-                self.parse_config.configuration.downloadUrl.response_model()
-            )
+            response_model = optimade_url.response_model()
             LOGGER.debug("response_model=%r", response_model)
             if response_model:
-                if not isinstance(response_model, tuple):
+                if isinstance(response_model, tuple):
+                    response_model = _dispatch_response_model(
+                        optimade_url, response_content, response_model
+                    )
+                else:
                     response_model = (response_model,)
 
+                lazy_validation = self.parse_config.configuration.lazy_validation
                 for model_cls in response_model:
                     try:
-                        response_object = model_cls(**response.get("json", {}))
+                        response_object = (
+                            lazy_response(model_cls, response_content)
+                            if lazy_validation and model_cls in LAZY_RESPONSE_MODELS
+                            else model_cls(**response_content)
+                        )
                     except ValidationError:
                         pass
                     else:
@@ -134,7 +396,7 @@ class OPTIMADEParseStrategy:
                     LOGGER.error(
                         "%s\nURL=%r\n" "response_models=%r\nresponse=%s",
                         error_message,
-                        self.parse_config.configuration.downloadUrl,
+                        optimade_url,
                         response_model,
                         response,
                     )
@@ -143,7 +405,7 @@ class OPTIMADEParseStrategy:
                 # No "endpoint" or unknown
                 LOGGER.debug("No response_model, using Success response model.")
                 try:
-                    response_object = Success(**response.get("json", {}))
+                    response_object = Success(**response_content)
                 except ValidationError as exc:
                     error_message = "Unknown or unparseable endpoint."
                     LOGGER.error(
@@ -151,37 +413,52 @@ class OPTIMADEParseStrategy:
                         "URL=%r\nendpoint=%r\nresponse_model=%r\nresponse=%s",
                         error_message,
                         exc,
-                        self.parse_config.configuration.downloadUrl,
-                        self.parse_config.configuration.downloadUrl.endpoint,
+                        optimade_url,
+                        optimade_url.endpoint,
                         response_model,
                         response,
                     )
                     raise OPTIMADEParseError(error_message) from exc
 
-        result = OPTIMADEParseResult(
-            model_config=self.parse_config.configuration.model_dump(),
-            optimade_response_model=(
-                response_object.__class__.__module__,
-                response_object.__class__.__name__,
-            ),
-            optimade_response=response_object.model_dump(exclude_unset=True),
-        )
+        return response_object, from_download_url
 
-        if (
-            self.parse_config.configuration.optimade_config
-            and self.parse_config.configuration.optimade_config.query_parameters
-        ):
-            result = result.model_copy(
-                update={
-                    "optimade_config": self.parse_config.configuration.optimade_config.model_copy(
-                        update={
-                            "query_parameters": self.parse_config.configuration.optimade_config.query_parameters.model_dump(
-                                exclude_defaults=True,
-                                exclude_unset=True,
-                            )
-                        }
-                    )
-                }
-            )
 
-        return result
+def _dispatch_response_model(
+    optimade_url: OPTIMADEUrl,
+    response_content: dict[str, Any],
+    response_models: tuple[type[Success], ...],
+) -> tuple[type[Success], ...]:
+    """Choose the response model up front, instead of trying to validate with each.
+
+    The response model is chosen from whether the endpoint is for a single entry
+    (see `OPTIMADEUrl.single_entry`) and whether `data` is a list or an object.
+
+    Parameters:
+        optimade_url: The complete OPTIMADE URL.
+        response_content: The decoded OPTIMADE response.
+        response_models: The possible response models for the endpoint.
+
+    Returns:
+        A single matching response model, or all `response_models` (matching ones
+        first) if the response model is ambiguous.
+
+    """
+    data = response_content.get("data")
+    matching = tuple(
+        model
+        for model in response_models
+        if (model in _SINGLE_ENTRY_RESPONSE_MODELS) == optimade_url.single_entry
+        and (
+            not isinstance(data, (dict, list))
+            or isinstance(data, list) == (model in _LIST_DATA_RESPONSE_MODELS)
+        )
+    )
+    if len(matching) == 1:
+        return matching
+
+    LOGGER.debug(
+        "Ambiguous response model for %s, trying each of %r",
+        optimade_url,
+        response_models,
+    )
+    return matching + tuple(model for model in response_models if model not in matching)
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from typing import TYPE_CHECKING
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, parse_qsl, quote, urlencode, urlsplit, urlunsplit
 
-import requests
 from optimade.adapters import Reference, Structure
 from optimade.models import (
     ErrorResponse,
@@ -30,15 +34,45 @@ try:
 except ImportError:
     oteapi_dlite_version = None
 
-from oteapi_optimade.exceptions import MissingDependency, OPTIMADEParseError
+from oteapi_optimade.cache_keys import canonical_url
+from oteapi_optimade.discovery import get_capabilities, get_child_base_urls
+from oteapi_optimade.entry_cache import (
+    INDEX_RESPONSE_FIELDS,
+    batch_id_filters,
+    entry_key,
+    get_cached_entries,
+    store_entries,
+)
+from oteapi_optimade.exceptions import (
+    ConfigurationError,
+    MissingDependency,
+    OPTIMADEParseError,
+    OPTIMADEResponseError,
+)
+from oteapi_optimade.http_client import (
+    afetch_response,
+    afetch_streamed_response,
+    fetch_response,
+    fetch_streamed_response,
+    get_cached_response,
+    stream_entry_key,
+    stream_key,
+)
+from oteapi_optimade.lazy_validation import LazyEntry, LazyResource
 from oteapi_optimade.models import OPTIMADEResourceConfig, OPTIMADEResourceResult
 from oteapi_optimade.models.custom_types import OPTIMADEUrl
 from oteapi_optimade.models.query import OPTIMADEQueryParameters
+from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+from oteapi_optimade.streaming import JSONLINES_RESPONSE_FORMATS
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Generator
     from typing import Any, TypedDict
 
+    from optimade.adapters.base import EntryAdapter
     from optimade.models import Response as OPTIMADEResponse
+    from optimade.models import Success
+    from oteapi.models import DataCacheConfig
 
     class ParseConfigDict(TypedDict):
         """Type definition for the `parse_config` dictionary."""
@@ -48,8 +82,40 @@ if TYPE_CHECKING:  # pragma: no cover
         configuration: dict[str, Any]
 
 
+PARSE_CONFIG_FIELDS = frozenset(
+    {
+        "revalidate_expire_time",
+        "stale_while_revalidate",
+        "error_expire_time",
+        "transient_error_expire_time",
+        "cache_transient_errors",
+        "max_concurrent_requests",
+        "pool_size",
+        "pool_idle_timeout",
+        "cache_raw_response",
+        "cache_validated_response",
+        "lazy_validation",
+        "max_retries",
+        "retry_backoff",
+        "retry_max_time",
+        "rate_limit",
+        "rate_limit_burst",
+    }
+)
+"""The configuration fields passed on to the parse strategy, so that it requests,
+caches and parses a response the same way as the resource strategy."""
+
 LOGGER = logging.getLogger(__name__)
 
+_DLITE_LOCK = threading.Lock()
+
+_ENTRY_MODELS: dict[str, tuple[type[Success], type[EntryAdapter]]] = {
+    "structures": (StructureResponseMany, Structure),
+    "references": (ReferenceResponseMany, Reference),
+}
+"""Response model and entry adapter per entry endpoint supporting `stream_entries` and
+`entry_cache`."""
+
 
 def use_dlite(access_service: str, use_dlite_flag: bool) -> bool:
     """Determine whether DLite should be utilized in the Resource strategy.
@@ -126,14 +192,249 @@ class OPTIMADEResourceStrategy:
         1. Update configuration according to session.
         2. Deconstruct `accessUrl` (done partly by
            `oteapi_optimade.models.custom_types.OPTIMADEUrl`).
-        3. Reconstruct the complete query URL.
-        4. Send query.
+        3. Reconstruct the complete query URL, tuned to the provider's capabilities
+           if `tune_query` is set.
+        4. Send query, unless a non-expired response is already in the data cache
+           (see `force_refresh`).
         5. Store result in data cache.
+        6. If `paginate` is set, repeat steps 4 and 5 for the `links.next` URL of the
+           response until there are no more pages, or `max_pages`/`max_entries` is
+           reached.
+
+        If `accessUrl` is a list of OPTIMADE URLs or a provider list (a `links`
+        endpoint URL), the query is instead performed as a federated query, i.e.,
+        the workflow above is run concurrently for each OPTIMADE provider and the
+        results are merged.
 
         Returns:
             An update model of key/value-pairs to be stored in the session-specific
             context from services.
 
+        """
+        if self._is_federated():
+            return self._get_federated()
+
+        query_pages = self._query_pages()
+
+        page_urls = _next_step(query_pages)
+        while isinstance(page_urls, list):
+            responses = self._fetch_pages(page_urls)
+            page_urls = _next_step(query_pages, responses)
+
+        return page_urls
+
+    async def aget(self) -> OPTIMADEResourceResult:
+        """Execute an OPTIMADE query to `accessUrl` asynchronously.
+
+        This is the asynchronous equivalent of `get()`, where the OPTIMADE responses
+        are requested using a pooled asynchronous HTTP client.
+        The data cache and the parsing of the responses are shared with `get()`.
+        Parsing is run in a separate thread to not block the event loop.
+
+        Requires the `async` extra to be installed, i.e.,
+        `pip install oteapi-optimade[async]`.
+
+        Returns:
+            An update model of key/value-pairs to be stored in the session-specific
+            context from services.
+
+        """
+        if self._is_federated():
+            return await self._aget_federated()
+
+        query_pages = self._query_pages()
+
+        page_urls = await asyncio.to_thread(_next_step, query_pages)
+        while isinstance(page_urls, list):
+            responses = await self._afetch_pages(page_urls)
+            page_urls = await asyncio.to_thread(_next_step, query_pages, responses)
+
+        return page_urls
+
+    def _is_federated(self) -> bool:
+        """Whether `accessUrl` refers to several OPTIMADE providers."""
+        return (
+            isinstance(self.resource_config.accessUrl, list)
+            or self.resource_config.accessUrl.endpoint == "links"
+        )
+
+    def _provider_strategies(self) -> dict[str, OPTIMADEResourceStrategy]:
+        """Create a resource strategy for each OPTIMADE provider of a federated query.
+
+        Returns:
+            A resource strategy per OPTIMADE provider URL.
+
+        """
+        if isinstance(self.resource_config.accessUrl, list):
+            provider_urls = [str(url) for url in self.resource_config.accessUrl]
+        else:
+            provider_urls = get_child_base_urls(
+                str(self.resource_config.accessUrl),
+                self.resource_config.configuration,
+            )
+            LOGGER.debug(
+                "Found %d OPTIMADE providers from %s",
+                len(provider_urls),
+                self.resource_config.accessUrl,
+            )
+
+        return {
+            provider_url: OPTIMADEResourceStrategy(
+                self.resource_config.model_copy(
+                    update={"accessUrl": OPTIMADEUrl(provider_url)}, deep=True
+                )
+            )
+            for provider_url in dict.fromkeys(provider_urls)
+        }
+
+    def _get_federated(self) -> OPTIMADEResourceResult:
+        """Perform a federated OPTIMADE query.
+
+        The query is sent concurrently to all OPTIMADE providers.
+        OPTIMADE providers failing or not responding within `provider_timeout` are
+        left out of the merged result (see
+        `OPTIMADEResourceResult.optimade_provider_errors`).
+
+        Returns:
+            The merged result of the OPTIMADE query.
+
+        """
+        provider_strategies = self._provider_strategies()
+        if not provider_strategies:
+            return self._merge_provider_results({})
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(provider_strategies),
+            thread_name_prefix="oteapi-optimade-federated",
+        )
+        futures = {
+            provider_url: executor.submit(strategy.get)
+            for provider_url, strategy in provider_strategies.items()
+        }
+        wait(
+            futures.values(),
+            timeout=self.resource_config.configuration.provider_timeout,
+        )
+        # Do not wait for any slow OPTIMADE providers
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        provider_results: dict[str, OPTIMADEResourceResult | BaseException] = {}
+        for provider_url, future in futures.items():
+            if not future.done():
+                provider_results[provider_url] = TimeoutError(
+                    "No response within "
+                    f"{self.resource_config.configuration.provider_timeout} seconds."
+                )
+            else:
+                provider_results[provider_url] = future.exception() or future.result()
+
+        return self._merge_provider_results(provider_results)
+
+    async def _aget_federated(self) -> OPTIMADEResourceResult:
+        """Asynchronous equivalent of `_get_federated()`."""
+        provider_strategies = await asyncio.to_thread(self._provider_strategies)
+
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    strategy.aget(),
+                    timeout=self.resource_config.configuration.provider_timeout,
+                )
+                for strategy in provider_strategies.values()
+            ),
+            return_exceptions=True,
+        )
+
+        return self._merge_provider_results(
+            dict(zip(provider_strategies, results, strict=True))
+        )
+
+    def _merge_provider_results(
+        self,
+        provider_results: dict[str, OPTIMADEResourceResult | BaseException],
+    ) -> OPTIMADEResourceResult:
+        """Merge the results of a federated OPTIMADE query.
+
+        Parameters:
+            provider_results: The result, or the raised exception, per OPTIMADE
+                provider URL.
+
+        Returns:
+            The merged result, where the resources are tagged by the OPTIMADE provider
+            URL in `optimade_resource_providers`.
+
+        """
+        result = OPTIMADEResourceResult()
+        optimade_resources: list[dict[str, Any] | LazyResource] = []
+        optimade_resource_providers: list[str] = []
+        optimade_provider_errors: dict[str, str] = {}
+
+        bytes_transferred = bytes_decoded = 0
+
+        for provider_url, provider_result in provider_results.items():
+            if isinstance(provider_result, BaseException):
+                LOGGER.warning(
+                    "Could not retrieve OPTIMADE resources from %s: %r",
+                    provider_url,
+                    provider_result,
+                )
+                optimade_provider_errors[provider_url] = (
+                    f"{provider_result.__class__.__name__}: {provider_result}"
+                )
+                continue
+
+            bytes_transferred += provider_result.optimade_bytes_transferred
+            bytes_decoded += provider_result.optimade_bytes_decoded
+
+            if provider_result.optimade_resource_model.endswith(":OptimadeError"):
+                LOGGER.warning(
+                    "Got an error response from %s: %r",
+                    provider_url,
+                    provider_result.optimade_resources,
+                )
+                optimade_provider_errors[provider_url] = "; ".join(
+                    str(error.get("detail") or error.get("title") or error)
+                    for error in provider_result.optimade_resources
+                )
+                continue
+
+            if not result.optimade_resource_model:
+                result = provider_result.model_copy(
+                    update={
+                        "optimade_resources": [],
+                        "optimade_resource_providers": [],
+                        "optimade_provider_errors": {},
+                    }
+                )
+
+            optimade_resources.extend(provider_result.optimade_resources)
+            optimade_resource_providers.extend(
+                [provider_url] * len(provider_result.optimade_resources)
+            )
+
+        result.optimade_resources = optimade_resources
+        result.optimade_resource_providers = optimade_resource_providers
+        result.optimade_provider_errors = optimade_provider_errors
+        result.optimade_bytes_transferred = bytes_transferred
+        result.optimade_bytes_decoded = bytes_decoded
+
+        return result
+
+    def _query_pages(
+        self,
+    ) -> Generator[list[str], dict[str, dict[str, Any]], OPTIMADEResourceResult]:
+        """Perform the OPTIMADE query without doing any requests itself.
+
+        This generator yields lists of OPTIMADE URLs, which must be requested and
+        stored in the data cache (see `_fetch_pages()` and `_afetch_pages()`) before
+        it is resumed with the responses per OPTIMADE URL. The responses are parsed
+        as they are, so that they are never requested again, e.g., for error
+        responses that are not stored in the data cache. This way the workflow
+        described in `get()` is shared between `get()` and `aget()`.
+
+        Returns:
+            The result of the OPTIMADE query.
+
         """
         if self.resource_config.configuration.optimade_config:
             self.resource_config.configuration.update(
@@ -144,15 +445,23 @@ class OPTIMADEResourceStrategy:
                 )
             )
 
-        optimade_endpoint = self.resource_config.accessUrl.endpoint or "structures"
+        access_url = self.resource_config.accessUrl
+        if isinstance(access_url, list):
+            error_message = (
+                "A list of OPTIMADE URLs can only be used for federated queries."
+            )
+            raise ConfigurationError(error_message)
+
+        optimade_endpoint = access_url.endpoint or "structures"
+
         optimade_query = (
             self.resource_config.configuration.query_parameters
             or OPTIMADEQueryParameters()
         )
         LOGGER.debug("resource_config: %r", self.resource_config)
 
-        if self.resource_config.accessUrl.query:
-            parsed_query = parse_qs(self.resource_config.accessUrl.query)
+        if access_url.query:
+            parsed_query = parse_qs(access_url.query)
             for field, value in parsed_query.items():
                 # Only use the latest defined value for any parameter
                 if field not in optimade_query.model_fields_set:
@@ -163,43 +472,325 @@ class OPTIMADEResourceStrategy:
 
         LOGGER.debug("optimade_query after update: %r", optimade_query)
 
+        if self.resource_config.configuration.tune_query:
+            optimade_query = self._tune_query(
+                access_url, optimade_endpoint, optimade_query
+            )
+            LOGGER.debug("optimade_query after tuning: %r", optimade_query)
+
+        if optimade_query.response_format in JSONLINES_RESPONSE_FORMATS:
+            # JSON Lines responses are streamed, one entry per line, except for DLite,
+            # which parses the whole (buffered) response
+            if not use_dlite(
+                self.resource_config.accessService,
+                self.resource_config.configuration.use_dlite,
+            ):
+                self.resource_config.configuration.stream_entries = True
+        elif (
+            optimade_query.response_format and optimade_query.response_format != "json"
+        ):
+            error_message = (
+                "Can only handle JSON and JSON Lines responses for now. Requested "
+                f"response format: {optimade_query.response_format!r}"
+            )
+            raise NotImplementedError(error_message)
+
+        stream_entries = self.resource_config.configuration.stream_entries
+        if stream_entries and (
+            optimade_endpoint not in _ENTRY_MODELS
+            or use_dlite(
+                self.resource_config.accessService,
+                self.resource_config.configuration.use_dlite,
+            )
+        ):
+            error_message = (
+                "Streaming (`stream_entries` or a JSON Lines `response_format`) is "
+                "only supported for the OPTIMADE endpoints "
+                f"{', '.join(map(repr, _ENTRY_MODELS))} without DLite."
+            )
+            raise ConfigurationError(error_message)
+
+        entry_cache = self.resource_config.configuration.entry_cache
+        if entry_cache:
+            if (
+                optimade_endpoint not in _ENTRY_MODELS
+                or stream_entries
+                or optimade_query.response_fields
+                or use_dlite(
+                    self.resource_config.accessService,
+                    self.resource_config.configuration.use_dlite,
+                )
+            ):
+                error_message = (
+                    "The entry cache (`entry_cache`) is only supported for the "
+                    f"OPTIMADE endpoints {', '.join(map(repr, _ENTRY_MODELS))} "
+                    "without `response_fields`, streaming or DLite."
+                )
+                raise ConfigurationError(error_message)
+
+            # Only request the entry ids, the entries are filled in from the cache
+            optimade_query = optimade_query.model_copy(
+                update={"response_fields": INDEX_RESPONSE_FIELDS}
+            )
+
         optimade_url = OPTIMADEUrl(
-            f"{self.resource_config.accessUrl.base_url}"
-            f"/{self.resource_config.accessUrl.version or 'v1'}"
+            f"{access_url.base_url}"
+            f"/{access_url.version or 'v1'}"
             f"/{optimade_endpoint}?{optimade_query.generate_query_string()}"
         )
         LOGGER.debug("OPTIMADE URL to be requested: %s", optimade_url)
 
-        # Set cache access key to the full OPTIMADE URL.
-        self.resource_config.configuration.datacache_config.accessKey = optimade_url
+        # Set cache access key to the canonical full OPTIMADE URL.
+        self.resource_config.configuration.datacache_config.accessKey = canonical_url(
+            optimade_url
+        )
 
-        # Perform query
-        response = requests.get(
-            optimade_url,
-            allow_redirects=True,
-            timeout=(3, 27),  # timeout in seconds (connect, read)
+        paginate = self.resource_config.configuration.paginate
+        max_pages = self.resource_config.configuration.max_pages if paginate else 1
+        max_entries = self.resource_config.configuration.max_entries
+        max_concurrent_requests = (
+            self.resource_config.configuration.max_concurrent_requests
         )
 
-        if optimade_query.response_format and optimade_query.response_format != "json":
-            error_message = (
-                "Can only handle JSON responses for now. Requested response format: "
-                f"{optimade_query.response_format!r}"
+        result = OPTIMADEResourceResult()
+        optimade_resources: list[dict[str, Any] | LazyResource] = []
+        visited_urls: list[str] = []
+        prefetched_urls: list[str] | None = None
+        page_responses: dict[str, dict[str, Any]] = {}
+        page_url: OPTIMADEUrl | None = optimade_url
+
+        while page_url is not None:
+            visited_urls.append(str(page_url))
+
+            if str(page_url) not in page_responses:
+                responses = yield [str(page_url)]
+                _add_transfer_sizes(result, responses)
+                page_responses.update(responses)
+            response = page_responses.pop(str(page_url))
+
+            optimade_response = (
+                self._parse_streamed_page(page_url, optimade_endpoint, response)
+                if stream_entries
+                else self._parse_page(page_url, optimade_query, response)
             )
-            raise NotImplementedError(error_message)
 
-        cache = DataCache(config=self.resource_config.configuration.datacache_config)
-        cache.add(
-            {
-                "status_code": response.status_code,
-                "ok": response.ok,
-                "json": response.json(),
-            }
-        )
+            if len(visited_urls) > 1 and isinstance(optimade_response, ErrorResponse):
+                LOGGER.error(
+                    "Got an error response for page %d (%s):\n%r",
+                    len(visited_urls),
+                    page_url,
+                    optimade_response.errors,
+                )
+                error_message = (
+                    f"Could not retrieve page {len(visited_urls)} of the OPTIMADE "
+                    f"query from {page_url}."
+                )
+                raise OPTIMADEResponseError(error_message)
+
+            if entry_cache and not isinstance(optimade_response, ErrorResponse):
+                page_resources = yield from self._cached_entries(
+                    optimade_response, page_url, optimade_endpoint, result
+                )
+                entry_adapter = _ENTRY_MODELS[optimade_endpoint][1]
+                result.optimade_resource_model = (
+                    f"{entry_adapter.__module__}:{entry_adapter.__name__}"
+                )
+            else:
+                page_resources, result.optimade_resource_model = (
+                    self._parse_streamed_resources(
+                        optimade_response, page_url, optimade_endpoint, response
+                    )
+                    if stream_entries
+                    else self._parse_resources(optimade_response, page_url)
+                )
+            optimade_resources.extend(page_resources)
+
+            if prefetched_urls is None:
+                next_url = _next_page_url(optimade_response)
+            else:
+                next_url = prefetched_urls.pop(0) if prefetched_urls else None
+
+            if next_url is None:
+                break
+
+            if not paginate:
+                LOGGER.info(
+                    "More OPTIMADE entries are available from %s, set `paginate` to "
+                    "retrieve them.",
+                    next_url,
+                )
+                break
+
+            if max_pages is not None and len(visited_urls) >= max_pages:
+                LOGGER.debug("Reached max_pages=%d, stopping pagination.", max_pages)
+                break
+
+            if max_entries is not None and len(optimade_resources) >= max_entries:
+                LOGGER.debug(
+                    "Reached max_entries=%d, stopping pagination.", max_entries
+                )
+                break
+
+            if next_url in visited_urls:
+                LOGGER.warning(
+                    "The next page URL %s has already been retrieved, stopping "
+                    "pagination.",
+                    next_url,
+                )
+                break
+
+            if len(visited_urls) == 1 and max_concurrent_requests > 1:
+                # All remaining pages are known in advance for offset-based
+                # pagination, so they can be requested concurrently up front.
+                data_returned = getattr(
+                    getattr(optimade_response, "meta", None), "data_returned", None
+                )
+                page_limit = _effective_page_limit(
+                    next_url, optimade_query.page_offset or 0
+                )
+                page_urls = _offset_page_urls(
+                    next_url, page_limit=page_limit, data_returned=data_returned
+                )
+                if page_urls and max_entries is not None:
+                    page_urls = page_urls[
+                        : math.ceil(
+                            (max_entries - len(optimade_resources)) / page_limit
+                        )
+                    ]
+                if max_pages is not None:
+                    page_urls = page_urls[: max_pages - len(visited_urls)]
+
+                if page_urls:
+                    LOGGER.debug("Prefetching %d OPTIMADE pages.", len(page_urls))
+                    responses = yield page_urls
+                    _add_transfer_sizes(result, responses)
+                    page_responses.update(responses)
+                    next_url = page_urls[0]
+                    prefetched_urls = page_urls[1:]
+
+            page_url = OPTIMADEUrl(next_url)
+
+        if paginate and max_entries is not None:
+            optimade_resources = optimade_resources[:max_entries]
+
+        result.optimade_resources = optimade_resources
+
+        if (
+            self.resource_config.configuration.optimade_config
+            and self.resource_config.configuration.optimade_config.query_parameters
+        ):
+            result = result.model_copy(
+                update={
+                    "optimade_config": self.resource_config.configuration.optimade_config.model_copy(
+                        update={
+                            "query_parameters": self.resource_config.configuration.optimade_config.query_parameters.model_dump(
+                                exclude_defaults=True,
+                                exclude_unset=True,
+                            )
+                        }
+                    )
+                }
+            )
+
+        return result
+
+    def _tune_query(
+        self,
+        access_url: OPTIMADEUrl,
+        optimade_endpoint: str,
+        optimade_query: OPTIMADEQueryParameters,
+    ) -> OPTIMADEQueryParameters:
+        """Tune the OPTIMADE query to the capabilities of the provider.
+
+        The capabilities are looked up (and discovered if needed) with
+        [`get_capabilities()`][oteapi_optimade.discovery.get_capabilities].
+        See the `tune_query` configuration option for the changes made to the query.
+
+        Parameters:
+            access_url: The OPTIMADE URL of the query.
+            optimade_endpoint: The OPTIMADE entry endpoint of the query.
+            optimade_query: The OPTIMADE query parameters.
+
+        Returns:
+            The tuned OPTIMADE query parameters.
+
+        """
+        configuration = self.resource_config.configuration
+        capabilities = get_capabilities(access_url.base_url, configuration)
+        if capabilities is None:
+            LOGGER.debug(
+                "The capabilities of %s are unknown, not tuning the query.",
+                access_url.base_url,
+            )
+            return optimade_query
+
+        query_fields = optimade_query.model_dump(exclude_unset=True)
+
+        if (
+            configuration.paginate
+            and capabilities.max_page_limit
+            and "page_limit" not in optimade_query.model_fields_set
+        ):
+            query_fields["page_limit"] = (
+                min(capabilities.max_page_limit, configuration.max_entries)
+                if configuration.max_entries is not None
+                else capabilities.max_page_limit
+            )
+
+        supported_properties = capabilities.properties.get(optimade_endpoint)
+        if optimade_query.response_fields and supported_properties:
+            requested_fields = [
+                field.strip()
+                for field in optimade_query.response_fields.split(",")
+                if field.strip()
+            ]
+            response_fields = [
+                field for field in requested_fields if field in supported_properties
+            ]
+            if len(response_fields) < len(requested_fields):
+                LOGGER.info(
+                    "Removing response_fields not supported by %s: %s",
+                    access_url.base_url,
+                    ", ".join(sorted(set(requested_fields) - set(response_fields))),
+                )
+                query_fields["response_fields"] = ",".join(response_fields or ["id"])
+
+        return OPTIMADEQueryParameters(**query_fields)
+
+    def _parse_page(
+        self,
+        optimade_url: OPTIMADEUrl,
+        optimade_query: OPTIMADEQueryParameters,
+        response: dict[str, Any] | None = None,
+    ) -> OPTIMADEResponse:
+        """Parse a single cached OPTIMADE response with the parse strategy.
+
+        If the OPTIMADE parse strategy runs in-process, the validated response model
+        is received directly from it (see
+        [`OPTIMADEParseStrategy.parse_response()`][oteapi_optimade.strategies.parse.OPTIMADEParseStrategy.parse_response]),
+        and it is handed `response` instead of retrieving the response itself.
+        Otherwise, e.g., for the DLite parse strategy, the response model is validated
+        from the serialized parse result.
+        Error responses are always parsed in-process, as they are not adapted by the
+        DLite parse strategy, and may not be in the data cache (see
+        `cache_transient_errors`).
+
+        Parameters:
+            optimade_url: The complete OPTIMADE URL of the response.
+            optimade_query: The OPTIMADE query parameters used for the query.
+            response: The response, as requested (see
+                [`fetch_response()`][oteapi_optimade.http_client.fetch_response]).
+
+        Returns:
+            The OPTIMADE response as an OPTIMADE Python tools (OPT) pydantic model.
+
+        """
+        datacache_config = self._page_datacache_config(optimade_url)
 
         parse_with_dlite = use_dlite(
             self.resource_config.accessService,
             self.resource_config.configuration.use_dlite,
-        )
+        ) and (response is None or response.get("ok", True))
 
         parse_parserType = "parser/OPTIMADE"
         parse_mediaType = (
@@ -216,9 +807,13 @@ class OPTIMADEResourceStrategy:
             "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
             "parserType": parse_parserType,
             "configuration": {
-                "datacache_config": self.resource_config.configuration.datacache_config.model_copy(),
+                "datacache_config": datacache_config,
                 "downloadUrl": str(optimade_url),
+                "json_backend": self.resource_config.configuration.json_backend,
                 "mediaType": parse_mediaType,
+                **self.resource_config.configuration.model_dump(
+                    include=PARSE_CONFIG_FIELDS
+                ),
                 "optimade_config": self.resource_config.configuration.model_dump(
                     exclude={"optimade_config", "downloadUrl", "mediaType"},
                     exclude_unset=True,
@@ -229,10 +824,18 @@ class OPTIMADEResourceStrategy:
 
         LOGGER.debug("parse_config: %r", parse_config)
 
-        parse_config["configuration"].update(
-            create_strategy("parse", parse_config).initialize()
-        )
-        parse_result = create_strategy("parse", parse_config).get()
+        # Updating the same DLite collection must not happen concurrently, e.g., in
+        # federated queries.
+        with _DLITE_LOCK if parse_with_dlite else nullcontext():
+            parse_config["configuration"].update(
+                create_strategy("parse", parse_config).initialize()
+            )
+            parse_strategy = create_strategy("parse", parse_config)
+            if isinstance(parse_strategy, OPTIMADEParseStrategy):
+                # In-process: Use the validated response model directly, instead of
+                # validating its serialized form again.
+                return parse_strategy.parse_response(response)
+            parse_result = parse_strategy.get()
 
         if not all(
             _ in parse_result for _ in ("optimade_response", "optimade_response_model")
@@ -263,7 +866,7 @@ class OPTIMADEResourceStrategy:
                 importlib.import_module(optimade_response_model_module),
                 optimade_response_model_name,
             )
-            optimade_response = optimade_response_model(**optimade_response_dict)
+            return optimade_response_model(**optimade_response_dict)
         except (ImportError, AttributeError) as exc:
             base_error_message = "Could not import the response model."
             LOGGER.error(
@@ -291,49 +894,377 @@ class OPTIMADEResourceStrategy:
             )
             raise OPTIMADEParseError(base_error_message) from exc
 
-        result = OPTIMADEResourceResult()
+    def _cached_entries(
+        self,
+        optimade_response: OPTIMADEResponse,
+        optimade_url: OPTIMADEUrl,
+        optimade_endpoint: str,
+        result: OPTIMADEResourceResult,
+    ) -> Generator[
+        list[str], dict[str, dict[str, Any]], list[dict[str, Any] | LazyResource]
+    ]:
+        """Assemble the OPTIMADE resources of a page of entry ids (see `entry_cache`).
+
+        Entries not in the data cache are requested in batched `id` queries, by
+        yielding their OPTIMADE URLs as in `_query_pages()`, and are then stored in
+        the data cache.
+
+        Parameters:
+            optimade_response: The OPTIMADE response with only the `id` and
+                `last_modified` of the entries.
+            optimade_url: The OPTIMADE URL the response was retrieved from.
+            optimade_endpoint: The OPTIMADE entry endpoint of the query.
+            result: The result of the OPTIMADE query, to which the transfer sizes of
+                the batched `id` queries are added.
+
+        Returns:
+            The OPTIMADE resources of the page, in the order of the response.
+
+        """
+        configuration = self.resource_config.configuration
+        base_url = optimade_url.base_url
+
+        page_keys: list[tuple[str, str | None]] = []
+        for entry in getattr(optimade_response, "data", None) or []:
+            if isinstance(entry, dict):
+                entry_id = entry["id"]
+                last_modified = (entry.get("attributes") or {}).get("last_modified")
+            else:
+                entry_id = entry.id
+                last_modified = getattr(entry.attributes, "last_modified", None)
+            page_keys.append(
+                (
+                    entry_id,
+                    entry_key(base_url, optimade_endpoint, entry_id, last_modified),
+                )
+            )
+
+        cached_entries = get_cached_entries(
+            [key for _, key in page_keys if key is not None], configuration
+        )
+        missing_ids = list(
+            dict.fromkeys(
+                entry_id for entry_id, key in page_keys if key not in cached_entries
+            )
+        )
+        LOGGER.debug(
+            "Using %d cached entries, requesting %d entries for %s",
+            len(page_keys) - len(missing_ids),
+            len(missing_ids),
+            optimade_url,
+        )
+
+        fetched_entries: dict[str, dict[str, Any]] = {}
+        batch_urls = [
+            OPTIMADEUrl(
+                f"{base_url}/{optimade_url.version or 'v1'}/{optimade_endpoint}?"
+                + OPTIMADEQueryParameters(
+                    filter=batch_filter, page_limit=batch_size
+                ).generate_query_string()
+            )
+            for batch_filter, batch_size in batch_id_filters(missing_ids)
+        ]
+        visited_urls: set[str] = set()
+        while batch_urls:
+            visited_urls.update(str(batch_url) for batch_url in batch_urls)
+            responses = yield [str(batch_url) for batch_url in batch_urls]
+            _add_transfer_sizes(result, responses)
+
+            next_urls = []
+            for batch_url in batch_urls:
+                batch_response = self._parse_page(
+                    batch_url, OPTIMADEQueryParameters(), responses[str(batch_url)]
+                )
+                if isinstance(batch_response, ErrorResponse):
+                    LOGGER.error(
+                        "Got an error response for the entries requested with %s:\n%r",
+                        batch_url,
+                        batch_response.errors,
+                    )
+                    error_message = (
+                        f"Could not retrieve the entries of {optimade_url} from "
+                        f"{batch_url}."
+                    )
+                    raise OPTIMADEResponseError(error_message)
+
+                batch_resources, _ = self._parse_resources(batch_response, batch_url)
+                # The entries are stored in the data cache as dictionaries
+                fetched_entries.update(
+                    (resource["id"], dict(resource)) for resource in batch_resources
+                )
+
+                # The provider may use a smaller page size than requested
+                next_url = _next_page_url(batch_response)
+                if next_url and next_url not in visited_urls:
+                    next_urls.append(OPTIMADEUrl(next_url))
+            batch_urls = next_urls
+
+        new_entries = {}
+        for resource in fetched_entries.values():
+            key = entry_key(
+                base_url,
+                optimade_endpoint,
+                resource["id"],
+                (resource.get("attributes") or {}).get("last_modified"),
+            )
+            if key is not None:
+                new_entries[key] = resource
+        store_entries(new_entries, configuration)
+
+        page_resources: list[dict[str, Any] | LazyResource] = []
+        for entry_id, key in page_keys:
+            resource = (
+                cached_entries[key]
+                if key in cached_entries
+                else fetched_entries.get(entry_id)
+            )
+            if resource is None:
+                LOGGER.warning(
+                    "Could not retrieve the entry %r of %s, leaving it out.",
+                    entry_id,
+                    optimade_url,
+                )
+                continue
+            page_resources.append(resource)
+        return page_resources
+
+    def _streamed_page(
+        self, optimade_url: OPTIMADEUrl, response: dict[str, Any] | None = None
+    ) -> tuple[DataCache, dict[str, Any]]:
+        """Return the data cache and the streamed OPTIMADE response.
+
+        If `response` is not given, the cached response is used, and it is requested
+        if it is not in the data cache, e.g., because a transient error response is
+        not stored (see `cache_transient_errors`).
+        """
+        datacache_config = self._page_datacache_config(optimade_url)
+        if response is None:
+            response = get_cached_response(
+                stream_key(str(optimade_url)), datacache_config
+            )
+        if response is None:
+            response = fetch_streamed_response(
+                optimade_url, self.resource_config.configuration, datacache_config
+            )
+        return DataCache(datacache_config), response
+
+    def _parse_streamed_page(
+        self,
+        optimade_url: OPTIMADEUrl,
+        optimade_endpoint: str,
+        response: dict[str, Any] | None = None,
+    ) -> OPTIMADEResponse:
+        """Parse a cached streamed OPTIMADE response without its `data` entries.
+
+        The entries are parsed separately, one at a time, with
+        `_parse_streamed_resources()`.
+
+        Parameters:
+            optimade_url: The complete OPTIMADE URL of the response.
+            optimade_endpoint: The OPTIMADE entry endpoint of the query.
+            response: The streamed response, as requested (see
+                [`fetch_streamed_response()`][oteapi_optimade.http_client.fetch_streamed_response]).
+
+        Returns:
+            The OPTIMADE response as an OPTIMADE Python tools (OPT) pydantic model,
+            with an empty `data` list.
+
+        """
+        _, response = self._streamed_page(optimade_url, response)
+        envelope = response.get("json", {})
+
+        try:
+            if not response.get("ok", True) or "errors" in envelope:
+                return ErrorResponse(**envelope)
+
+            response_model = _ENTRY_MODELS[optimade_endpoint][0]
+            return response_model(**{**envelope, "data": []})
+        except ValidationError as exc:
+            error_message = "Could not validate the streamed response."
+            LOGGER.error("%s\nValidationError: %s", error_message, exc)
+            raise OPTIMADEParseError(error_message) from exc
+
+    def _parse_streamed_resources(
+        self,
+        optimade_response: OPTIMADEResponse,
+        optimade_url: OPTIMADEUrl,
+        optimade_endpoint: str,
+        response: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any] | LazyResource], str]:
+        """Retrieve the OPTIMADE resources from a cached streamed OPTIMADE response.
+
+        The `data` entries are read from the data cache, validated and adapted one
+        at a time.
+
+        Parameters:
+            optimade_response: The OPTIMADE response without its `data` entries (see
+                `_parse_streamed_page()`).
+            optimade_url: The OPTIMADE URL the response was retrieved from.
+            optimade_endpoint: The OPTIMADE entry endpoint of the query.
+            response: The streamed response, as requested.
+
+        Returns:
+            The OPTIMADE resources as a list of dictionaries and the importable path
+            to the resource model (see `_parse_resources()`).
+
+        """
+        if isinstance(optimade_response, ErrorResponse):
+            return self._parse_resources(optimade_response, optimade_url)
+
+        cache, response = self._streamed_page(optimade_url, response)
+        key = stream_key(str(optimade_url))
+        entry_adapter = _ENTRY_MODELS[optimade_endpoint][1]
+
+        optimade_resources: list[dict[str, Any] | LazyResource] = []
+        for index in range(response.get("entries", 0)):
+            try:
+                optimade_resources.append(
+                    entry_adapter(cache.get(stream_entry_key(key, index))).as_dict
+                )
+            except ValidationError as exc:
+                error_message = (
+                    f"Could not validate entry {index} of the streamed response from "
+                    f"{optimade_url}."
+                )
+                LOGGER.error("%s\nValidationError: %s", error_message, exc)
+                raise OPTIMADEParseError(error_message) from exc
+
+        return (
+            optimade_resources,
+            f"{entry_adapter.__module__}:{entry_adapter.__name__}",
+        )
+
+    def _page_datacache_config(
+        self, optimade_url: OPTIMADEUrl | str
+    ) -> DataCacheConfig:
+        """Return the data cache configuration for a single OPTIMADE response."""
+        return self.resource_config.configuration.datacache_config.model_copy(
+            update={"accessKey": canonical_url(str(optimade_url))}
+        )
+
+    def _fetch_page(self, optimade_url: OPTIMADEUrl | str) -> dict[str, Any]:
+        """Request a single OPTIMADE response and store it in the data cache.
+
+        The request is skipped if a non-expired response is already cached under
+        `optimade_url` (see `force_refresh`).
+
+        Parameters:
+            optimade_url: The complete OPTIMADE URL to request.
+
+        Returns:
+            The response (see
+            [`fetch_response()`][oteapi_optimade.http_client.fetch_response]).
+
+        """
+        fetch = (
+            fetch_streamed_response
+            if self.resource_config.configuration.stream_entries
+            else fetch_response
+        )
+        return fetch(
+            optimade_url,
+            self.resource_config.configuration,
+            self._page_datacache_config(optimade_url),
+        )
+
+    def _fetch_pages(self, page_urls: list[str]) -> dict[str, dict[str, Any]]:
+        """Request OPTIMADE pages and store them in the data cache.
+
+        Several pages are requested concurrently, with at most
+        `max_concurrent_requests` requests sent to the OPTIMADE provider at a time.
+
+        Parameters:
+            page_urls: The complete OPTIMADE URLs to request.
+
+        Returns:
+            The responses per OPTIMADE URL (see
+            [`fetch_response()`][oteapi_optimade.http_client.fetch_response]).
+
+        """
+        if len(page_urls) == 1:
+            return {page_urls[0]: self._fetch_page(page_urls[0])}
+
+        with ThreadPoolExecutor(
+            max_workers=min(
+                self.resource_config.configuration.max_concurrent_requests,
+                len(page_urls),
+            ),
+            thread_name_prefix="oteapi-optimade",
+        ) as executor:
+            # Consume the results to raise any exceptions from the requests
+            return dict(
+                zip(
+                    page_urls,
+                    executor.map(self._fetch_page, page_urls),
+                    strict=True,
+                )
+            )
+
+    async def _afetch_pages(self, page_urls: list[str]) -> dict[str, dict[str, Any]]:
+        """Asynchronous equivalent of `_fetch_pages()`."""
+        semaphore = asyncio.Semaphore(
+            self.resource_config.configuration.max_concurrent_requests
+        )
+        afetch = (
+            afetch_streamed_response
+            if self.resource_config.configuration.stream_entries
+            else afetch_response
+        )
 
+        async def _afetch_page(optimade_url: str) -> dict[str, Any]:
+            async with semaphore:
+                return await afetch(
+                    optimade_url,
+                    self.resource_config.configuration,
+                    self._page_datacache_config(optimade_url),
+                )
+
+        return dict(
+            zip(
+                page_urls,
+                await asyncio.gather(
+                    *(_afetch_page(page_url) for page_url in page_urls)
+                ),
+                strict=True,
+            )
+        )
+
+    @staticmethod
+    def _parse_resources(
+        optimade_response: OPTIMADEResponse, optimade_url: OPTIMADEUrl
+    ) -> tuple[list[dict[str, Any] | LazyResource], str]:
+        """Retrieve the OPTIMADE resources from an OPTIMADE response.
+
+        Parameters:
+            optimade_response: The OPTIMADE response as an OPTIMADE Python tools (OPT)
+                pydantic model.
+            optimade_url: The OPTIMADE URL the response was retrieved from.
+
+        Returns:
+            The OPTIMADE resources as a list of dictionaries and the importable path
+            to the resource model (see
+            `OPTIMADEResourceResult.optimade_resource_model`).
+
+        """
         if isinstance(optimade_response, ErrorResponse):
             optimade_resources = optimade_response.errors
-            result.optimade_resource_model = f"{OptimadeError.__module__}:OptimadeError"
+            optimade_resource_model = f"{OptimadeError.__module__}:OptimadeError"
         elif isinstance(optimade_response, ReferenceResponseMany):
             optimade_resources = [
-                (
-                    Reference(entry).as_dict
-                    if isinstance(entry, dict)
-                    else Reference(entry.model_dump()).as_dict
-                )
-                for entry in optimade_response.data
+                _entry_as_dict(Reference, entry) for entry in optimade_response.data
             ]
-            result.optimade_resource_model = f"{Reference.__module__}:Reference"
+            optimade_resource_model = f"{Reference.__module__}:Reference"
         elif isinstance(optimade_response, ReferenceResponseOne):
-            optimade_resources = [
-                (
-                    Reference(optimade_response.data).as_dict
-                    if isinstance(optimade_response.data, dict)
-                    else Reference(optimade_response.data.model_dump()).as_dict
-                )
-            ]
-            result.optimade_resource_model = f"{Reference.__module__}:Reference"
+            optimade_resources = [_entry_as_dict(Reference, optimade_response.data)]
+            optimade_resource_model = f"{Reference.__module__}:Reference"
         elif isinstance(optimade_response, StructureResponseMany):
             optimade_resources = [
-                (
-                    Structure(entry).as_dict
-                    if isinstance(entry, dict)
-                    else Structure(entry.model_dump()).as_dict
-                )
-                for entry in optimade_response.data
+                _entry_as_dict(Structure, entry) for entry in optimade_response.data
             ]
-            result.optimade_resource_model = f"{Structure.__module__}:Structure"
+            optimade_resource_model = f"{Structure.__module__}:Structure"
         elif isinstance(optimade_response, StructureResponseOne):
-            optimade_resources = [
-                (
-                    Structure(optimade_response.data).as_dict
-                    if isinstance(optimade_response.data, dict)
-                    else Structure(optimade_response.data.model_dump()).as_dict
-                )
-            ]
-            result.optimade_resource_model = f"{Structure.__module__}:Structure"
+            optimade_resources = [_entry_as_dict(Structure, optimade_response.data)]
+            optimade_resource_model = f"{Structure.__module__}:Structure"
         else:
             LOGGER.error(
                 "Could not parse response as errors, references or structures. "
@@ -348,26 +1279,165 @@ class OPTIMADEResourceStrategy:
             )
             raise OPTIMADEParseError(error_message)
 
-        result.optimade_resources = [
-            resource if isinstance(resource, dict) else resource.model_dump()
+        return [
+            (
+                resource
+                if isinstance(resource, (dict, LazyResource))
+                else resource.model_dump()
+            )
             for resource in optimade_resources
-        ]
+        ], optimade_resource_model
 
-        if (
-            self.resource_config.configuration.optimade_config
-            and self.resource_config.configuration.optimade_config.query_parameters
-        ):
-            result = result.model_copy(
-                update={
-                    "optimade_config": self.resource_config.configuration.optimade_config.model_copy(
-                        update={
-                            "query_parameters": self.resource_config.configuration.optimade_config.query_parameters.model_dump(
-                                exclude_defaults=True,
-                                exclude_unset=True,
-                            )
-                        }
-                    )
-                }
-            )
 
-        return result
+def _next_step(
+    query_pages: Generator[
+        list[str], dict[str, dict[str, Any]], OPTIMADEResourceResult
+    ],
+    responses: dict[str, dict[str, Any]] | None = None,
+) -> list[str] | OPTIMADEResourceResult:
+    """Resume `OPTIMADEResourceStrategy._query_pages()`.
+
+    Parameters:
+        query_pages: The generator to resume.
+        responses: The responses per OPTIMADE URL for the previously yielded
+            OPTIMADE URLs. Not given when starting the generator.
+
+    Returns:
+        Either the next list of OPTIMADE URLs to request, or the final result.
+
+    """
+    try:
+        if responses is None:
+            return next(query_pages)
+        return query_pages.send(responses)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _add_transfer_sizes(
+    result: OPTIMADEResourceResult, responses: dict[str, dict[str, Any]]
+) -> None:
+    """Add the number of bytes transferred and decoded for responses to `result`."""
+    for response in responses.values():
+        result.optimade_bytes_transferred += response.get("bytes_transferred", 0)
+        result.optimade_bytes_decoded += response.get("bytes_decoded", 0)
+
+
+def _effective_page_limit(next_url: str, page_offset: int) -> int:
+    """Return the number of entries per page the OPTIMADE provider paginates with.
+
+    The provider may cap the requested `page_limit`, and entries of a page may be
+    left out, so the size of the current page cannot be relied upon.
+
+    Parameters:
+        next_url: The `links.next` URL of the current page.
+        page_offset: The `page_offset` of the current page.
+
+    Returns:
+        The `page_limit` of `next_url`, or else the step between the `page_offset` of
+        `next_url` and `page_offset`. `0` if neither is available.
+
+    """
+    query = dict(parse_qsl(urlsplit(next_url).query, keep_blank_values=True))
+
+    try:
+        page_limit = int(query["page_limit"])
+    except (KeyError, ValueError):
+        try:
+            page_limit = int(query["page_offset"]) - page_offset
+        except (KeyError, ValueError):
+            return 0
+
+    return max(page_limit, 0)
+
+
+def _offset_page_urls(
+    next_url: str, page_limit: int, data_returned: int | None
+) -> list[str]:
+    """Generate the URLs of all remaining pages for offset-based pagination.
+
+    Parameters:
+        next_url: The `links.next` URL of the current page.
+        page_limit: The number of entries per page.
+        data_returned: The total number of entries matching the query (from
+            `meta.data_returned`).
+
+    Returns:
+        The URLs of the remaining pages in page order, starting with `next_url`.
+        If `next_url` is not offset-based or the number of entries is unknown, an
+        empty list is returned.
+
+    """
+    split_url = urlsplit(next_url)
+    query_pairs = parse_qsl(split_url.query, keep_blank_values=True)
+    page_offsets = [value for field, value in query_pairs if field == "page_offset"]
+
+    if not data_returned or page_limit < 1 or not page_offsets:
+        return []
+
+    try:
+        page_offset = int(page_offsets[-1])
+    except ValueError:
+        return []
+
+    page_urls = [next_url]
+    for offset in range(page_offset + page_limit, data_returned, page_limit):
+        query = urlencode(
+            [
+                (field, str(offset) if field == "page_offset" else value)
+                for field, value in query_pairs
+            ],
+            quote_via=quote,
+        )
+        page_urls.append(urlunsplit(split_url._replace(query=query)))
+
+    return page_urls if page_offset < data_returned else []
+
+
+def _entry_as_dict(
+    adapter: type[EntryAdapter], entry: Any
+) -> dict[str, Any] | LazyResource:
+    """Convert an OPTIMADE entry to a dictionary using an OPT entry adapter.
+
+    An entry already validated as the entry resource model of the adapter is dumped
+    directly, instead of being validated again by the adapter.
+    A lazily validated entry (see `lazy_validation`) is kept as a mapping, which
+    validates and dumps the entry only when it is read.
+
+    Parameters:
+        adapter: The OPT entry adapter, e.g., `Structure`.
+        entry: The OPTIMADE entry as a dictionary or an OPT pydantic model.
+
+    Returns:
+        The OPTIMADE entry as a dictionary, as given by the `as_dict` adapter
+        conversion.
+
+    """
+    if isinstance(entry, LazyEntry) and entry.resource_model is adapter.ENTRY_RESOURCE:
+        return LazyResource(entry)
+    if isinstance(entry, LazyEntry):
+        entry = entry.resource
+    if isinstance(entry, adapter.ENTRY_RESOURCE):
+        return entry.model_dump()
+    return adapter(entry if isinstance(entry, dict) else entry.model_dump()).as_dict
+
+
+def _next_page_url(optimade_response: OPTIMADEResponse) -> str | None:
+    """Return the `links.next` URL of an OPTIMADE response, if any.
+
+    The `next` link may be given either as a plain URL or as a link object with an
+    `href`, as per the OPTIMADE specification. Since it is opaque, this covers
+    cursor-, offset- and number-based pagination alike.
+    """
+    links = getattr(optimade_response, "links", None)
+    next_link = getattr(links, "next", None) if links is not None else None
+
+    if next_link is None:
+        return None
+
+    if isinstance(next_link, dict):
+        next_link = next_link.get("href")
+    else:
+        next_link = getattr(next_link, "href", next_link)
+
+    return str(next_link) if next_link else None
@@ -0,0 +1,269 @@
+"""Streaming decoding of OPTIMADE JSON responses.
+
+The `data` entries of an OPTIMADE response are decoded one at a time as the
+response body is read, instead of building the whole response in memory first.
+
+Decoding JSON responses requires [`ijson`](https://github.com/ICRAR/ijson), which can
+be installed with the `streaming` extra, i.e., `pip install oteapi-optimade[streaming]`.
+JSON Lines responses (see `JSONLINES_RESPONSE_FORMATS`) are decoded line by line with
+the configured JSON backend (see [`json_codec`][oteapi_optimade.json_codec]).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from oteapi_optimade import json_codec
+from oteapi_optimade.exceptions import MissingDependency, OPTIMADEParseError
+
+try:
+    import ijson
+except ImportError:
+    IJSON_AVAILABLE = False
+else:
+    IJSON_AVAILABLE = True
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from typing import Any, Protocol
+
+    from oteapi_optimade.json_codec import JSONBackend
+
+    class SupportsRead(Protocol):
+        """A file-like object returning bytes."""
+
+        def read(self, size: int = -1, /) -> bytes: ...
+
+    class SupportsAsyncRead(Protocol):
+        """An asynchronous file-like object returning bytes."""
+
+        async def read(self, size: int = -1, /) -> bytes: ...
+
+
+JSONLINES_RESPONSE_FORMATS = ("jsonlines", "jsonl")
+"""OPTIMADE `response_format` values for line-delimited JSON (JSON Lines) responses."""
+
+JSONLINES_HEADER_KEY = "x-optimade"
+"""Key of the JSON Lines objects holding the response metadata, e.g., `meta`."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _ResponseDecoder:
+    """Build an OPTIMADE response from `ijson` parser events.
+
+    The `data` entries are passed to `on_entry` as soon as they are complete, and
+    are not kept.
+    The rest of the response is collected in `envelope`.
+    """
+
+    def __init__(self, on_entry: Callable[[Any], None]) -> None:
+        self.on_entry = on_entry
+        self.envelope: dict[str, Any] = {}
+        self._key: str | None = None
+        self._builder: ijson.ObjectBuilder | None = None
+        self._depth = 0
+
+    def event(self, prefix: str, event: str, value: Any) -> None:
+        """Handle a single parser event."""
+        if self._builder is None:
+            if prefix == "":
+                # Events of the top-level response object itself
+                if event == "map_key":
+                    self._key = value
+                return
+
+            if prefix == "data" and event in ("start_array", "end_array"):
+                # Each item of the data array is built separately
+                return
+
+            self._builder = ijson.ObjectBuilder()
+
+        self._builder.event(event, value)
+
+        if event in ("start_map", "start_array"):
+            self._depth += 1
+        elif event in ("end_map", "end_array"):
+            self._depth -= 1
+
+        if self._depth == 0:
+            value = self._builder.value
+            self._builder = None
+
+            if prefix == "data.item" or (self._key == "data" and value is not None):
+                self.on_entry(value)
+            elif self._key is not None:
+                self.envelope[self._key] = value
+
+
+def _check_ijson() -> None:
+    """Raise if `ijson` is not installed."""
+    if not IJSON_AVAILABLE:
+        error_message = (
+            "ijson is not found on the system. This is required to stream OPTIMADE "
+            "responses. Install it with `pip install oteapi-optimade[streaming]`."
+        )
+        raise MissingDependency(error_message)
+
+
+def decode_entries(stream: SupportsRead, on_entry: Callable[[Any], None]) -> dict:
+    """Decode an OPTIMADE JSON response, one `data` entry at a time.
+
+    Parameters:
+        stream: A file-like object to read the (decompressed) response body from.
+        on_entry: Called with each `data` entry as soon as it has been decoded.
+            If `data` is a single entry (an object), it is called once.
+
+    Returns:
+        The response without `data`, e.g., with `meta`, `links` and `errors`.
+
+    """
+    _check_ijson()
+
+    decoder = _ResponseDecoder(on_entry)
+    try:
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            decoder.event(prefix, event, value)
+    except ijson.JSONError as exc:
+        error_message = "Could not decode the streamed OPTIMADE response."
+        LOGGER.error("%s\nJSONError: %s", error_message, exc)
+        raise OPTIMADEParseError(error_message) from exc
+
+    return decoder.envelope
+
+
+async def adecode_entries(
+    stream: SupportsAsyncRead, on_entry: Callable[[Any], None]
+) -> dict:
+    """Asynchronous equivalent of
+    [`decode_entries()`][oteapi_optimade.streaming.decode_entries]."""
+    _check_ijson()
+
+    decoder = _ResponseDecoder(on_entry)
+    try:
+        async for prefix, event, value in ijson.parse_async(stream, use_float=True):
+            decoder.event(prefix, event, value)
+    except ijson.JSONError as exc:
+        error_message = "Could not decode the streamed OPTIMADE response."
+        LOGGER.error("%s\nJSONError: %s", error_message, exc)
+        raise OPTIMADEParseError(error_message) from exc
+
+    return decoder.envelope
+
+
+class _LinesDecoder:
+    """Decode a JSON Lines OPTIMADE response from chunks of its body.
+
+    Each line is an entry, which is passed to `on_entry`, except for the lines with
+    an `x-optimade` object, whose content (e.g., `meta`) is collected in `envelope`.
+    """
+
+    def __init__(self, on_entry: Callable[[Any], None], backend: JSONBackend) -> None:
+        self.on_entry = on_entry
+        self.envelope: dict[str, Any] = {}
+        self._codec = json_codec.get_codec(backend)
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._line_number = 0
+
+    def feed(self, chunk: bytes | bytearray) -> None:
+        """Decode the complete lines of the body read so far.
+
+        Only the newly read part of the buffer is searched for line breaks, so a
+        long line (e.g., a large structure) spread over many chunks is not scanned
+        again for every chunk.
+        """
+        self._buffer += chunk
+        start = 0
+        end = self._buffer.find(b"\n", self._scanned)
+        while end != -1:
+            self._line(bytes(self._buffer[start:end]))
+            start = end + 1
+            end = self._buffer.find(b"\n", start)
+        del self._buffer[:start]
+        self._scanned = len(self._buffer)
+
+    def close(self) -> dict[str, Any]:
+        """Decode the last line and return the envelope."""
+        self._line(bytes(self._buffer))
+        self._buffer.clear()
+        self._scanned = 0
+        return self.envelope
+
+    def _line(self, line: bytes) -> None:
+        """Decode a single line."""
+        self._line_number += 1
+        if not line.strip():
+            return
+
+        try:
+            value = self._codec.loads(line)
+        except ValueError as exc:
+            error_message = (
+                f"Could not decode line {self._line_number} of the streamed JSON "
+                "Lines OPTIMADE response."
+            )
+            LOGGER.error("%s\nJSONDecodeError: %s", error_message, exc)
+            raise OPTIMADEParseError(error_message) from exc
+
+        if isinstance(value, dict) and JSONLINES_HEADER_KEY in value:
+            self.envelope.update(value[JSONLINES_HEADER_KEY] or {})
+        else:
+            self.on_entry(value)
+
+
+def decode_jsonlines(
+    stream: SupportsRead,
+    on_entry: Callable[[Any], None],
+    backend: JSONBackend = "auto",
+) -> dict:
+    """Decode a JSON Lines OPTIMADE response, one entry (line) at a time.
+
+    The equivalent of [`decode_entries()`][oteapi_optimade.streaming.decode_entries]
+    for line-delimited JSON, which does not require `ijson`.
+
+    Parameters:
+        stream: A file-like object to read the (decompressed) response body from.
+        on_entry: Called with each entry as soon as it has been decoded.
+        backend: The JSON backend to decode each line with.
+
+    Returns:
+        The content of the `x-optimade` lines, e.g., `meta`.
+
+    """
+    decoder = _LinesDecoder(on_entry, backend)
+    for chunk in iter(stream.read, b""):
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+def loads_jsonlines(content: bytes | bytearray, backend: JSONBackend = "auto") -> dict:
+    """Decode a whole JSON Lines OPTIMADE response.
+
+    Parameters:
+        content: The (decompressed) response body.
+        backend: The JSON backend to decode each line with.
+
+    Returns:
+        The response as a JSON response, i.e., the content of the `x-optimade`
+        lines, e.g., `meta`, with the entries as `data`.
+
+    """
+    entries: list[Any] = []
+    decoder = _LinesDecoder(entries.append, backend)
+    decoder.feed(content)
+    return {**decoder.close(), "data": entries}
+
+
+async def adecode_jsonlines(
+    stream: SupportsAsyncRead,
+    on_entry: Callable[[Any], None],
+    backend: JSONBackend = "auto",
+) -> dict:
+    """Asynchronous equivalent of
+    [`decode_jsonlines()`][oteapi_optimade.streaming.decode_jsonlines]."""
+    decoder = _LinesDecoder(on_entry, backend)
+    while chunk := await stream.read():
+        decoder.feed(chunk)
+    return decoder.close()
@@ -0,0 +1,329 @@
+"""Warm the data cache with predeclared OPTIMADE queries.
+
+The OPTIMADE resource configurations listed in a JSON or YAML file are run with the
+[`OPTIMADEResourceStrategy`][oteapi_optimade.strategies.resource.OPTIMADEResourceStrategy],
+concurrently with bounded parallelism, to fill the data cache, e.g., after a deploy or
+after the data cache was cleared.
+A timing and size report is printed per query.
+
+The command is installed as `oteapi-optimade-warm-cache`:
+
+```shell
+oteapi-optimade-warm-cache queries.yml --max-workers 4
+```
+
+Each item of the file is an OPTIMADE resource configuration, in the same shape as
+accepted by
+[`OPTIMADEResourceConfig`][oteapi_optimade.models.strategies.resource.OPTIMADEResourceConfig],
+e.g.:
+
+```yaml
+- resourceType: optimade/structures
+  accessService: optimade
+  accessUrl: https://example.org/v1/structures?filter=elements HAS "Si"
+  configuration:
+    datacache_config:
+      cacheDir: /var/cache/oteapi-optimade
+```
+
+All pages of a query are retrieved (see `paginate`), unless `paginate` is set in the
+configuration, and within `max_pages`/`max_entries`.
+
+Reading YAML files requires [PyYAML](https://pyyaml.org), which can be installed with
+the `yaml` extra, i.e., `pip install oteapi-optimade[yaml]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from pydantic import ValidationError
+
+from oteapi_optimade import json_codec
+from oteapi_optimade.exceptions import ConfigurationError, MissingDependency
+from oteapi_optimade.models import OPTIMADEResourceConfig
+from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+try:
+    import yaml
+except ImportError:
+    YAML_AVAILABLE = False
+else:
+    YAML_AVAILABLE = True
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+DEFAULT_MAX_WORKERS = 4
+"""Default maximum number of OPTIMADE queries to run concurrently."""
+
+YAML_SUFFIXES = (".yaml", ".yml")
+"""File suffixes of YAML files. Other files are read as JSON."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WarmResult(NamedTuple):
+    """The outcome of warming the data cache with an OPTIMADE query."""
+
+    query: str
+    """A description of the OPTIMADE query, i.e., its `accessUrl`."""
+
+    seconds: float
+    """The number of seconds the OPTIMADE query took."""
+
+    entries: int
+    """The number of OPTIMADE resources retrieved."""
+
+    bytes_transferred: int
+    """The number of response body bytes downloaded, as transferred. Responses
+    already in the data cache are not counted."""
+
+    bytes_decoded: int
+    """The number of response body bytes downloaded, after decompression."""
+
+    error: str | None = None
+    """The error, if the OPTIMADE query failed."""
+
+
+def load_configs(path: str | Path) -> list[OPTIMADEResourceConfig]:
+    """Load a list of OPTIMADE resource configurations from a JSON or YAML file.
+
+    Parameters:
+        path: The path to the file. Files with a suffix in `YAML_SUFFIXES` are read
+            as YAML, otherwise as JSON.
+
+    Returns:
+        The validated OPTIMADE resource configurations.
+
+    """
+    path = Path(path)
+    content = path.read_text(encoding="utf8")
+
+    if path.suffix.lower() in YAML_SUFFIXES:
+        if not YAML_AVAILABLE:
+            error_message = (
+                "PyYAML is required to read YAML files. Install the `yaml` extra, "
+                "i.e., `pip install oteapi-optimade[yaml]`."
+            )
+            raise MissingDependency(error_message)
+        try:
+            raw_configs = yaml.safe_load(content)
+        except yaml.YAMLError as exc:
+            error_message = f"Could not read {path} as YAML: {exc}"
+            raise ConfigurationError(error_message) from exc
+    else:
+        try:
+            raw_configs = json_codec.loads(content)
+        except ValueError as exc:
+            error_message = f"Could not read {path} as JSON: {exc}"
+            raise ConfigurationError(error_message) from exc
+
+    if not isinstance(raw_configs, list):
+        error_message = (
+            f"Expected a list of OPTIMADE resource configurations in {path}, got "
+            f"{type(raw_configs).__name__}."
+        )
+        raise ConfigurationError(error_message)
+
+    try:
+        return [OPTIMADEResourceConfig(**raw_config) for raw_config in raw_configs]
+    except (TypeError, ValidationError) as exc:
+        error_message = f"Invalid OPTIMADE resource configuration in {path}: {exc}"
+        raise ConfigurationError(error_message) from exc
+
+
+def _query(config: OPTIMADEResourceConfig) -> str:
+    """Return a description of the OPTIMADE query of a resource configuration."""
+    if isinstance(config.accessUrl, list):
+        return ", ".join(str(url) for url in config.accessUrl)
+    return str(config.accessUrl)
+
+
+def _paginated(config: OPTIMADEResourceConfig) -> OPTIMADEResourceConfig:
+    """Return the resource configuration retrieving all pages, unless `paginate`
+    is set explicitly."""
+    if "paginate" in config.configuration.model_fields_set:
+        return config
+    return config.model_copy(
+        update={
+            "configuration": config.configuration.model_copy(update={"paginate": True})
+        }
+    )
+
+
+def _warm(config: OPTIMADEResourceConfig) -> WarmResult:
+    """Run an OPTIMADE query to fill the data cache."""
+    query = _query(config)
+    start = time.perf_counter()
+    try:
+        result = OPTIMADEResourceStrategy(_paginated(config)).get()
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Could not warm the data cache with %s: %r", query, exc)
+        return WarmResult(
+            query=query,
+            seconds=time.perf_counter() - start,
+            entries=0,
+            bytes_transferred=0,
+            bytes_decoded=0,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+
+    return WarmResult(
+        query=query,
+        seconds=time.perf_counter() - start,
+        entries=len(result.get("optimade_resources", [])),
+        bytes_transferred=result.get("optimade_bytes_transferred", 0),
+        bytes_decoded=result.get("optimade_bytes_decoded", 0),
+    )
+
+
+def warm_cache(
+    configs: Sequence[OPTIMADEResourceConfig],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[WarmResult]:
+    """Run OPTIMADE queries concurrently to fill the data cache.
+
+    A failing OPTIMADE query does not stop the others.
+
+    Parameters:
+        configs: The OPTIMADE resource configurations.
+        max_workers: The maximum number of OPTIMADE queries to run concurrently.
+
+    Returns:
+        The outcome of each OPTIMADE query, in the same order as `configs`.
+
+    """
+    if not configs:
+        return []
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(configs)),
+        thread_name_prefix="oteapi-optimade-warm-cache",
+    ) as executor:
+        return list(executor.map(_warm, configs))
+
+
+def _format_bytes(size: int) -> str:
+    """Return a human-readable byte size."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def format_report(results: Sequence[WarmResult], elapsed: float | None = None) -> str:
+    """Return a timing and size report of warming the data cache.
+
+    Parameters:
+        results: The outcome of the OPTIMADE queries, see
+            [`warm_cache()`][oteapi_optimade.warm_cache.warm_cache].
+        elapsed: The total number of seconds warming the data cache took. Defaults
+            to the time of the slowest OPTIMADE query.
+
+    Returns:
+        A table with a row per OPTIMADE query, and a total.
+
+    """
+    if elapsed is None:
+        elapsed = max((result.seconds for result in results), default=0)
+
+    header = ("Query", "Status", "Time (s)", "Entries", "Transferred", "Decoded")
+    rows: list[tuple[str, ...]] = [
+        (
+            result.query,
+            "error" if result.error else "ok",
+            f"{result.seconds:.2f}",
+            str(result.entries),
+            _format_bytes(result.bytes_transferred),
+            _format_bytes(result.bytes_decoded),
+        )
+        for result in results
+    ]
+    rows.append(
+        (
+            "Total",
+            f"{sum(not result.error for result in results)}/{len(results)} ok",
+            f"{elapsed:.2f}",
+            str(sum(result.entries for result in results)),
+            _format_bytes(sum(result.bytes_transferred for result in results)),
+            _format_bytes(sum(result.bytes_decoded for result in results)),
+        )
+    )
+
+    widths = [max(len(row[column]) for row in (header, *rows)) for column in range(6)]
+
+    def _line(row: tuple[str, ...]) -> str:
+        return "  ".join(
+            cell.ljust(width) if column < 2 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths, strict=True))
+        ).rstrip()
+
+    lines = [_line(header), _line(tuple("-" * width for width in widths))]
+    lines.extend(_line(row) for row in rows[:-1])
+    lines.extend((lines[1], _line(rows[-1])))
+    lines.extend(
+        f"{result.query}: {result.error}" for result in results if result.error
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Warm the data cache with the OPTIMADE queries listed in JSON or YAML files.
+
+    Parameters:
+        argv: The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        The exit code: `0` if all OPTIMADE queries succeeded, otherwise `1`.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="oteapi-optimade-warm-cache",
+        description=(
+            "Warm the data cache with OPTIMADE queries. Each file is a JSON or YAML "
+            "list of OPTIMADE resource configurations."
+        ),
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        type=Path,
+        help="JSON or YAML files listing OPTIMADE resource configurations.",
+    )
+    parser.add_argument(
+        "-j",
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=(
+            "The maximum number of OPTIMADE queries to run concurrently "
+            f"(default: {DEFAULT_MAX_WORKERS})."
+        ),
+    )
+    args = parser.parse_args(argv)
+    if args.max_workers < 1:
+        parser.error("--max-workers must be at least 1.")
+
+    configs: list[OPTIMADEResourceConfig] = []
+    for path in args.files:
+        try:
+            configs.extend(load_configs(path))
+        except (OSError, ConfigurationError, MissingDependency) as exc:
+            parser.error(str(exc))
+
+    start = time.perf_counter()
+    results = warm_cache(configs, max_workers=args.max_workers)
+    print(format_report(results, elapsed=time.perf_counter() - start))  # noqa: T201
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
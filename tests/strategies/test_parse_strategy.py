@@ -0,0 +1,375 @@
+"""Test `oteapi_optimade.strategies.parse` module.
+Specifically the `OPTIMADEParseStrategy` class.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+def test_get_download(
+    static_files: Path, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test the `get()` method requests `downloadUrl` if it is not in the cache."""
+    from optimade.models import StructureResponseMany
+    from oteapi.datacache import DataCache
+
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    requests_mock.get(
+        url, content=(static_files / "optimade_response.json").read_bytes()
+    )
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+        },
+    }
+
+    output = OPTIMADEParseStrategy(config).get()
+
+    assert output.optimade_response_model == (
+        StructureResponseMany.__module__,
+        StructureResponseMany.__name__,
+    )
+    assert len(output.optimade_response["data"]) == 2
+    assert url in DataCache(config["configuration"]["datacache_config"])
+
+    # The cached response is used for subsequent calls
+    OPTIMADEParseStrategy(config).get()
+    assert requests_mock.call_count == 1
+
+
+def test_get_single_entry(
+    static_files: Path, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test a single-entry response is validated with the single-entry model only."""
+    import json
+
+    from optimade.models import StructureResponseMany, StructureResponseOne
+
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures/903"
+    sample_response = json.loads(
+        (static_files / "optimade_response.json").read_text(encoding="utf8")
+    )
+    requests_mock.get(url, json={**sample_response, "data": sample_response["data"][0]})
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+        },
+    }
+
+    def _fail(*_, **__):
+        pytest.fail("The response should not be validated as a list of entries.")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(StructureResponseMany, "__init__", _fail)
+        output = OPTIMADEParseStrategy(config).get()
+
+    assert output.optimade_response_model == (
+        StructureResponseOne.__module__,
+        StructureResponseOne.__name__,
+    )
+    assert output.optimade_response["data"]["id"] == "903"
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "data", "expected"),
+    [
+        ("structures", [], ["StructureResponseMany"]),
+        ("structures/903", {}, ["StructureResponseOne"]),
+        ("structures/903", None, ["StructureResponseOne"]),
+        ("info", {}, ["InfoResponse"]),
+        ("info/structures", {}, ["EntryInfoResponse"]),
+        ("structures", {}, ["StructureResponseMany", "StructureResponseOne"]),
+    ],
+)
+def test_dispatch_response_model(
+    endpoint: str, data: list | dict | None, expected: list[str]
+) -> None:
+    """Test the response model is chosen from the endpoint and the shape of `data`,
+    and that all response models are tried if it is ambiguous."""
+    from oteapi_optimade.models.custom_types import OPTIMADEUrl
+    from oteapi_optimade.strategies.parse import _dispatch_response_model
+
+    optimade_url = OPTIMADEUrl(f"https://example.org/v1/{endpoint}")
+
+    response_models = _dispatch_response_model(
+        optimade_url, {"data": data}, optimade_url.response_model()
+    )
+
+    assert sorted(model.__name__ for model in response_models) == expected
+
+
+def test_parse_response_lazy_validation(
+    static_files: Path, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test entries are validated lazily in-process, and fully for `get()`."""
+    from oteapi_optimade.lazy_validation import LazyEntry
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    requests_mock.get(
+        url, content=(static_files / "optimade_response.json").read_bytes()
+    )
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+            "cache_validated_response": False,
+        },
+    }
+    eager_output = OPTIMADEParseStrategy(config).get()
+
+    config["configuration"]["lazy_validation"] = True
+    response = OPTIMADEParseStrategy(config).parse_response()
+
+    assert all(isinstance(entry, LazyEntry) for entry in response.data)
+    output = OPTIMADEParseStrategy(config).get()
+    assert output.optimade_response_model == eager_output.optimade_response_model
+    assert output.optimade_response == eager_output.optimade_response
+
+
+def test_get_cache_raw_response(
+    static_files: Path, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test the raw response body is cached and only decoded when parsed."""
+    from oteapi.datacache import DataCache
+
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    sample_content = (static_files / "optimade_response.json").read_bytes()
+    requests_mock.get(url, content=sample_content)
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+            "cache_raw_response": True,
+        },
+    }
+
+    output = OPTIMADEParseStrategy(config).get()
+
+    assert len(output.optimade_response["data"]) == 2
+
+    cached_response = DataCache(config["configuration"]["datacache_config"]).get(url)
+    assert cached_response["content"] == sample_content
+    assert "json" not in cached_response
+
+    # The cached raw response is parsed for subsequent calls
+    assert OPTIMADEParseStrategy(config).get() == output
+    assert requests_mock.call_count == 1
+
+
+def test_get_cache_validated_response(
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a cached validated response is used instead of validating again."""
+    import optimade
+
+    from oteapi_optimade.http_client import (
+        VALIDATED_KEY_PREFIX,
+        fetch_response,
+        get_validated_response,
+        store_validated_response,
+    )
+    from oteapi_optimade.memory_cache import OPTIMADEDataCache
+    from oteapi_optimade.models.config import OPTIMADEConfig
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    requests_mock.get(
+        url, content=(static_files / "optimade_response.json").read_bytes()
+    )
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+        },
+    }
+    cache = OPTIMADEDataCache(config["configuration"]["datacache_config"])
+
+    # Validated responses are only stored when opted in
+    OPTIMADEParseStrategy(config).get()
+    assert get_validated_response(url, cache.config) is None
+
+    config["configuration"]["cache_validated_response"] = True
+    output = OPTIMADEParseStrategy(config).get()
+    validated = get_validated_response(url, cache.config)
+    assert validated is not None
+    assert validated["optimade_response_model"] == output.optimade_response_model
+    assert validated["optimade_version"] == optimade.__version__
+
+    validations: list[str] = []
+    original_validate_response = OPTIMADEParseStrategy._validate_response
+
+    def _validate_response(self, optimade_url, cache):
+        validations.append(str(optimade_url))
+        return original_validate_response(self, optimade_url, cache)
+
+    monkeypatch.setattr(OPTIMADEParseStrategy, "_validate_response", _validate_response)
+
+    assert OPTIMADEParseStrategy(config).get() == output
+    assert not validations
+
+    # Modifying a result does not modify the cached validated response
+    modified_output = OPTIMADEParseStrategy(config).get()
+    modified_output.optimade_response["data"][0]["attributes"]["nsites"] = -1
+    assert OPTIMADEParseStrategy(config).get() == output
+
+    # Validated with a different version of the optimade package
+    store_validated_response(
+        url, cache.config, {**validated, "optimade_version": "0.0.0"}
+    )
+    assert OPTIMADEParseStrategy(config).get() == output
+    assert validations == [url]
+
+    # A new response for the URL is validated anew
+    fetch_response(
+        url,
+        OPTIMADEConfig(
+            force_refresh=True,
+            datacache_config=config["configuration"]["datacache_config"],
+        ),
+    )
+    assert f"{VALIDATED_KEY_PREFIX}{url}" not in cache
+    assert OPTIMADEParseStrategy(config).get() == output
+    assert validations == [url, url]
+
+
+def test_aget_download(
+    static_files: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the `aget()` method requests `downloadUrl` asynchronously."""
+    import asyncio
+
+    httpx = pytest.importorskip("httpx")
+
+    from oteapi.datacache import DataCache
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    sample_content = (static_files / "optimade_response.json").read_bytes()
+    monkeypatch.setattr(
+        http_client,
+        "_new_async_client",
+        lambda *_: httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(200, content=sample_content)
+            )
+        ),
+    )
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path)},
+        },
+    }
+
+    async def aget_and_close():
+        try:
+            return await OPTIMADEParseStrategy(config).aget()
+        finally:
+            await http_client.aclose_async_clients()
+
+    output = asyncio.run(aget_and_close())
+
+    assert len(output.optimade_response["data"]) == 2
+    assert url in DataCache(config["configuration"]["datacache_config"])
+
+
+@pytest.mark.parametrize("in_process", [False, True])
+def test_get_stale_while_revalidate(
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    in_process: bool,
+) -> None:
+    """Test a stale response is not stored as validated, so the refreshed response
+    is validated once it is in the data cache."""
+    import json
+    import time
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    url = "https://example.org/v1/structures?page_limit=2"
+    sample = json.loads((static_files / "optimade_response.json").read_bytes())
+    refreshed = json.loads(json.dumps(sample))
+    refreshed["data"][0]["id"] = "NEW-ID"
+    requests_mock.get(url, [{"json": sample}, {"json": refreshed}])
+
+    # Refresh before the stale response is validated
+    monkeypatch.setattr(
+        http_client,
+        "_refresh_in_background",
+        lambda _cache, _key, refresh: refresh(),
+    )
+
+    config = {
+        "entity": "http://onto-ns.com/meta/1.2.0/OPTIMADEStructure",
+        "parserType": "parser/OPTIMADE",
+        "configuration": {
+            "mediaType": "application/vnd.optimade+json",
+            "downloadUrl": url,
+            "datacache_config": {"cacheDir": str(tmp_path), "expireTime": 1},
+            "stale_while_revalidate": 60,
+            "cache_validated_response": True,
+        },
+    }
+
+    def _first_id() -> str:
+        if in_process:
+            return OPTIMADEParseStrategy(config).parse_response().data[0].id
+        return OPTIMADEParseStrategy(config).get().optimade_response["data"][0]["id"]
+
+    assert _first_id() == "903"
+
+    time.sleep(1.1)
+    assert _first_id() == "903"
+    assert requests_mock.call_count == 2
+
+    assert _first_id() == "NEW-ID"
+    assert requests_mock.call_count == 2
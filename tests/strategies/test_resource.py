@@ -112,3 +112,889 @@ def test_use_dlite(
         ).get_labels()
     else:
         assert "collection_id" not in resource_config["configuration"]
+
+
+@pytest.mark.parametrize("force_refresh", [True, False])
+def test_get_cache_first(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    force_refresh: bool,
+) -> None:
+    """Test the `get()` method serves a cached response unless `force_refresh` is
+    set."""
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "force_refresh": force_refresh,
+    }
+
+    first_output = OPTIMADEResourceStrategy(resource_config).get()
+    second_output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert requests_mock.call_count == (2 if force_refresh else 1)
+    assert first_output.optimade_resources == second_output.optimade_resources
+
+
+def test_get_in_process_parse(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the validated response model is received directly from an in-process
+    parse strategy, giving the same resources as the serialized parse result."""
+    from oteapi_optimade.strategies import resource
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+    }
+
+    def _get(_):
+        pytest.fail("The serialized parse result should not be used in-process.")
+
+    with monkeypatch.context() as context:
+        context.setattr(OPTIMADEParseStrategy, "get", _get)
+        in_process_output = resource.OPTIMADEResourceStrategy(resource_config).get()
+
+    # Fall back to the serialized parse result, e.g., as for remote execution
+    monkeypatch.setattr(resource, "OPTIMADEParseStrategy", type(None))
+    serialized_output = resource.OPTIMADEResourceStrategy(resource_config).get()
+
+    assert in_process_output.optimade_resources
+    assert in_process_output.optimade_resources == serialized_output.optimade_resources
+    assert requests_mock.call_count == 1
+
+
+def test_get_warm_not_validated_again(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a cached response is not validated again by a warm `get()`, while the
+    validated response model is in the memory tier."""
+    from oteapi_optimade.strategies.parse import OPTIMADEParseStrategy
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    parse_response = OPTIMADEParseStrategy._parse_response
+    parsed_urls: list[str] = []
+
+    def _parse_response(self, optimade_url, *args, **kwargs):
+        parsed_urls.append(str(optimade_url))
+        return parse_response(self, optimade_url, *args, **kwargs)
+
+    monkeypatch.setattr(OPTIMADEParseStrategy, "_parse_response", _parse_response)
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "cache_validated_response": True,
+    }
+    outputs = [OPTIMADEResourceStrategy(resource_config).get() for _ in range(3)]
+
+    assert requests_mock.call_count == 1
+    assert len(parsed_urls) == 1
+    assert all(
+        output.optimade_resources == outputs[0].optimade_resources for output in outputs
+    )
+
+    # Without `cache_validated_response`, the response is validated every time
+    resource_config["configuration"]["cache_validated_response"] = False
+    OPTIMADEResourceStrategy(resource_config).get()
+
+    assert requests_mock.call_count == 1
+    assert len(parsed_urls) == 2
+
+
+def test_get_lazy_validation(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test the entries of the result are only validated when read, with
+    `lazy_validation`."""
+    from oteapi_optimade.lazy_validation import LazyResource
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {"datacache_config": {"cacheDir": str(tmp_path)}}
+    expected = OPTIMADEResourceStrategy(resource_config).get().model_dump()
+
+    resource_config["configuration"]["lazy_validation"] = True
+    resource_config["configuration"]["cache_validated_response"] = False
+    output = OPTIMADEResourceStrategy(resource_config).get()
+    resources = output.optimade_resources
+
+    assert resources
+    assert all(isinstance(resource, LazyResource) for resource in resources)
+    assert [resource["id"] for resource in resources] == [
+        resource["id"] for resource in expected["optimade_resources"]
+    ]
+    assert all("validated=False" in repr(resource) for resource in resources)
+
+    assert resources[0]["attributes"] == expected["optimade_resources"][0]["attributes"]
+    assert "validated=True" in repr(resources[0])
+    assert all("validated=False" in repr(resource) for resource in resources[1:])
+
+    assert output.model_dump()["optimade_resources"] == expected["optimade_resources"]
+
+
+def test_get_lazy_validation_then_not(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test a lazily validated response model is not reused for a query without
+    `lazy_validation` against the same data cache."""
+    from oteapi_optimade.lazy_validation import LazyResource
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "cache_validated_response": True,
+        "lazy_validation": True,
+    }
+    lazy_output = OPTIMADEResourceStrategy(resource_config).get()
+    assert all(
+        isinstance(resource, LazyResource)
+        for resource in lazy_output.optimade_resources
+    )
+
+    resource_config["configuration"]["lazy_validation"] = False
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert requests_mock.call_count == 1
+    assert output.optimade_resources
+    assert all(isinstance(resource, dict) for resource in output.optimade_resources)
+    assert output.model_dump()["optimade_resources"] == (
+        lazy_output.model_dump()["optimade_resources"]
+    )
+
+
+def test_get_failing_host(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test a transient error response is requested only according to the retry
+    settings, and parsed as requested, also when it is not stored in the data
+    cache."""
+    import json
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    requests_mock.get(
+        resource_config["accessUrl"],
+        status_code=503,
+        json={
+            "errors": [{"status": "503", "detail": "Service unavailable"}],
+            "meta": sample_response["meta"],
+        },
+    )
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "max_retries": 1,
+        "retry_backoff": 0,
+        "cache_transient_errors": False,
+    }
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [error["detail"] for error in output.optimade_resources] == [
+        "Service unavailable"
+    ]
+    assert requests_mock.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "cache_transient_errors", [False, True], ids=["not_cached", "cached"]
+)
+@pytest.mark.parametrize("stream_entries", [False, True], ids=["json", "stream"])
+def test_get_transient_error_calls(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    cache_transient_errors: bool,
+    stream_entries: bool,
+) -> None:
+    """Test each query requests a transient error response once per attempt, and
+    that it is only requested anew by the next query if it is not cached."""
+    import json
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    requests_mock.get(
+        resource_config["accessUrl"],
+        status_code=503,
+        json={
+            "errors": [{"status": "503", "detail": "Service unavailable"}],
+            "meta": sample_response["meta"],
+        },
+    )
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "max_retries": 2,
+        "retry_backoff": 0,
+        "cache_transient_errors": cache_transient_errors,
+        "stream_entries": stream_entries,
+    }
+
+    for _ in range(2):
+        output = OPTIMADEResourceStrategy(resource_config).get()
+        assert output.optimade_resources[0]["status"] == "503"
+
+    assert requests_mock.call_count == (3 if cache_transient_errors else 6)
+
+
+def test_aget_transient_error_calls(
+    resource_config: dict[str, str],
+    static_files: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the `aget()` method requests a transient error response that is not
+    cached once per attempt."""
+    import asyncio
+    import json
+
+    httpx = pytest.importorskip("httpx")
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    requested_urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(
+            503,
+            json={
+                "errors": [{"status": "503", "detail": "Service unavailable"}],
+                "meta": sample_response["meta"],
+            },
+        )
+
+    monkeypatch.setattr(
+        http_client,
+        "_new_async_client",
+        lambda *_: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "max_retries": 1,
+        "retry_backoff": 0,
+        "cache_transient_errors": False,
+    }
+
+    async def aget_and_close():
+        try:
+            return await OPTIMADEResourceStrategy(resource_config).aget()
+        finally:
+            await http_client.aclose_async_clients()
+
+    output = asyncio.run(aget_and_close())
+
+    assert output.optimade_resources[0]["status"] == "503"
+    assert len(requested_urls) == 2
+
+
+@pytest.mark.parametrize(
+    ("max_pages", "max_entries", "expected_ids", "expected_pages"),
+    [
+        (None, None, ["903", "250", "903-2", "250-2", "903-4"], 3),
+        (2, None, ["903", "250", "903-2", "250-2"], 2),
+        (None, 3, ["903", "250", "903-2"], 2),
+    ],
+    ids=["all", "max_pages", "max_entries"],
+)
+@pytest.mark.parametrize(
+    "max_concurrent_requests", [1, 3], ids=["sequential", "concurrent"]
+)
+@pytest.mark.parametrize("stream_entries", [False, True], ids=["json", "stream"])
+def test_get_paginate(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    max_pages: int | None,
+    max_entries: int | None,
+    expected_ids: list[str],
+    expected_pages: int,
+    max_concurrent_requests: int,
+    stream_entries: bool,
+) -> None:
+    """Test the `get()` method follows `links.next` when `paginate` is set.
+
+    With `max_concurrent_requests` above 1, the remaining offset-based pages are
+    prefetched concurrently, but must still be returned in page order.
+    """
+    import json
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    base_url = resource_config["accessUrl"]
+
+    for page_offset in (0, 2, 4):
+        page_url = f"{base_url}&page_offset={page_offset}" if page_offset else base_url
+        page_response = json.loads(json.dumps(sample_response))
+
+        page_response["data"] = [
+            {
+                **entry,
+                "id": f"{entry['id']}-{page_offset}" if page_offset else entry["id"],
+            }
+            for entry in page_response["data"]
+        ][: 1 if page_offset == 4 else None]
+        page_response["meta"]["data_returned"] = 5
+        page_response["links"]["next"] = (
+            f"{base_url}&page_offset={page_offset + 2}" if page_offset < 4 else None
+        )
+
+        requests_mock.get(page_url, json=page_response)
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "paginate": True,
+        "max_pages": max_pages,
+        "max_entries": max_entries,
+        "max_concurrent_requests": max_concurrent_requests,
+        "stream_entries": stream_entries,
+    }
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [resource["id"] for resource in output.optimade_resources] == expected_ids
+    assert requests_mock.call_count == expected_pages
+
+
+def test_get_paginate_short_first_page(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test the prefetched pages are offset by the provider's page size, not by the
+    number of entries in the first page."""
+    import json
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    base_url = resource_config["accessUrl"]
+
+    for page_offset in (0, 2, 4):
+        page_url = f"{base_url}&page_offset={page_offset}" if page_offset else base_url
+        page_response = json.loads(json.dumps(sample_response))
+        page_response["data"] = [
+            {**entry, "id": f"{entry['id']}-{page_offset}"}
+            for entry in page_response["data"]
+        ][: 1 if page_offset in (0, 4) else None]
+        page_response["meta"]["data_returned"] = 6
+        page_response["links"]["next"] = (
+            f"{base_url}&page_offset={page_offset + 2}" if page_offset < 4 else None
+        )
+        requests_mock.get(page_url, json=page_response)
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path)},
+        "paginate": True,
+        "max_concurrent_requests": 3,
+    }
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [resource["id"] for resource in output.optimade_resources] == [
+        "903-0",
+        "903-2",
+        "250-2",
+        "903-4",
+    ]
+    assert requests_mock.call_count == 3
+
+
+def test_get_stream_entries(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test the `get()` method gives the same result when streaming the entries."""
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "json")}
+    }
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "stream")},
+        "stream_entries": True,
+    }
+    streamed_output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert streamed_output.optimade_resources == output.optimade_resources
+    assert streamed_output.optimade_resource_model == output.optimade_resource_model
+    assert streamed_output.optimade_bytes_decoded == len(sample_file.read_bytes())
+
+    # From the data cache
+    assert OPTIMADEResourceStrategy(resource_config).get().optimade_resources == (
+        output.optimade_resources
+    )
+    assert requests_mock.call_count == 2
+
+
+@pytest.mark.parametrize("use_dlite", [False, True])
+def test_get_jsonlines(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    use_dlite: bool,
+) -> None:
+    """Test the `get()` method streams JSON Lines responses, one entry per line, or
+    downloads them whole with DLite."""
+    import json
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    sample = json.loads(sample_file.read_bytes())
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+    requests_mock.get(
+        f"{resource_config['accessUrl']}&response_format=jsonlines",
+        text="\n".join(
+            json.dumps(line)
+            for line in [
+                {"x-optimade": {"meta": sample["meta"]}},
+                *sample["data"],
+            ]
+        ),
+    )
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "json")}
+    }
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "jsonlines")},
+        "query_parameters": {"response_format": "jsonlines"},
+        "use_dlite": use_dlite,
+    }
+    resource_config["configuration"].update(
+        OPTIMADEResourceStrategy(resource_config).initialize()
+    )
+    jsonlines_output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert "response_format=jsonlines" in requests_mock.last_request.url
+    assert jsonlines_output.optimade_resources == output.optimade_resources
+    assert jsonlines_output.optimade_resource_model == output.optimade_resource_model
+    assert ("collection_id" in resource_config["configuration"]) is use_dlite
+
+
+def test_get_entry_cache(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test the `get()` method fills in cached entries with `entry_cache`, and only
+    requests the missing (or modified) entries in a batched `id` query."""
+    import json
+    import re
+
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    sample = json.loads(sample_file.read_bytes())
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "json")}
+    }
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    entries = {entry["id"]: entry for entry in sample["data"]}
+    last_modified = {
+        entry_id: entry["attributes"]["last_modified"]
+        for entry_id, entry in entries.items()
+    }
+    batch_ids: list[list[str]] = []
+
+    def _response(request, _):
+        filter_ = request.qs["filter"][0]
+        if request.qs.get("response_fields") == ["id,last_modified"]:
+            entry_ids = ["250", "903"] if filter_ == "nelements=2" else ["903", "250"]
+            data = [
+                {
+                    "id": entry_id,
+                    "type": "structures",
+                    "attributes": {"last_modified": last_modified[entry_id]},
+                }
+                for entry_id in entry_ids
+            ]
+        else:
+            batch_ids.append(re.findall(r'id="([^"]+)"', filter_))
+            data = [
+                {
+                    **entries[entry_id],
+                    "attributes": {
+                        **entries[entry_id]["attributes"],
+                        "last_modified": last_modified[entry_id],
+                    },
+                }
+                for entry_id in batch_ids[-1]
+            ]
+        return {**sample, "data": data, "links": {"next": None}}
+
+    requests_mock.get(
+        re.compile(r"^https://example\.org/.*/v1/structures\?"), json=_response
+    )
+
+    resource_config["configuration"] = {
+        "datacache_config": {"cacheDir": str(tmp_path / "entry_cache")},
+        "entry_cache": True,
+    }
+    entry_cache_output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert entry_cache_output.optimade_resources == output.optimade_resources
+    assert entry_cache_output.optimade_resource_model == output.optimade_resource_model
+    assert batch_ids == [["903", "250"]]
+
+    # Another query returning the same entries uses the cached entries
+    resource_config["accessUrl"] = (
+        "https://example.org/some/base/v0.1/optimade/v1/structures?filter=nelements=2"
+    )
+    assert OPTIMADEResourceStrategy(resource_config).get().optimade_resources == (
+        output.optimade_resources[::-1]
+    )
+    assert batch_ids == [["903", "250"]]
+
+    # Modifying a result does not modify the cached entries
+    modified_output = OPTIMADEResourceStrategy(resource_config).get()
+    modified_output.optimade_resources[0]["attributes"]["nsites"] = -1
+    assert OPTIMADEResourceStrategy(resource_config).get().optimade_resources == (
+        output.optimade_resources[::-1]
+    )
+
+    # A modified entry is requested anew
+    last_modified["903"] = "2024-01-01T00:00:00Z"
+    resource_config["configuration"]["force_refresh"] = True
+    entry_cache_output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [resource["id"] for resource in entry_cache_output.optimade_resources] == [
+        "250",
+        "903",
+    ]
+    assert batch_ids == [["903", "250"], ["903"]]
+
+
+def test_get_no_paginate(
+    resource_config: dict[str, str],
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+) -> None:
+    """Test the `get()` method only retrieves the first page by default."""
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_file = static_files / "optimade_response.json"
+    requests_mock.get(resource_config["accessUrl"], content=sample_file.read_bytes())
+
+    resource_config["configuration"] = {"datacache_config": {"cacheDir": str(tmp_path)}}
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert len(output.optimade_resources) == 2
+    assert requests_mock.call_count == 1
+
+
+def test_get_tune_query(
+    static_files: Path, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test the `get()` method tunes the query to the provider's capabilities."""
+    import json
+    from urllib.parse import parse_qs, urlsplit
+
+    from oteapi_optimade.discovery import clear_index
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    clear_index()
+
+    base_url = "https://example.org/db"
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+
+    requests_mock.get(
+        f"{base_url}/v1/info",
+        json={
+            "data": {
+                "id": "/",
+                "type": "info",
+                "attributes": {
+                    "api_version": "1.1.0",
+                    "available_endpoints": ["info", "structures"],
+                    "_exmpl_page_limit_max": 100,
+                },
+            },
+        },
+    )
+    requests_mock.get(
+        f"{base_url}/v1/info/structures",
+        json={"data": {"properties": {"id": {}, "type": {}, "elements": {}}}},
+    )
+
+    first_page = json.loads(json.dumps(sample_response))
+    first_page["links"]["next"] = f"{base_url}/v1/structures?page_cursor=abc"
+    second_page = json.loads(json.dumps(sample_response))
+    second_page["data"] = [{**second_page["data"][0], "id": "next"}]
+    second_page["links"]["next"] = None
+
+    requests_mock.get(f"{base_url}/v1/structures", json=first_page)
+    requests_mock.get(f"{base_url}/v1/structures?page_cursor=abc", json=second_page)
+
+    resource_config = {
+        "resourceType": "optimade/structures",
+        "accessService": "optimade",
+        "accessUrl": f"{base_url}/v1/structures",
+        "configuration": {
+            "datacache_config": {"cacheDir": str(tmp_path)},
+            "paginate": True,
+            "max_entries": 3,
+            "tune_query": True,
+            "query_parameters": {
+                "filter": 'elements HAS ALL "Si","O"',
+                "response_fields": "elements,_other_property",
+            },
+        },
+    }
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [resource["id"] for resource in output.optimade_resources] == [
+        *(entry["id"] for entry in sample_response["data"]),
+        "next",
+    ]
+
+    first_query = parse_qs(
+        urlsplit(
+            next(
+                request.url
+                for request in requests_mock.request_history
+                if request.path == "/db/v1/structures"
+            )
+        ).query
+    )
+    assert first_query["page_limit"] == ["3"]
+    assert first_query["response_fields"] == ["elements"]
+
+    clear_index()
+
+
+def test_aget(
+    resource_config: dict[str, str],
+    static_files: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the `aget()` method gives the same result as the `get()` method."""
+    import asyncio
+    import json
+
+    httpx = pytest.importorskip("httpx")
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    requested_urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, json=sample_response)
+
+    monkeypatch.setattr(
+        http_client,
+        "_new_async_client",
+        lambda *_: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    resource_config["configuration"] = {"datacache_config": {"cacheDir": str(tmp_path)}}
+
+    async def aget_and_close():
+        try:
+            return await OPTIMADEResourceStrategy(resource_config).aget()
+        finally:
+            await http_client.aclose_async_clients()
+
+    output = asyncio.run(aget_and_close())
+
+    assert len(requested_urls) == 1
+    assert output.optimade_bytes_decoded > 0
+
+    # The response is now taken from the data cache
+    cached_output = OPTIMADEResourceStrategy(resource_config).get()
+    assert cached_output.optimade_bytes_decoded == 0
+    assert output == cached_output.model_copy(
+        update={
+            "optimade_bytes_transferred": output.optimade_bytes_transferred,
+            "optimade_bytes_decoded": output.optimade_bytes_decoded,
+        }
+    )
+    assert [resource["id"] for resource in output.optimade_resources] == [
+        entry["id"] for entry in sample_response["data"]
+    ]
+
+
+def test_get_federated(
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the `get()` method for a federated query across OPTIMADE providers."""
+    import json
+    import time
+
+    from oteapi_optimade.strategies import resource
+    from oteapi_optimade.strategies.resource import OPTIMADEResourceStrategy
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+
+    # Delay the slow OPTIMADE provider outside of the requests mocker, since the
+    # mocker handles one request at a time.
+    original_fetch_response = resource.fetch_response
+
+    def fetch_response(url, *args, **kwargs):
+        if "slow" in url:
+            time.sleep(1)
+        return original_fetch_response(url, *args, **kwargs)
+
+    monkeypatch.setattr(resource, "fetch_response", fetch_response)
+
+    requests_mock.get(
+        "https://providers.example.org/v1/links",
+        json={
+            "data": [
+                {
+                    "id": "fast",
+                    "type": "links",
+                    "attributes": {
+                        "link_type": "child",
+                        "base_url": "https://fast.example.org",
+                    },
+                },
+                {
+                    "id": "external",
+                    "type": "links",
+                    "attributes": {
+                        "link_type": "external",
+                        "base_url": "https://external.example.org/index",
+                    },
+                },
+                {
+                    "id": "root",
+                    "type": "links",
+                    "attributes": {
+                        "link_type": "root",
+                        "base_url": "https://providers.example.org",
+                    },
+                },
+            ],
+        },
+    )
+    requests_mock.get(
+        "https://external.example.org/index/v1/links",
+        json={
+            "data": [
+                {
+                    "id": "broken",
+                    "type": "links",
+                    "attributes": {
+                        "link_type": "child",
+                        "base_url": {"href": "https://broken.example.org"},
+                    },
+                },
+                {
+                    "id": "slow",
+                    "type": "links",
+                    "attributes": {
+                        "link_type": "child",
+                        "base_url": "https://slow.example.org",
+                    },
+                },
+            ],
+        },
+    )
+    requests_mock.get("https://fast.example.org/v1/structures", json=sample_response)
+    requests_mock.get(
+        "https://broken.example.org/v1/structures",
+        status_code=400,
+        json={
+            "errors": [{"status": "400", "detail": "Unknown filter property."}],
+            "meta": sample_response["meta"],
+        },
+    )
+    requests_mock.get("https://slow.example.org/v1/structures", json=sample_response)
+
+    resource_config = {
+        "resourceType": "optimade/structures",
+        "accessService": "optimade",
+        "accessUrl": "https://providers.example.org/v1/links",
+        "configuration": {
+            "datacache_config": {"cacheDir": str(tmp_path)},
+            "provider_timeout": 0.5,
+            "query_parameters": {"filter": 'elements HAS ALL "Si","O"'},
+        },
+    }
+
+    output = OPTIMADEResourceStrategy(resource_config).get()
+
+    assert [resource["id"] for resource in output.optimade_resources] == [
+        entry["id"] for entry in sample_response["data"]
+    ]
+    assert output.optimade_resource_providers == ["https://fast.example.org"] * len(
+        sample_response["data"]
+    )
+    assert set(output.optimade_provider_errors) == {
+        "https://broken.example.org",
+        "https://slow.example.org",
+    }
+    assert "Unknown filter property." in (
+        output.optimade_provider_errors["https://broken.example.org"]
+    )
+
+    # Wait for the slow OPTIMADE provider to finish before leaving the mocker context
+    time.sleep(1)
@@ -0,0 +1,84 @@
+"""Test `oteapi_optimade.cache_keys` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+@pytest.mark.parametrize(
+    "filter_",
+    [
+        'elements HAS ALL "Si","O" AND nelements>=2',
+        'elements  HAS ALL "Si" , "O"\nAND nelements >= 2',
+        ' elements HAS ALL "Si","O"   AND  nelements>=2 ',
+    ],
+)
+def test_canonical_filter(filter_: str) -> None:
+    """Test filters differing only in white-space are canonicalized the same."""
+    from oteapi_optimade.cache_keys import canonical_filter
+
+    assert canonical_filter(filter_) == 'elements HAS ALL "Si","O" AND nelements >= 2'
+
+
+def test_canonical_filter_invalid() -> None:
+    """Test an invalid filter is only stripped."""
+    from oteapi_optimade.cache_keys import canonical_filter
+
+    assert canonical_filter(" elements HAS AND ") == "elements HAS AND"
+
+
+def test_canonical_url() -> None:
+    """Test semantically identical OPTIMADE URLs give the same canonical URL."""
+    from oteapi_optimade.cache_keys import canonical_url
+
+    urls = [
+        (
+            "https://example.org/optimade/v1/structures"
+            '?filter=elements HAS "Si"&page_limit=2'
+        ),
+        (
+            "HTTPS://Example.org:443//optimade/V1/structures/"
+            "?page_limit=2&response_format=json&page_offset=0"
+            "&filter=elements%20%20HAS%20%22Si%22#fragment"
+        ),
+        (
+            "https://example.org/optimade/v1/structures"
+            "?page_limit=2&filter=elements+HAS+%22Si%22&sort="
+        ),
+    ]
+    expected = (
+        "https://example.org/optimade/v1/structures"
+        "?filter=elements%20HAS%20%22Si%22&page_limit=2"
+    )
+
+    assert {canonical_url(url) for url in urls} == {expected}
+    assert canonical_url("https://example.org/v1/structures?page_offset=2") != (
+        canonical_url("https://example.org/v1/structures")
+    )
+
+
+def test_fetch_response_canonical_key(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test semantically identical queries share the cached response."""
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    requests_mock.get("https://example.org/v1/structures", json={"data": []})
+    config = OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+
+    fetch_response(
+        "https://example.org/v1/structures?page_limit=2&filter=nsites<3", config
+    )
+    response = fetch_response(
+        "https://example.org/v1/structures?filter=nsites%20%3C%203&page_limit=2",
+        config,
+    )
+
+    assert response["json"] == {"data": []}
+    assert requests_mock.call_count == 1
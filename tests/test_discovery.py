@@ -0,0 +1,161 @@
+"""Test `oteapi_optimade.discovery` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+@pytest.fixture(autouse=True)
+def _clear_index() -> None:
+    """Start every test with an empty in-memory index."""
+    from oteapi_optimade.discovery import clear_index
+
+    clear_index()
+
+
+@pytest.fixture
+def provider(requests_mock: Mocker) -> str:
+    """Mock an OPTIMADE provider with an index meta-database and a child database."""
+    index_url = "https://example.org/index"
+    child_url = "https://example.org/db"
+
+    requests_mock.get(
+        f"{index_url}/v1/info",
+        json={
+            "data": {
+                "id": "/",
+                "type": "info",
+                "attributes": {
+                    "api_version": "1.1.0",
+                    "available_api_versions": [
+                        {"url": f"{index_url}/v1/", "version": "1.1.0"}
+                    ],
+                    "is_index": True,
+                    "available_endpoints": ["info", "links"],
+                },
+            },
+            "meta": {"api_version": "1.1.0"},
+        },
+    )
+    requests_mock.get(
+        f"{index_url}/v1/links",
+        json={
+            "data": [
+                {
+                    "id": "db",
+                    "type": "links",
+                    "attributes": {"link_type": "child", "base_url": child_url},
+                },
+                {
+                    "id": "root",
+                    "type": "links",
+                    "attributes": {"link_type": "root", "base_url": index_url},
+                },
+            ],
+        },
+    )
+    requests_mock.get(
+        f"{child_url}/v1/info",
+        json={
+            "data": {
+                "id": "/",
+                "type": "info",
+                "attributes": {
+                    "api_version": "1.1.0",
+                    "available_api_versions": [
+                        {"url": f"{child_url}/v1/", "version": "1.1.0"}
+                    ],
+                    "available_endpoints": ["info", "links", "structures"],
+                    "_exmpl_page_limit_max": 500,
+                },
+            },
+        },
+    )
+    requests_mock.get(
+        f"{child_url}/v1/info/structures",
+        json={
+            "data": {
+                "description": "Structures",
+                "properties": {"id": {}, "elements": {}, "nsites": {}},
+            },
+        },
+    )
+    return index_url
+
+
+def test_discover_provider(
+    provider: str, requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test discovering an OPTIMADE provider and its child databases."""
+    from oteapi_optimade.discovery import discover_provider
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    config = OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+
+    discovered = discover_provider(f"{provider}/", config)
+
+    assert list(discovered) == [provider, "https://example.org/db"]
+
+    index = discovered[provider]
+    assert index.is_index
+    assert index.api_version == "1.1.0"
+    assert index.properties == {}
+
+    database = discovered["https://example.org/db"]
+    assert not database.is_index
+    assert database.available_api_versions == {"1.1.0": "https://example.org/db/v1/"}
+    assert database.max_page_limit == 500
+    assert database.properties == {"structures": ["id", "elements", "nsites"]}
+
+    assert requests_mock.call_count == 4
+
+
+@pytest.mark.usefixtures("provider")
+def test_get_capabilities_cached(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test capabilities are looked up in the in-memory index and the data cache."""
+    from oteapi_optimade.discovery import clear_index, get_capabilities
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    config = OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+
+    assert get_capabilities("https://example.org/db", config, discover=False) is None
+
+    capabilities = get_capabilities("https://example.org/db", config)
+    assert capabilities is not None
+    assert requests_mock.call_count == 2
+
+    # From the in-memory index
+    assert get_capabilities("https://example.org/db", config) is capabilities
+
+    # From the data cache
+    clear_index()
+    assert get_capabilities("https://example.org/db", config) == capabilities
+
+    assert requests_mock.call_count == 2
+
+
+def test_get_capabilities_unavailable(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test no capabilities are returned for a database that cannot be discovered."""
+    from oteapi_optimade.discovery import get_capabilities
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    requests_mock.get(
+        "https://example.org/broken/v1/info",
+        status_code=500,
+        json={"errors": [{"status": "500", "title": "Internal Server Error"}]},
+    )
+
+    assert (
+        get_capabilities(
+            "https://example.org/broken",
+            OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)}),
+        )
+        is None
+    )
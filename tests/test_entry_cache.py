@@ -0,0 +1,67 @@
+"""Test `oteapi_optimade.entry_cache` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_entry_key() -> None:
+    """Test the data cache key of an entry is independent of the `last_modified`
+    representation and the form of the base URL."""
+    from datetime import datetime, timezone
+
+    from oteapi_optimade.entry_cache import ENTRY_CACHE_KEY_PREFIX, entry_key
+
+    key = entry_key(
+        "https://example.org/optimade", "structures", "903", "2021-09-13T15:45:35Z"
+    )
+
+    assert key is not None
+    assert key.startswith(ENTRY_CACHE_KEY_PREFIX)
+    assert key == entry_key(
+        "HTTPS://example.org:443/optimade/",
+        "structures",
+        "903",
+        datetime(2021, 9, 13, 15, 45, 35, tzinfo=timezone.utc),
+    )
+    assert key != entry_key(
+        "https://example.org/optimade", "structures", "903", "2024-01-01T00:00:00Z"
+    )
+    assert key != entry_key(
+        "https://example.org/optimade", "references", "903", "2021-09-13T15:45:35Z"
+    )
+    assert entry_key("https://example.org/optimade", "structures", "903", None) is None
+
+
+def test_batch_id_filters() -> None:
+    """Test entry ids are batched in `id` filters no longer than `max_length`."""
+    from oteapi_optimade.entry_cache import batch_id_filters
+
+    assert batch_id_filters(["a", 'b"c', "d\\e"]) == [
+        ('id="a" OR id="b\\"c" OR id="d\\\\e"', 3)
+    ]
+    assert batch_id_filters(["a", "b", "c"], max_length=len('id="a" OR id="b"')) == [
+        ('id="a" OR id="b"', 2),
+        ('id="c"', 1),
+    ]
+    assert batch_id_filters(["a OR b", "c"]) == [('id="a OR b" OR id="c"', 2)]
+    assert batch_id_filters([]) == []
+
+
+def test_store_entries(tmp_path: Path) -> None:
+    """Test entries are stored and retrieved by key."""
+    from oteapi_optimade.entry_cache import get_cached_entries, store_entries
+    from oteapi_optimade.memory_cache import memory_cache_stats
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    config = OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+    entry = {"id": "903", "type": "structures", "attributes": {"nsites": 1}}
+
+    store_entries({"key": entry}, config)
+
+    hits = memory_cache_stats().hits
+    assert get_cached_entries(["key", "missing"], config) == {"key": entry}
+    assert memory_cache_stats().hits == hits + 1
@@ -0,0 +1,425 @@
+"""Test `oteapi_optimade.http_client` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from requests_mock import Mocker
+
+
+@pytest.fixture(autouse=True)
+def _close_sessions() -> None:
+    """Start every test without any pooled sessions."""
+    from oteapi_optimade.http_client import close_sessions
+
+    close_sessions()
+
+
+def test_get_session_per_host() -> None:
+    """Test sessions are shared per host."""
+    from oteapi_optimade.http_client import get_session
+
+    session = get_session("https://example.org/v1/structures?page_limit=2")
+
+    assert get_session("https://EXAMPLE.org/v1/info") is session
+    assert get_session("https://example.com/v1/info") is not session
+    assert get_session("http://example.org/v1/info") is not session
+
+
+def test_get_session_renewed() -> None:
+    """Test a session is renewed when idle for too long or the pool size changes."""
+    from oteapi_optimade.http_client import get_session
+
+    session = get_session("https://example.org", pool_size=2)
+
+    assert get_session("https://example.org", pool_size=2) is session
+    assert get_session("https://example.org", pool_size=4) is not session
+
+    session = get_session("https://example.org", pool_size=4)
+    assert get_session("https://example.org", pool_size=4, idle_timeout=-1) is not (
+        session
+    )
+
+
+def test_get_session_idle_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test sessions of more hosts than `pool_size` are kept, and closed in the
+    background once idle."""
+    import time
+
+    import requests
+
+    from oteapi_optimade.http_client import get_session
+
+    closed: list[requests.Session] = []
+    close = requests.Session.close
+
+    def _close(self: requests.Session) -> None:
+        closed.append(self)
+        close(self)
+
+    monkeypatch.setattr(requests.Session, "close", _close)
+
+    hosts = [f"https://example{number}.org" for number in range(4)]
+    sessions = [get_session(host, pool_size=2, idle_timeout=0.2) for host in hosts]
+
+    assert len(set(map(id, sessions))) == len(hosts)
+    for _ in range(3):
+        assert [
+            get_session(host, pool_size=2, idle_timeout=0.2) for host in hosts
+        ] == sessions
+    assert not closed
+
+    deadline = time.monotonic() + 5
+    while len(closed) < len(hosts) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert sorted(map(id, closed)) == sorted(map(id, sessions))
+
+
+def test_close_sessions() -> None:
+    """Test all pooled sessions are closed."""
+    from oteapi_optimade.http_client import close_sessions, get_session
+
+    session = get_session("https://example.org")
+    close_sessions()
+
+    assert get_session("https://example.org") is not session
+
+
+def test_fetch_response_retry(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test transient error responses are retried."""
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    requests_mock.get(
+        url,
+        [
+            {"status_code": 503, "json": {}, "headers": {"Retry-After": "0"}},
+            {"status_code": 429, "json": {}},
+            {"status_code": 200, "json": {"data": []}},
+        ],
+    )
+
+    response = fetch_response(
+        url,
+        OPTIMADEConfig(
+            datacache_config={"cacheDir": str(tmp_path)}, retry_backoff=0.01
+        ),
+    )
+
+    assert response["ok"]
+    assert response["json"] == {"data": []}
+    assert requests_mock.call_count == 3
+
+
+def test_fetch_response_max_concurrent_requests(tmp_path: Path) -> None:
+    """Test the concurrent requests are limited per host, across callers."""
+    import threading
+    import time
+    from collections import Counter
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    lock = threading.Lock()
+    in_flight: Counter[str] = Counter()
+    max_in_flight: Counter[str] = Counter()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            host = self.headers["Host"].split(":")[0]
+            with lock:
+                in_flight[host] += 1
+                max_in_flight[host] = max(max_in_flight[host], in_flight[host])
+            time.sleep(0.05)
+            with lock:
+                in_flight[host] -= 1
+
+            body = b'{"data": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    urls = [
+        f"http://{host}:{port}/v1/structures?page_offset={offset}"
+        for host in ("127.0.0.1", "localhost")
+        for offset in range(6)
+    ]
+    config = OPTIMADEConfig(
+        datacache_config={"cacheDir": str(tmp_path)}, max_concurrent_requests=2
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            responses = list(
+                executor.map(lambda url: fetch_response(url, config), urls)
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert all(response["ok"] for response in responses)
+    assert max_in_flight == {"127.0.0.1": 2, "localhost": 2}
+
+
+def test_fetch_response_retry_exhausted(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test the last transient error response is returned, but not cached if
+    `cache_transient_errors` is not set, when all retries fail."""
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    requests_mock.get(url, status_code=503, json={"errors": []})
+
+    config = OPTIMADEConfig(
+        datacache_config={"cacheDir": str(tmp_path)},
+        max_retries=1,
+        retry_backoff=0,
+        cache_transient_errors=False,
+    )
+
+    response = fetch_response(url, config)
+    assert response["status_code"] == 503
+    assert requests_mock.call_count == 2
+
+    fetch_response(url, config)
+    assert requests_mock.call_count == 4
+
+
+@pytest.mark.parametrize(
+    ("status_code", "expire_time"), [(400, 3_600), (503, 60), (429, 60)]
+)
+def test_fetch_response_negative_cache(
+    requests_mock: Mocker, tmp_path: Path, status_code: int, expire_time: int
+) -> None:
+    """Test error responses are cached with the expiration time of their status
+    class."""
+    import time
+
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.memory_cache import OPTIMADEDataCache
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures?filter=bad"
+    requests_mock.get(
+        url, status_code=status_code, json={"errors": []}, headers={"ETag": '"1"'}
+    )
+
+    config = OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)}, max_retries=0)
+
+    assert fetch_response(url, config)["status_code"] == status_code
+    assert fetch_response(url, config)["status_code"] == status_code
+    assert requests_mock.call_count == 1
+
+    cache = OPTIMADEDataCache(config.datacache_config)
+    _, expire_at = cache.diskcache.get(url, expire_time=True)
+    assert expire_at - time.time() == pytest.approx(expire_time, abs=5)
+
+
+def test_rate_limit_delay() -> None:
+    """Test the token bucket rate limiter is shared per host."""
+    from oteapi_optimade.http_client import rate_limit_delay
+
+    assert rate_limit_delay("https://example.org/a", None) == 0
+
+    assert rate_limit_delay("https://example.org/a", 10, burst=2) == 0
+    assert rate_limit_delay("https://example.org/b", 10, burst=2) == 0
+    assert rate_limit_delay("https://example.org/c", 10, burst=2) == pytest.approx(
+        0.1, abs=0.01
+    )
+    assert rate_limit_delay("https://example.com", 10, burst=2) == 0
+
+
+def test_retry_after() -> None:
+    """Test parsing the `Retry-After` header."""
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    from oteapi_optimade.http_client import _retry_after
+
+    assert _retry_after(None) is None
+    assert _retry_after("invalid") is None
+    assert _retry_after("2") == 2
+    assert _retry_after(
+        format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    ) == pytest.approx(30, abs=2)
+
+
+def test_fetch_response_revalidate(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test an expired response with validators is revalidated with a conditional
+    request."""
+    import time
+
+    from oteapi_optimade.http_client import fetch_response, get_cached_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    requests_mock.get(url, json={"data": []}, headers={"ETag": '"v1"'})
+    requests_mock.get(url, request_headers={"If-None-Match": '"v1"'}, status_code=304)
+
+    config = OPTIMADEConfig(
+        datacache_config={"cacheDir": str(tmp_path), "expireTime": 1}
+    )
+
+    assert fetch_response(url, config)["json"] == {"data": []}
+    assert fetch_response(url, config)["json"] == {"data": []}
+    assert requests_mock.call_count == 1
+
+    time.sleep(1.1)
+    assert get_cached_response(url, config.datacache_config) is None
+
+    assert fetch_response(url, config)["json"] == {"data": []}
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+
+    assert get_cached_response(url, config.datacache_config) == {
+        "status_code": 200,
+        "ok": True,
+        "json": {"data": []},
+    }
+
+
+@pytest.mark.parametrize(
+    ("revalidate_expire_time", "expire_time"), [(None, 120), (600, 660), (0, 60)]
+)
+def test_fetch_response_revalidate_expire_time(
+    requests_mock: Mocker,
+    tmp_path: Path,
+    revalidate_expire_time: int | None,
+    expire_time: int,
+) -> None:
+    """Test a response with validators is kept for revalidation as long again as
+    the data cache expiration time, unless `revalidate_expire_time` is set."""
+    import time
+
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.memory_cache import OPTIMADEDataCache
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    requests_mock.get(url, json={"data": []}, headers={"ETag": '"v1"'})
+
+    config = OPTIMADEConfig(
+        datacache_config={"cacheDir": str(tmp_path), "expireTime": 60},
+        revalidate_expire_time=revalidate_expire_time,
+    )
+    fetch_response(url, config)
+
+    cache = OPTIMADEDataCache(config.datacache_config)
+    _, expire_at = cache.diskcache.get(url, expire_time=True)
+    assert expire_at - time.time() == pytest.approx(expire_time, abs=5)
+
+
+def test_fetch_response_stale_while_revalidate(
+    requests_mock: Mocker, tmp_path: Path
+) -> None:
+    """Test an expired response is returned within the `stale_while_revalidate`
+    window, while it is refreshed in the background."""
+    import time
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.http_client import fetch_response, get_cached_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    requests_mock.get(
+        url, [{"json": {"data": [{"id": "1"}]}}, {"json": {"data": [{"id": "2"}]}}]
+    )
+
+    config = OPTIMADEConfig(
+        datacache_config={"cacheDir": str(tmp_path), "expireTime": 1},
+        stale_while_revalidate=60,
+    )
+
+    assert fetch_response(url, config)["json"] == {"data": [{"id": "1"}]}
+
+    time.sleep(1.1)
+    assert get_cached_response(url, config.datacache_config) is None
+
+    assert fetch_response(url, config)["json"] == {"data": [{"id": "1"}]}
+    for thread in list(http_client._REFRESHES.values()):
+        thread.join()
+
+    assert requests_mock.call_count == 2
+    assert get_cached_response(url, config.datacache_config) == {
+        "status_code": 200,
+        "ok": True,
+        "json": {"data": [{"id": "2"}]},
+    }
+
+
+def test_refresh_in_background_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test any error in a background refresh is logged, and does not prevent
+    refreshing again."""
+    import threading
+
+    from oteapi_optimade import http_client
+    from oteapi_optimade.memory_cache import OPTIMADEDataCache
+
+    unhandled: list[threading.ExceptHookArgs] = []
+    monkeypatch.setattr(threading, "excepthook", unhandled.append)
+
+    cache = OPTIMADEDataCache({"cacheDir": str(tmp_path)})
+    refreshes: list[str] = []
+
+    def _refresh() -> None:
+        refreshes.append("refresh")
+        raise RuntimeError("Could not write to the data cache")
+
+    for _ in range(2):
+        http_client._refresh_in_background(cache, "key", _refresh)
+        for thread in list(http_client._REFRESHES.values()):
+            thread.join()
+
+    assert refreshes == ["refresh", "refresh"]
+    assert not unhandled
+
+
+def test_fetch_response_compressed(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test compressed transfer is negotiated and decompressed."""
+    import gzip
+    import json
+
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    content = json.dumps({"data": [{"id": str(index)} for index in range(100)]})
+    requests_mock.get(
+        url,
+        content=gzip.compress(content.encode()),
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    response = fetch_response(
+        url, OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+    )
+
+    assert "gzip" in requests_mock.last_request.headers["Accept-Encoding"]
+    assert response["json"] == json.loads(content)
+    assert response["bytes_decoded"] == len(content)
+    assert response["bytes_transferred"] < response["bytes_decoded"]
+
+    cached_response = fetch_response(
+        url, OPTIMADEConfig(datacache_config={"cacheDir": str(tmp_path)})
+    )
+    assert "bytes_transferred" not in cached_response
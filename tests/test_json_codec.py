@@ -0,0 +1,68 @@
+"""Test `oteapi_optimade.json_codec` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+@pytest.mark.parametrize("backend", ["auto", "json", "orjson"])
+def test_loads_dumps(backend: str) -> None:
+    """Test a response roundtrips through each JSON backend."""
+    from oteapi_optimade.json_codec import dumps, loads
+
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+
+    response = {
+        "data": [{"id": "1", "attributes": {"elements": ["Si"], "nsites": 1}}],
+        "meta": {"more_data_available": False, "description": "Ångström"},
+        "links": {"next": None},
+    }
+
+    content = dumps(response, backend)  # type: ignore[arg-type]
+
+    assert isinstance(content, bytes)
+    assert loads(content, backend) == response  # type: ignore[arg-type]
+    assert loads(content.decode(), backend) == response  # type: ignore[arg-type]
+
+
+def test_get_codec_missing_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test `auto` falls back to `json`, while `orjson` requires orjson."""
+    from oteapi_optimade import json_codec
+    from oteapi_optimade.exceptions import MissingDependency
+
+    monkeypatch.setattr(json_codec, "ORJSON_CODEC", None)
+
+    assert json_codec.get_codec("auto") is json_codec.JSON_CODEC
+
+    with pytest.raises(MissingDependency, match="orjson"):
+        json_codec.get_codec("orjson")
+
+
+def test_fetch_response_json_backend(requests_mock: Mocker, tmp_path: Path) -> None:
+    """Test responses are decoded with the configured JSON backend."""
+    from oteapi_optimade import json_codec
+    from oteapi_optimade.http_client import fetch_response
+    from oteapi_optimade.models.config import OPTIMADEConfig
+
+    url = "https://example.org/v1/structures"
+    response = {"data": [], "meta": {"data_returned": 0}}
+    requests_mock.get(url, json=response)
+
+    for backend in ("json", "auto"):
+        config = OPTIMADEConfig(
+            json_backend=backend,
+            datacache_config={"cacheDir": str(tmp_path / backend)},
+        )
+        assert fetch_response(url, config)["json"] == response
+
+    assert json_codec.get_codec(config.json_backend).name == (
+        "orjson" if json_codec.ORJSON_AVAILABLE else "json"
+    )
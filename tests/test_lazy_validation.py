@@ -0,0 +1,95 @@
+"""Test `oteapi_optimade.lazy_validation` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_lazy_response(static_files: Path) -> None:
+    """Test entries are only validated when their attributes are accessed."""
+    import json
+
+    from optimade.models import StructureResource, StructureResponseMany
+
+    from oteapi_optimade.lazy_validation import (
+        LazyEntry,
+        lazy_response,
+        validate_entries,
+    )
+
+    response_content = json.loads(
+        (static_files / "optimade_response.json").read_text(encoding="utf8")
+    )
+
+    response = lazy_response(StructureResponseMany, response_content)
+
+    assert isinstance(response, StructureResponseMany)
+    assert response.meta == StructureResponseMany(**response_content).meta
+    assert all(isinstance(entry, LazyEntry) for entry in response.data)
+    assert [entry.id for entry in response.data] == [
+        entry["id"] for entry in response_content["data"]
+    ]
+    assert "validated=False" in repr(response.data[0])
+
+    assert (
+        response.data[0].attributes.chemical_formula_reduced
+        == response_content["data"][0]["attributes"]["chemical_formula_reduced"]
+    )
+    assert isinstance(response.data[0].resource, StructureResource)
+    assert response.data[1]._resource is None
+
+    assert validate_entries(response).model_dump(exclude_unset=True) == (
+        StructureResponseMany(**response_content).model_dump(exclude_unset=True)
+    )
+
+
+def test_lazy_resource(static_files: Path) -> None:
+    """Test a lazy resource is only validated when read beyond its identity."""
+    import json
+
+    from optimade.models import StructureResource
+
+    from oteapi_optimade.lazy_validation import LazyEntry, LazyResource
+
+    entry = json.loads(
+        (static_files / "optimade_response.json").read_text(encoding="utf8")
+    )["data"][0]
+
+    resource = LazyResource(LazyEntry(StructureResource, entry))
+
+    assert (resource["id"], resource["type"]) == (entry["id"], entry["type"])
+    assert "validated=False" in repr(resource)
+
+    assert dict(resource) == StructureResource(**entry).model_dump()
+    assert "validated=True" in repr(resource)
+    assert resource.get("missing") is None
+
+
+def test_lazy_response_invalid(static_files: Path) -> None:
+    """Test the identity of entries is validated up front, and the rest when
+    accessed."""
+    import json
+
+    from optimade.models import StructureResponseMany
+    from pydantic import ValidationError
+
+    from oteapi_optimade.exceptions import OPTIMADEParseError
+    from oteapi_optimade.lazy_validation import lazy_response
+
+    response_content = json.loads(
+        (static_files / "optimade_response.json").read_text(encoding="utf8")
+    )
+    response_content["data"][1]["attributes"]["nsites"] = "many"
+
+    response = lazy_response(StructureResponseMany, response_content)
+    with pytest.raises(OPTIMADEParseError, match="Could not validate"):
+        response.data[1].attributes  # noqa: B018
+
+    del response_content["data"][1]["id"]
+    with pytest.raises(ValidationError):
+        lazy_response(StructureResponseMany, response_content)
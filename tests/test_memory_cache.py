@@ -0,0 +1,129 @@
+"""Test `oteapi_optimade.memory_cache` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+    from typing import Any
+
+
+@pytest.fixture(autouse=True)
+def _reset_memory_cache() -> Generator[None, None, None]:
+    """Start each test with an empty memory tier with the default bounds."""
+    from oteapi_optimade.memory_cache import clear_memory_cache, configure_memory_cache
+
+    clear_memory_cache()
+    yield
+    configure_memory_cache()
+    clear_memory_cache()
+
+
+def test_two_tiers(tmp_path: Path) -> None:
+    """Test reads are served from memory, and writes go to both tiers."""
+    from oteapi.datacache import DataCache
+
+    from oteapi_optimade.memory_cache import OPTIMADEDataCache, memory_cache_stats
+
+    cache = OPTIMADEDataCache({"cacheDir": str(tmp_path)})
+    value = {"data": [{"id": "903"}]}
+
+    cache.add(value, key="key")
+
+    assert DataCache({"cacheDir": str(tmp_path)}).get("key") == value
+    assert cache.get("key") is value
+    assert memory_cache_stats()[:3] == (1, 0, 1)
+
+    # A value only in the data cache is kept in memory when read
+    DataCache({"cacheDir": str(tmp_path)}).add(value, key="disk")
+    assert cache.get("disk") == value
+    assert cache.get("disk") is cache.get("disk")
+    assert memory_cache_stats()[:3] == (3, 1, 2)
+
+    cache.delete("key")
+    assert "key" not in cache
+    with pytest.raises(KeyError):
+        cache.get("key")
+    assert memory_cache_stats().misses == 2
+
+
+def test_bounds(tmp_path: Path) -> None:
+    """Test the least recently used values are evicted to stay within the bounds."""
+    from oteapi_optimade.memory_cache import (
+        OPTIMADEDataCache,
+        configure_memory_cache,
+        memory_cache_stats,
+    )
+
+    cache = OPTIMADEDataCache({"cacheDir": str(tmp_path)})
+
+    configure_memory_cache(max_entries=2)
+    for key in ("a", "b"):
+        cache.add(key, key=key)
+    cache.get("a")
+    cache.add("c", key="c")
+
+    assert memory_cache_stats().entries == 2
+    cache.get("b")
+    assert memory_cache_stats().misses == 1
+    assert memory_cache_stats().entries == 2
+
+    configure_memory_cache(max_bytes=1024)
+    cache.add(b"0" * 2048, key="large")
+
+    assert cache.get("large") == b"0" * 2048
+    assert memory_cache_stats().size <= 1024
+    assert memory_cache_stats().misses == 2
+
+
+def test_estimate_size() -> None:
+    """Test the size of values is estimated by sampling their containers."""
+    import sys
+
+    from oteapi_optimade.memory_cache import estimate_size
+
+    def _size(value: Any) -> int:
+        """Measure the size of a value, following all items of containers."""
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(
+                _size(key) + _size(item) for key, item in value.items()
+            )
+        if isinstance(value, list):
+            return sys.getsizeof(value) + sum(_size(item) for item in value)
+        return sys.getsizeof(value)
+
+    value = {
+        "data": [
+            {"id": str(index), "attributes": {"cartesian_site_positions": [[0.5] * 3]}}
+            for index in range(1000)
+        ]
+    }
+
+    assert estimate_size(value) == pytest.approx(_size(value), rel=0.05)
+    assert estimate_size(b"0" * 2048) > 2048
+
+
+def test_expiration(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test values expire from memory with the data cache expiration time."""
+    import time
+
+    from oteapi_optimade import memory_cache
+
+    now = time.time()
+    cache = memory_cache.OPTIMADEDataCache(
+        {"cacheDir": str(tmp_path), "expireTime": 60}
+    )
+    cache.add("value", key="key")
+
+    monkeypatch.setattr(memory_cache.time, "time", lambda: now + 120)
+    assert not memory_cache._MEMORY_TIER.contains(cache._memory_key("key"))
+
+    monkeypatch.setattr(memory_cache.time, "time", lambda: now)
+    cache.add("value", key="key")
+    cache.touch("key", expire=600)
+    monkeypatch.setattr(memory_cache.time, "time", lambda: now + 120)
+    assert memory_cache._MEMORY_TIER.contains(cache._memory_key("key"))
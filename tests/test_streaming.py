@@ -0,0 +1,119 @@
+"""Test `oteapi_optimade.streaming` module."""
+
+from __future__ import annotations
+
+import pytest
+
+
+def test_decode_entries() -> None:
+    """Test the `data` entries are decoded one at a time."""
+    import io
+    import json
+
+    from oteapi_optimade.streaming import decode_entries
+
+    response = {
+        "meta": {"data_returned": 2, "more_data_available": False},
+        "data": [
+            {"id": "1", "attributes": {"cartesian_site_positions": [[0.0, 0.5, 1.0]]}},
+            {"id": "2", "attributes": {"nsites": 1}},
+        ],
+        "links": {"next": None},
+    }
+    entries: list[dict] = []
+
+    envelope = decode_entries(io.BytesIO(json.dumps(response).encode()), entries.append)
+
+    assert entries == response["data"]
+    assert envelope == {"meta": response["meta"], "links": response["links"]}
+
+
+def test_decode_entries_single() -> None:
+    """Test a single `data` entry and error responses are decoded."""
+    import io
+
+    from oteapi_optimade.streaming import decode_entries
+
+    entries: list[dict] = []
+    assert decode_entries(io.BytesIO(b'{"data": {"id": "1"}}'), entries.append) == {}
+    assert entries == [{"id": "1"}]
+
+    entries.clear()
+    assert decode_entries(
+        io.BytesIO(b'{"errors": [{"status": "400"}], "data": null}'), entries.append
+    ) == {"errors": [{"status": "400"}], "data": None}
+    assert not entries
+
+
+def test_decode_entries_invalid() -> None:
+    """Test an invalid JSON response raises."""
+    import io
+
+    from oteapi_optimade.exceptions import OPTIMADEParseError
+    from oteapi_optimade.streaming import decode_entries
+
+    with pytest.raises(OPTIMADEParseError, match="Could not decode"):
+        decode_entries(io.BytesIO(b'{"data": [{"id": "1"}'), lambda _: None)
+
+
+def test_decode_jsonlines() -> None:
+    """Test a JSON Lines response is decoded one line at a time."""
+    from oteapi_optimade.http_client import _ChunkReader
+    from oteapi_optimade.streaming import decode_jsonlines
+
+    content = (
+        b'{"x-optimade": {"meta": {"api_version": "1.2.0"}}}\n'
+        b'{"id": "1", "attributes": {"nsites": 1}}\n'
+        b"\n"
+        b'{"id": "2", "attributes": {"nsites": 2}}'
+    )
+    entries: list[dict] = []
+
+    # Chunks split across lines
+    chunks = (content[index : index + 7] for index in range(0, len(content), 7))
+    envelope = decode_jsonlines(_ChunkReader(chunks), entries.append)
+
+    assert entries == [
+        {"id": "1", "attributes": {"nsites": 1}},
+        {"id": "2", "attributes": {"nsites": 2}},
+    ]
+    assert envelope == {"meta": {"api_version": "1.2.0"}}
+
+
+def test_decode_jsonlines_invalid() -> None:
+    """Test an invalid line raises."""
+    import io
+
+    from oteapi_optimade.exceptions import OPTIMADEParseError
+    from oteapi_optimade.streaming import decode_jsonlines
+
+    with pytest.raises(OPTIMADEParseError, match="line 2"):
+        decode_jsonlines(io.BytesIO(b'{"id": "1"}\n{"id": '), lambda _: None)
+
+
+def test_decode_jsonlines_long_line() -> None:
+    """Test a line spread over many chunks is decoded once it is complete."""
+    import json
+
+    from oteapi_optimade.http_client import _ChunkReader
+    from oteapi_optimade.streaming import decode_jsonlines
+
+    entry = {"id": "1", "attributes": {"species_at_sites": ["Si"] * 10_000}}
+    content = json.dumps(entry).encode() + b'\n{"id": "2"}\n'
+    entries: list[dict] = []
+
+    chunks = (content[index : index + 3] for index in range(0, len(content), 3))
+    assert decode_jsonlines(_ChunkReader(chunks), entries.append) == {}
+
+    assert entries == [entry, {"id": "2"}]
+
+
+def test_loads_jsonlines() -> None:
+    """Test a whole JSON Lines response is decoded as a JSON response."""
+    from oteapi_optimade.streaming import loads_jsonlines
+
+    assert loads_jsonlines(
+        b'{"x-optimade": {"meta": {"api_version": "1.2.0"}}}\n'
+        b'{"id": "1"}\n'
+        b'{"id": "2"}\n'
+    ) == {"meta": {"api_version": "1.2.0"}, "data": [{"id": "1"}, {"id": "2"}]}
@@ -0,0 +1,99 @@
+"""Test `oteapi_optimade.warm_cache` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+def test_main(
+    static_files: Path,
+    requests_mock: Mocker,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test all pages of the OPTIMADE queries are stored in the data cache, and a
+    report is printed."""
+    import json
+
+    import yaml
+
+    from oteapi_optimade.http_client import get_cached_response
+    from oteapi_optimade.warm_cache import main
+
+    sample_response = json.loads((static_files / "optimade_response.json").read_bytes())
+    base_url = "https://example.org/v1/structures?page_limit=2"
+    next_url = f"{base_url}&page_offset=2"
+    error_url = "https://example.org/v1/references"
+
+    requests_mock.get(
+        base_url,
+        json={**sample_response, "links": {"next": next_url}},
+    )
+    requests_mock.get(next_url, json={**sample_response, "links": {"next": None}})
+    requests_mock.get(
+        error_url,
+        status_code=400,
+        json={"errors": [{"status": "400", "detail": "Bad request"}]},
+    )
+
+    datacache_config = {"cacheDir": str(tmp_path / "cache")}
+    configs = [
+        {
+            "resourceType": "optimade/structures",
+            "accessService": "optimade",
+            "accessUrl": url,
+            "configuration": {"datacache_config": datacache_config},
+        }
+        for url in (base_url, error_url)
+    ]
+    configs_file = tmp_path / "queries.yml"
+    configs_file.write_text(yaml.safe_dump(configs), encoding="utf8")
+
+    assert main([str(configs_file), "--max-workers", "2"]) == 1
+
+    assert get_cached_response(base_url, datacache_config) is not None
+    assert get_cached_response(next_url, datacache_config) is not None
+
+    report = capsys.readouterr().out.splitlines()
+    assert report[0].split() == [
+        "Query",
+        "Status",
+        "Time",
+        "(s)",
+        "Entries",
+        "Transferred",
+        "Decoded",
+    ]
+    assert report[2].startswith(base_url)
+    assert report[2].split()[1:2] + report[2].split()[3:4] == ["ok", "4"]
+    assert report[3].startswith(error_url)
+    assert report[3].split()[1] == "error"
+    assert report[5].split()[:3] == ["Total", "1/2", "ok"]
+    assert report[6].startswith(f"{error_url}: ")
+
+
+@pytest.mark.parametrize(
+    ("content", "match"),
+    [
+        ("{}", "Expected a list"),
+        ("[{}]", "Invalid OPTIMADE resource configuration"),
+        ("[", "Could not read"),
+    ],
+)
+def test_load_configs_invalid(tmp_path: Path, content: str, match: str) -> None:
+    """Test invalid configuration files raise a `ConfigurationError`."""
+    from oteapi_optimade.exceptions import ConfigurationError
+    from oteapi_optimade.warm_cache import load_configs
+
+    configs_file = tmp_path / "queries.json"
+    configs_file.write_text(content, encoding="utf8")
+
+    with pytest.raises(ConfigurationError, match=match):
+        load_configs(configs_file)